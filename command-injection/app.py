@@ -1,26 +1,84 @@
-import subprocess
+import math
+from functools import wraps
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from pydantic import ValidationError
+from werkzeug.serving import is_running_from_reloader
 
+from config import Config
+from executor import ExecutorBusy, command_executor
 from models import (
     BlacklistKeywordsRequest,
     CommandRequest,
+    CommandType,
     LengthRestrictedRequest,
     MappedCommandRequest,
     WhitelistCommandRequest,
 )
+from native import native_backend
+from ping import engine_loop, engine_serves, ping_response
+from result_cache import result_cache
+from scheduler import QuotaExceeded, scheduler
 from security import (
     escape_shell_input,
     execute_safely_with_subprocess,
     get_mapped_command,
     sanitize_input_regex,
 )
+from sse import server_sent_event
 
 app = Flask(__name__)
 
 
+@app.errorhandler(ExecutorBusy)
+def executor_busy(e):
+    """Commands beyond the pool and queue capacity are shed instead of queued"""
+    response = jsonify({"error": str(e)})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
+@app.errorhandler(QuotaExceeded)
+def quota_exceeded(e):
+    """Clients and endpoints over their rate or concurrency quota are told when to retry"""
+    response = jsonify({"error": str(e)})
+    response.headers["Retry-After"] = str(math.ceil(e.retry_after))
+    return response, 429
+
+
+def limited(view):
+    """Run the view within its endpoint's and client's execution quotas (see scheduler.py)"""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.SCHEDULER_ENABLED:
+            return view(*args, **kwargs)
+        with scheduler.admit(request.endpoint, request.remote_addr or "unknown"):
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+@app.route("/admin/scheduler", methods=["GET"])
+def scheduler_stats():
+    """Per-endpoint quotas, queue times and rejections"""
+    return jsonify(scheduler.stats())
+
+
+@app.route("/admin/executor", methods=["GET"])
+def executor_stats():
+    """Worker pool size, commands in flight and admission counters"""
+    return jsonify(command_executor.stats())
+
+
+@app.route("/admin/command_cache", methods=["GET"])
+def command_cache_stats():
+    """Result cache TTLs, entries and hit / miss / coalesced counters"""
+    return jsonify(result_cache.stats())
+
+
 @app.route("/vulnerable/exec", methods=["POST"])
+@limited
 def vulnerable_exec():
     """
     Vulnerable endpoint that directly executes user input without any sanitization.
@@ -47,6 +105,7 @@ def vulnerable_exec():
 
 
 @app.route("/secure/whitelist", methods=["POST"])
+@limited
 def secure_whitelist():
     """
     Secure endpoint using whitelist approach.
@@ -73,6 +132,7 @@ def secure_whitelist():
 
 
 @app.route("/secure/regex_filter", methods=["POST"])
+@limited
 def secure_regex_filter():
     """
     Secure endpoint using regex filtering.
@@ -103,6 +163,7 @@ def secure_regex_filter():
 
 
 @app.route("/secure/escape_shell", methods=["POST"])
+@limited
 def secure_escape_shell():
     """
     Secure endpoint using shell escaping.
@@ -133,6 +194,7 @@ def secure_escape_shell():
 
 
 @app.route("/secure/subprocess_safe", methods=["POST"])
+@limited
 def secure_subprocess_safe():
     """
     Secure endpoint using subprocess with shell=False.
@@ -159,6 +221,7 @@ def secure_subprocess_safe():
 
 
 @app.route("/secure/length_restriction", methods=["POST"])
+@limited
 def secure_length_restriction():
     """
     Secure endpoint using input length restriction.
@@ -185,6 +248,7 @@ def secure_length_restriction():
 
 
 @app.route("/secure/blacklist_keywords", methods=["POST"])
+@limited
 def secure_blacklist_keywords():
     """
     Secure endpoint using blacklist approach.
@@ -211,6 +275,7 @@ def secure_blacklist_keywords():
 
 
 @app.route("/secure/command_mapping", methods=["POST"])
+@limited
 def secure_command_mapping():
     """
     Secure endpoint using command mapping.
@@ -221,27 +286,80 @@ def secure_command_mapping():
     except ValidationError as e:
         return jsonify({"error": str(e)}), 400
 
+    targets = data.targets or ([data.args] if data.args else [])
+    if data.command_type == CommandType.PING and engine_serves(targets):
+        # Probed in-process by the asyncio ping engine, all targets at once
+        command_parts = get_mapped_command(CommandType.PING) + targets
+        return jsonify({"command": " ".join(command_parts), **ping_response(engine_loop.run(targets))})
+    if data.targets:
+        return jsonify({"error": "targets needs the ping engine (PING_ENGINE, ICMP socket access, IPv4 targets)"}), 400
+
     # Get the predefined command based on the mapped type
     command_parts = get_mapped_command(data.command_type, data.args)
 
-    # Execute the predefined command
-    result = subprocess.run(
-        command_parts,
-        shell=False,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+    native = native_backend(data.command_type)
+    if native is not None:
+        # Answered in-process, no child process needed
+        stdout, stderr, returncode = native()
+    else:
+        # Execute the predefined command on the worker pool, or reuse a recent result
+        stdout, stderr, returncode = result_cache.run(
+            data.command_type,
+            command_parts,
+            lambda: command_executor.run(command_parts, shell=False),
+        )
 
     return jsonify(
         {
             "command": " ".join(command_parts),
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "returncode": returncode,
         }
     )
 
 
+@app.route("/secure/command_mapping/stream", methods=["POST"])
+def secure_command_mapping_stream():
+    """
+    Streaming variant of command mapping.
+    Output is relayed as Server-Sent Events while the command runs:
+    stdout / stderr events as it writes, then an exit event with the return code.
+    """
+    try:
+        data = MappedCommandRequest(**request.json)
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    if data.targets:
+        # Only the ping engine probes several targets, and it does not stream
+        return jsonify({"error": "targets is not supported when streaming; use /secure/command_mapping"}), 400
+
+    command_parts = get_mapped_command(data.command_type, data.args)
+    # The quota slot is held until the stream ends, not just until the view returns
+    release = (
+        scheduler.acquire(request.endpoint, request.remote_addr or "unknown")
+        if Config.SCHEDULER_ENABLED
+        else lambda: None
+    )
+    try:
+        stream = command_executor.stream(command_parts, shell=False)
+    except BaseException:
+        release()
+        raise
+
+    response = Response(
+        (server_sent_event(event, text) for event, text in stream),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Kills the command and frees its slot if the client goes away early
+    response.call_on_close(stream.close)
+    response.call_on_close(release)
+    return response
+
+
 if __name__ == "__main__":
+    # Spawn the workers in the serving process, not in the reloader's watcher
+    if is_running_from_reloader():
+        command_executor.start()
     app.run(debug=True)
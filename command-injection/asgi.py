@@ -0,0 +1,273 @@
+import math
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import ValidationError
+from quart import Quart, Response, request
+
+from async_executor import AsyncCommandStream, async_executor, install_child_watcher
+from config import Config
+from executor import ExecutorBusy
+from models import (
+    BlacklistKeywordsRequest,
+    CommandRequest,
+    CommandType,
+    LengthRestrictedRequest,
+    MappedCommandRequest,
+    WhitelistCommandRequest,
+)
+from native import native_backend
+from ping import engine_serves, ping_many, ping_response
+from result_cache import result_cache
+from scheduler import QuotaExceeded, scheduler
+from security import (
+    escape_shell_input,
+    execute_safely_async,
+    get_mapped_command,
+    sanitize_input_regex,
+)
+from sse import server_sent_event
+
+app = Quart(__name__)
+
+
+class ServerSentEvents:
+    """Response body relaying an AsyncCommandStream; closing it stops the command"""
+
+    def __init__(self, stream: AsyncCommandStream, on_close: Optional[Callable[[], None]] = None):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __aiter__(self) -> "ServerSentEvents":
+        return self
+
+    async def __anext__(self) -> str:
+        event, text = await self._stream.__anext__()
+        return server_sent_event(event, text)
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+
+
+async def parse(model: Any) -> Any:
+    return model(**(await request.get_json()))
+
+
+def result(command: str, stdout: str, stderr: str, returncode: int, **extra: str) -> Dict[str, Any]:
+    return {**extra, "command": command, "stdout": stdout, "stderr": stderr, "returncode": returncode}
+
+
+@app.before_serving
+async def setup_child_watcher():
+    install_child_watcher()
+
+
+@app.errorhandler(ValidationError)
+async def validation_error(e) -> Tuple[Dict[str, str], int]:
+    return {"error": str(e)}, 400
+
+
+@app.errorhandler(ExecutorBusy)
+async def executor_busy(e) -> Tuple[Dict[str, str], int, Dict[str, str]]:
+    """Commands beyond the concurrency limit and queue are shed instead of queued"""
+    return {"error": str(e)}, 503, {"Retry-After": "1"}
+
+
+@app.errorhandler(QuotaExceeded)
+async def quota_exceeded(e) -> Tuple[Dict[str, str], int, Dict[str, str]]:
+    """Clients and endpoints over their rate or concurrency quota are told when to retry"""
+    return {"error": str(e)}, 429, {"Retry-After": str(math.ceil(e.retry_after))}
+
+
+def limited(view):
+    """Run the view within its endpoint's and client's execution quotas (see scheduler.py)"""
+
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        if not Config.SCHEDULER_ENABLED:
+            return await view(*args, **kwargs)
+        async with scheduler.admit_async(request.endpoint, request.remote_addr or "unknown"):
+            return await view(*args, **kwargs)
+
+    return wrapper
+
+
+@app.route("/admin/scheduler", methods=["GET"])
+async def scheduler_stats():
+    """Per-endpoint quotas, queue times and rejections"""
+    return scheduler.stats()
+
+
+@app.route("/admin/executor", methods=["GET"])
+async def executor_stats():
+    """Running and waiting commands and admission counters"""
+    return async_executor.stats()
+
+
+@app.route("/admin/command_cache", methods=["GET"])
+async def command_cache_stats():
+    """Result cache TTLs, entries and hit / miss / coalesced counters"""
+    return result_cache.stats()
+
+
+@app.route("/vulnerable/exec", methods=["POST"])
+@limited
+async def vulnerable_exec():
+    """
+    Vulnerable endpoint that directly executes user input without any sanitization.
+    This demonstrates a classic OS Command Injection vulnerability.
+    """
+    data = await parse(CommandRequest)
+
+    # UNSAFE: Directly executing user input without any sanitization
+    return result(data.command, *await execute_safely_async(data.command, shell=True))
+
+
+@app.route("/secure/whitelist", methods=["POST"])
+@limited
+async def secure_whitelist():
+    """
+    Secure endpoint using whitelist approach.
+    Only pre-approved commands are allowed to execute.
+    """
+    data = await parse(WhitelistCommandRequest)
+    return result(data.command, *await execute_safely_async(data.command))
+
+
+@app.route("/secure/regex_filter", methods=["POST"])
+@limited
+async def secure_regex_filter():
+    """
+    Secure endpoint using regex filtering.
+    Dangerous characters are removed from the input before execution.
+    """
+    data = await parse(CommandRequest)
+    sanitized_command = sanitize_input_regex(data.command)
+    stdout, stderr, returncode = await execute_safely_async(sanitized_command)
+
+    return {
+        "original_command": data.command,
+        "sanitized_command": sanitized_command,
+        "stdout": stdout,
+        "stderr": stderr,
+        "returncode": returncode,
+    }
+
+
+@app.route("/secure/escape_shell", methods=["POST"])
+@limited
+async def secure_escape_shell():
+    """
+    Secure endpoint using shell escaping.
+    User input is properly escaped before being used in shell commands.
+    """
+    data = await parse(CommandRequest)
+    escaped_command = escape_shell_input(data.command)
+    stdout, stderr, returncode = await execute_safely_async(f"echo {escaped_command}", shell=True)
+
+    return {
+        "original_command": data.command,
+        "escaped_command": escaped_command,
+        "stdout": stdout,
+        "stderr": stderr,
+        "returncode": returncode,
+    }
+
+
+@app.route("/secure/subprocess_safe", methods=["POST"])
+@limited
+async def secure_subprocess_safe():
+    """
+    Secure endpoint using subprocess with shell=False.
+    Commands are executed without shell interpretation.
+    """
+    data = await parse(CommandRequest)
+    return result(data.command, *await execute_safely_async(data.command))
+
+
+@app.route("/secure/length_restriction", methods=["POST"])
+@limited
+async def secure_length_restriction():
+    """
+    Secure endpoint using input length restriction.
+    Limits the potential damage from command injection by restricting input length.
+    """
+    data = await parse(LengthRestrictedRequest)
+    return result(data.command, *await execute_safely_async(data.command))
+
+
+@app.route("/secure/blacklist_keywords", methods=["POST"])
+@limited
+async def secure_blacklist_keywords():
+    """
+    Secure endpoint using blacklist approach.
+    Inputs containing dangerous keywords are rejected.
+    """
+    data = await parse(BlacklistKeywordsRequest)
+    return result(data.command, *await execute_safely_async(data.command))
+
+
+@app.route("/secure/command_mapping", methods=["POST"])
+@limited
+async def secure_command_mapping():
+    """
+    Secure endpoint using command mapping.
+    Users select from predefined commands instead of providing raw input.
+    """
+    data = await parse(MappedCommandRequest)
+    targets = data.targets or ([data.args] if data.args else [])
+    if data.command_type == CommandType.PING and engine_serves(targets):
+        # Probed on the event loop by the ping engine, all targets at once
+        command_parts = get_mapped_command(CommandType.PING) + targets
+        return {"command": " ".join(command_parts), **ping_response(await ping_many(targets))}
+    if data.targets:
+        return {"error": "targets needs the ping engine (PING_ENGINE, ICMP socket access, IPv4 targets)"}, 400
+
+    command_parts = get_mapped_command(data.command_type, data.args)
+    native = native_backend(data.command_type)
+    if native is not None:
+        output = native()
+    else:
+        output = await result_cache.run_async(
+            data.command_type, command_parts, lambda: async_executor.run(command_parts)
+        )
+    return result(" ".join(command_parts), *output)
+
+
+@app.route("/secure/command_mapping/stream", methods=["POST"])
+async def secure_command_mapping_stream():
+    """
+    Streaming variant of command mapping.
+    Output is relayed as Server-Sent Events while the command runs.
+    """
+    data = await parse(MappedCommandRequest)
+    if data.targets:
+        # Only the ping engine probes several targets, and it does not stream
+        return {"error": "targets is not supported when streaming; use /secure/command_mapping"}, 400
+    command_parts = get_mapped_command(data.command_type, data.args)
+    # The quota slot is held until the stream ends, not just until the view returns
+    release = (
+        await scheduler.acquire_async(request.endpoint, request.remote_addr or "unknown")
+        if Config.SCHEDULER_ENABLED
+        else None
+    )
+    try:
+        stream = await async_executor.stream(command_parts)
+    except BaseException:
+        if release is not None:
+            release()
+        raise
+
+    return Response(
+        ServerSentEvents(stream, on_close=release),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+if __name__ == "__main__":
+    app.run(debug=True)
@@ -0,0 +1,270 @@
+import asyncio
+import codecs
+import os
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+from config import Config
+from executor import (
+    CHUNK_SIZE,
+    TIMEOUT_MARKER,
+    TRUNCATION_MARKER,
+    CommandResult,
+    ExecutorBusy,
+    command_key,
+)
+
+
+def install_child_watcher() -> None:
+    """
+    Reap children through pidfds on the running loop. Before Python 3.12 the
+    default watcher starts one thread per child process.
+    """
+    if sys.version_info < (3, 12) and hasattr(os, "pidfd_open"):
+        watcher = asyncio.PidfdChildWatcher()
+        watcher.attach_loop(asyncio.get_running_loop())
+        asyncio.set_child_watcher(watcher)
+
+
+async def spawn(args: Union[str, List[str]], shell: bool) -> asyncio.subprocess.Process:
+    if shell:
+        return await asyncio.create_subprocess_shell(
+            args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    return await asyncio.create_subprocess_exec(
+        *args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+
+async def _pump(name: str, reader: asyncio.StreamReader, queue: asyncio.Queue) -> None:
+    while chunk := await reader.read(CHUNK_SIZE):
+        await queue.put((name, chunk))
+    await queue.put((name, b""))
+
+
+async def relay_output(proc: asyncio.subprocess.Process, timeout: Optional[float],
+                       max_output: Optional[int]) -> AsyncIterator[Tuple[str, bytes]]:
+    """Async counterpart of executor.relay_output, with the same limits and markers"""
+    deadline = None if timeout is None else monotonic() + timeout
+    remaining = {"stdout": max_output, "stderr": max_output}
+    queue: asyncio.Queue = asyncio.Queue()
+    pumps = [
+        asyncio.create_task(_pump("stdout", proc.stdout, queue)),
+        asyncio.create_task(_pump("stderr", proc.stderr, queue)),
+    ]
+    try:
+        open_streams = len(pumps)
+        while open_streams:
+            wait = None if deadline is None else deadline - monotonic()
+            try:
+                name, chunk = await asyncio.wait_for(queue.get(), wait)
+            except asyncio.TimeoutError:
+                yield "stderr", TIMEOUT_MARKER.format(timeout=timeout).encode()
+                return
+            if not chunk:
+                open_streams -= 1
+                continue
+            limit = remaining[name]
+            if limit is not None and len(chunk) > limit:
+                if limit:
+                    yield name, chunk[:limit]
+                yield name, TRUNCATION_MARKER.format(limit=max_output).encode()
+                return
+            if limit is not None:
+                remaining[name] = limit - len(chunk)
+            yield name, chunk
+        # Both pipes closed; the child may still be running
+        try:
+            await asyncio.wait_for(proc.wait(), None if deadline is None else max(deadline - monotonic(), 0))
+        except asyncio.TimeoutError:
+            yield "stderr", TIMEOUT_MARKER.format(timeout=timeout).encode()
+    finally:
+        for pump in pumps:
+            pump.cancel()
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+
+
+class AsyncCommandStream:
+    """
+    Async counterpart of executor.CommandStream: ("stdout" | "stderr", text)
+    events, then ("exit", return_code). aclose() kills the child if it is
+    still running and releases its admission slot.
+    """
+
+    def __init__(self, proc: Optional[asyncio.subprocess.Process], timeout: Optional[float],
+                 max_output: Optional[int], release: Callable[[], None], error: Optional[str] = None):
+        self.proc = proc
+        self._release = release
+        self._closed = False
+        self._events = self._relay(timeout, max_output, error)
+
+    async def _relay(self, timeout: Optional[float], max_output: Optional[int],
+                     error: Optional[str]) -> AsyncIterator[Tuple[str, str]]:
+        if self.proc is None:
+            yield "stderr", error
+            yield "exit", "-1"
+            return
+        decoders = {
+            name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for name in ("stdout", "stderr")
+        }
+        try:
+            async for name, chunk in relay_output(self.proc, timeout, max_output):
+                text = decoders[name].decode(chunk)
+                if text:
+                    yield name, text
+            for name, decoder in decoders.items():
+                text = decoder.decode(b"", final=True)
+                if text:
+                    yield name, text
+            yield "exit", str(self.proc.returncode)
+        finally:
+            await self._finish()
+
+    async def _finish(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self.proc is not None:
+            if self.proc.returncode is None:
+                self.proc.kill()
+            await self.proc.wait()
+        self._release()
+
+    def __aiter__(self) -> "AsyncCommandStream":
+        return self
+
+    async def __anext__(self) -> Tuple[str, str]:
+        return await self._events.__anext__()
+
+    async def aclose(self) -> None:
+        await self._events.aclose()
+        await self._finish()
+
+
+class AsyncCommandExecutor:
+    """
+    Runs commands as asyncio subprocesses on the serving event loop, so
+    waiting on a child costs no thread. Up to ``max_concurrency`` children
+    run at once and ``queue_size`` more may wait up to ``admission_timeout``
+    seconds for a slot; beyond that ExecutorBusy is raised. Per-executable
+    limits from Config.COMMAND_CONCURRENCY, timeouts and output caps match
+    CommandExecutor.
+    """
+
+    def __init__(self, max_concurrency: int, queue_size: int, admission_timeout: float,
+                 limits: Dict[str, int], timeout: Optional[float], max_output: Optional[int]):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.admission_timeout = admission_timeout
+        self.timeout = timeout
+        self.max_output = max_output
+        self._limits = {name: asyncio.Semaphore(limit) for name, limit in limits.items()}
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._running: Dict[str, int] = {}
+        self._counters = {"submitted": 0, "completed": 0, "rejected": 0}
+
+    async def _admit(self, key: str) -> None:
+        limit = self._limits.get(key)
+        if limit is not None:
+            try:
+                await asyncio.wait_for(limit.acquire(), self.admission_timeout)
+            except asyncio.TimeoutError:
+                self._counters["rejected"] += 1
+                raise ExecutorBusy(f"too many concurrent '{key}' commands") from None
+        try:
+            await self._admit_slot()
+        except BaseException:
+            if limit is not None:
+                limit.release()
+            raise
+        self._running[key] = self._running.get(key, 0) + 1
+        self._counters["submitted"] += 1
+
+    async def _admit_slot(self) -> None:
+        if self._slots.locked():
+            if self._waiting >= self.queue_size:
+                self._counters["rejected"] += 1
+                raise ExecutorBusy("execution queue full")
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.admission_timeout)
+            except asyncio.TimeoutError:
+                self._counters["rejected"] += 1
+                raise ExecutorBusy("no execution slot within the admission timeout") from None
+            finally:
+                self._waiting -= 1
+        else:
+            await self._slots.acquire()
+
+    def _release(self, key: str) -> None:
+        self._running[key] -= 1
+        self._counters["completed"] += 1
+        self._slots.release()
+        limit = self._limits.get(key)
+        if limit is not None:
+            limit.release()
+
+    @asynccontextmanager
+    async def _admitted(self, key: str) -> AsyncIterator[None]:
+        await self._admit(key)
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    async def run(self, args: Union[str, List[str]], shell: bool = False) -> CommandResult:
+        """
+        Run a command and wait for it without blocking the loop
+        Returns: (stdout, stderr, return_code)
+        """
+        async with self._admitted(command_key(args, shell)):
+            try:
+                proc = await spawn(args, shell)
+            except Exception as e:
+                return ("", str(e), -1)
+            output = {"stdout": bytearray(), "stderr": bytearray()}
+            async for name, chunk in relay_output(proc, self.timeout, self.max_output):
+                output[name] += chunk
+            return (
+                output["stdout"].decode(errors="replace"),
+                output["stderr"].decode(errors="replace"),
+                proc.returncode,
+            )
+
+    async def stream(self, args: Union[str, List[str]], shell: bool = False) -> AsyncCommandStream:
+        """Admit and start a command whose output is relayed as it runs"""
+        key = command_key(args, shell)
+        await self._admit(key)
+        try:
+            proc = await spawn(args, shell)
+        except Exception as e:
+            self._release(key)
+            return AsyncCommandStream(None, self.timeout, self.max_output, lambda: None, error=str(e))
+        return AsyncCommandStream(proc, self.timeout, self.max_output, lambda: self._release(key))
+
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency limit, commands running and waiting, and admission counters"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_size": self.queue_size,
+            "waiting": self._waiting,
+            "running": {key: count for key, count in self._running.items() if count},
+            **self._counters,
+        }
+
+
+async_executor = AsyncCommandExecutor(
+    max_concurrency=Config.ASYNC_MAX_COMMANDS,
+    queue_size=Config.ASYNC_QUEUE_SIZE,
+    admission_timeout=Config.EXECUTOR_ADMISSION_TIMEOUT,
+    limits=Config.COMMAND_CONCURRENCY,
+    timeout=Config.COMMAND_TIMEOUT,
+    max_output=Config.COMMAND_MAX_OUTPUT,
+)
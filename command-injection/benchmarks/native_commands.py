@@ -0,0 +1,65 @@
+"""
+Benchmark: in-process ls / whoami (native.py) vs. spawning the binary,
+both directly with subprocess.run and through the worker pool.
+Reports p50/p95 latency in microseconds and runs per second.
+
+Run from the command-injection directory:
+    python -m benchmarks.native_commands --runs 500
+"""
+import argparse
+import subprocess
+from statistics import quantiles
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from executor import CommandResult, command_executor
+from models import CommandType
+from native import NATIVE_BACKENDS
+from security import get_mapped_command
+
+
+def measure(run: Callable[[], CommandResult], runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        started = perf_counter()
+        run()
+        samples.append((perf_counter() - started) * 1e6)
+    return samples
+
+
+def run_subprocess(command_parts: List[str]) -> CommandResult:
+    """The original per-request path: fork/exec from the calling process"""
+    result = subprocess.run(command_parts, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return (result.stdout, result.stderr, result.returncode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Native vs. subprocess mapped commands")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    command_executor.start()
+    for command_type, native in NATIVE_BACKENDS.items():
+        command_parts = get_mapped_command(command_type)
+        if native() != run_subprocess(command_parts):
+            # e.g. ls sorting by the current locale rather than by code point
+            print(f"{command_type.value}: native output differs from the binary's")
+
+        backends: Dict[str, Callable[[], CommandResult]] = {
+            "native": native,
+            "subprocess.run": lambda: run_subprocess(command_parts),
+            "worker pool": lambda: command_executor.run(command_parts),
+        }
+        print(f"{command_type.value}:")
+        for name, run in backends.items():
+            measure(run, min(args.runs, 10))
+            samples = measure(run, args.runs)
+            cuts = quantiles(samples, n=100, method="inclusive")
+            print(
+                f"  {name:<15} p50 {cuts[49]:>9.1f}us  p95 {cuts[94]:>9.1f}us  "
+                f"{len(samples) / (sum(samples) / 1e6):>9.0f} runs/s"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: asyncio ping engine (ping.py) throughput and latency.
+
+By default every probe is answered in-process (Config.PING_LOOPBACK), so the
+numbers measure the engine itself and need no network or privileges.
+--icmp sends real echo requests to 127.0.0.1 instead, and --binary adds the
+ping binary (one child per target, run in parallel) for comparison.
+
+Run from the command-injection directory:
+    python -m benchmarks.ping_engine --targets 16 --rounds 20
+"""
+import argparse
+import asyncio
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from statistics import quantiles
+from time import perf_counter
+from typing import Callable, List
+
+from config import Config
+from ping import ping_many
+
+
+def report(name: str, samples: List[float], probes: int) -> None:
+    cuts = quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    print(
+        f"  {name:<12} per request p50 {cuts[49]:>8.1f}ms  p95 {cuts[94]:>8.1f}ms  "
+        f"{probes / (sum(samples) / 1e3):>9.0f} probes/s"
+    )
+
+
+def measure(run: Callable[[], None], rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        started = perf_counter()
+        run()
+        samples.append((perf_counter() - started) * 1e3)
+    return samples
+
+
+def run_binary(targets: List[str]) -> None:
+    command = ["ping", "-c", str(Config.PING_COUNT), "-i", str(Config.PING_INTERVAL)]
+    with ThreadPoolExecutor(max_workers=Config.PING_CONCURRENCY) as pool:
+        list(pool.map(lambda target: subprocess.run(command + [target], capture_output=True), targets))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ping engine benchmark")
+    parser.add_argument("--targets", type=int, default=16, help="targets per request")
+    parser.add_argument("--rounds", type=int, default=10, help="requests to time")
+    parser.add_argument("--interval", type=float, default=0.0, help="Config.PING_INTERVAL for the run")
+    parser.add_argument("--icmp", action="store_true", help="real ICMP to 127.0.0.1 instead of in-process replies")
+    parser.add_argument("--binary", action="store_true", help="also time the ping binary")
+    args = parser.parse_args()
+
+    Config.PING_INTERVAL = args.interval
+    Config.PING_CONCURRENCY = max(Config.PING_CONCURRENCY, args.targets)
+    targets = ["127.0.0.1"] * args.targets
+    probes = args.targets * Config.PING_COUNT * args.rounds
+    mode = "icmp" if args.icmp else f"loopback, {Config.PING_LOOPBACK_RTT * 1e3:g}ms rtt"
+    print(f"{args.targets} targets x {Config.PING_COUNT} probes, interval {args.interval:g}s ({mode}):")
+
+    results = asyncio.run(ping_many(targets, loopback=not args.icmp))
+    if any(stats.error for stats in results):
+        print(f"  engine unavailable: {results[0].error}")
+    else:
+        report("engine", measure(lambda: asyncio.run(ping_many(targets, loopback=not args.icmp)), args.rounds), probes)
+
+    if args.binary:
+        if shutil.which("ping") is None:
+            print("  binary       ping not installed")
+        else:
+            report("binary", measure(lambda: run_binary(targets), args.rounds), probes)
+
+
+if __name__ == '__main__':
+    main()
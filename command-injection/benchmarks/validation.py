@@ -0,0 +1,94 @@
+"""
+Microbenchmark: request validation before and after precomputing the
+whitelist and dangerous-character structures (validation.py), over command
+strings from a few bytes to a megabyte.
+
+Run from the command-injection directory:
+    python -m benchmarks.validation
+"""
+import re
+import timeit
+from typing import Callable
+
+from pydantic import BaseModel, ValidationError, field_validator
+
+from models import CommandType, WhitelistCommandRequest
+from security import sanitize_input_regex
+
+SIZES = (32, 1024, 64 * 1024, 1024 * 1024)
+# Shell metacharacters sprinkled through text, as the regex filter sees it
+DIRTY = "ls -la /var/log/app-2024 $(whoami) `id` {a,b} (sub) > out; "
+# Free of shell metacharacters
+CLEAN = "ls -la /var/log/app-2024/archive/2024-01-01/entries.txt "
+
+
+def legacy_sanitize(input_str: str) -> str:
+    """Original sanitize_input_regex: pattern string looked up per call"""
+    dangerous_chars = r"[;&|><`$\{\}\(\)\n]"
+    return re.sub(dangerous_chars, "", input_str)
+
+
+class LegacyCommandRequest(BaseModel):
+    command: str
+
+    @field_validator("command")
+    def command_not_empty(cls, v):
+        if not v.strip():
+            raise ValueError("Command cannot be empty")
+        return v.strip()
+
+
+class LegacyWhitelistCommandRequest(LegacyCommandRequest):
+    """Original whitelist: allowed list rebuilt from CommandType per validation"""
+
+    @field_validator("command")
+    def command_in_whitelist(cls, v):
+        allowed_commands = [cmd.value for cmd in CommandType]
+        if v not in allowed_commands:
+            raise ValueError(
+                f"Command not allowed. Allowed commands: {', '.join(allowed_commands)}"
+            )
+        return v
+
+
+def validate(model: type, command: str) -> None:
+    try:
+        model(command=command)
+    except ValidationError:
+        pass
+
+
+def per_call_us(fn: Callable[[], object]) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number * 1e6
+
+
+def report(name: str, legacy: Callable[[], object], current: Callable[[], object]) -> None:
+    before, after = per_call_us(legacy), per_call_us(current)
+    print(f"  {name:<22} before {before:>10.2f}us  after {after:>10.2f}us  {before / after:>6.2f}x")
+
+
+def main():
+    for size in SIZES:
+        dirty = (DIRTY * (size // len(DIRTY) + 1))[:size]
+        clean = (CLEAN * (size // len(CLEAN) + 1))[:size]
+        assert sanitize_input_regex(dirty) == legacy_sanitize(dirty)
+
+        print(f"{size} bytes:")
+        report("regex filter", lambda: legacy_sanitize(dirty), lambda: sanitize_input_regex(dirty))
+        report(
+            "whitelist model",
+            lambda: validate(LegacyWhitelistCommandRequest, clean),
+            lambda: validate(WhitelistCommandRequest, clean),
+        )
+    print("allowed command:")
+    report(
+        "whitelist model",
+        lambda: validate(LegacyWhitelistCommandRequest, "whoami"),
+        lambda: validate(WhitelistCommandRequest, "whoami"),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+from typing import Dict, Optional, Set
+
+from models import CommandType
+
+
+class Config:
+    # Command execution pool (see executor.py). Commands run in pre-spawned
+    # worker processes; each worker runs one child process at a time.
+    EXECUTOR_WORKERS: int = 8
+    # Commands allowed to wait for a free worker beyond the running ones
+    EXECUTOR_QUEUE_SIZE: int = 32
+    # Seconds a request waits for admission before it is rejected with 503
+    EXECUTOR_ADMISSION_TIMEOUT: float = 0.25
+    # multiprocessing start method for the workers; forkserver keeps them
+    # from inheriting the web server's memory and threads
+    EXECUTOR_START_METHOD: str = "forkserver"
+    # Maximum concurrent runs per executable; unlisted ones share the pool.
+    # Long-running commands are capped so they cannot occupy every worker.
+    COMMAND_CONCURRENCY: Dict[str, int] = {
+        "ping": 2,
+    }
+    # Asyncio runner for the ASGI app (see async_executor.py). Each running
+    # command holds three file descriptors, so keep RLIMIT_NOFILE above
+    # three times ASYNC_MAX_COMMANDS.
+    ASYNC_MAX_COMMANDS: int = 1024
+    ASYNC_QUEUE_SIZE: int = 4096
+    # Wall-clock limit per command in seconds; the child is killed after it
+    COMMAND_TIMEOUT: Optional[float] = 10.0
+    # Bytes kept per output stream; the child is killed once it writes more
+    COMMAND_MAX_OUTPUT: Optional[int] = 64 * 1024
+    # Result cache for mapped commands that spawn a process (see
+    # result_cache.py): seconds a successful result is reused per
+    # CommandType; concurrent identical requests share one run. Types in
+    # NATIVE_COMMANDS, and PING while PING_ENGINE is on, never reach it, so
+    # give LS or WHOAMI a TTL here when removing them from NATIVE_COMMANDS.
+    COMMAND_CACHE_TTL: Dict[CommandType, float] = {
+        # A ping -c 4 takes seconds; identical requests within one share it
+        CommandType.PING: 1.0,
+    }
+    COMMAND_CACHE_SIZE: int = 256
+    # Mapped commands answered in-process (see native.py) instead of by a
+    # child process; remove a type to run the real binary again
+    NATIVE_COMMANDS: Set[CommandType] = {
+        CommandType.LS,
+        CommandType.WHOAMI,
+    }
+    # In-process asyncio ping engine for CommandType.PING (see ping.py)
+    # instead of the ping binary. Needs an ICMP datagram socket (allowed by
+    # net.ipv4.ping_group_range) or CAP_NET_RAW, and is IPv4 only: without
+    # socket access, or for IPv6 targets, requests still run the binary.
+    PING_ENGINE: bool = False
+    PING_COUNT: int = 4
+    PING_INTERVAL: float = 0.2
+    # Seconds to wait for each reply
+    PING_TIMEOUT: float = 1.0
+    # Targets probed at once per request
+    PING_CONCURRENCY: int = 16
+    # Test mode: answer every probe in-process after PING_LOOPBACK_RTT
+    # seconds, without sockets, privileges or network
+    PING_LOOPBACK: bool = False
+    PING_LOOPBACK_RTT: float = 0.0001
+    # Per-endpoint and per-client execution quotas (see scheduler.py).
+    # Endpoints are Flask/Quart endpoint names; each gets concurrent slots
+    # plus a token bucket refilled at "rate" per second up to "burst".
+    SCHEDULER_ENABLED: bool = True
+    DEFAULT_ENDPOINT_LIMITS: Dict[str, float] = {"concurrency": 8, "rate": 20.0, "burst": 40}
+    ENDPOINT_LIMITS: Dict[str, Dict[str, float]] = {
+        "vulnerable_exec": {"concurrency": 4},
+        "secure_subprocess_safe": {"concurrency": 4},
+        "secure_command_mapping": {"concurrency": 16, "rate": 100.0, "burst": 200},
+        "secure_command_mapping_stream": {"concurrency": 4, "rate": 5.0, "burst": 10},
+    }
+    CLIENT_RATE: float = 10.0
+    CLIENT_BURST: int = 30
+    CLIENT_CONCURRENCY: int = 4
+    # Seconds a request may wait for an endpoint slot before a 503
+    SCHEDULER_QUEUE_TIMEOUT: float = 1.0
+    SCHEDULER_MAX_CLIENTS: int = 10000
@@ -0,0 +1,338 @@
+import atexit
+import codecs
+import multiprocessing
+import os
+import selectors
+import subprocess
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import monotonic
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from config import Config
+
+CommandResult = Tuple[str, str, int]
+
+CHUNK_SIZE = 64 * 1024
+TRUNCATION_MARKER = "\n[output truncated after {limit} bytes]\n"
+TIMEOUT_MARKER = "\n[command timed out after {timeout:g} seconds]\n"
+
+
+class ExecutorBusy(Exception):
+    """Raised when a command is not admitted within the admission timeout"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Command executor busy: {reason}")
+        self.reason = reason
+
+
+def relay_output(proc: subprocess.Popen, timeout: Optional[float],
+                 max_output: Optional[int]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield ("stdout" | "stderr", chunk) as the child writes.
+    Each stream is capped at ``max_output`` bytes and the whole run at
+    ``timeout`` seconds; past either limit a marker chunk is yielded and the
+    child is killed. The child is always reaped before returning.
+    """
+    deadline = None if timeout is None else monotonic() + timeout
+    remaining = {"stdout": max_output, "stderr": max_output}
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ, "stdout")
+            selector.register(proc.stderr, selectors.EVENT_READ, "stderr")
+            while selector.get_map():
+                wait = None if deadline is None else deadline - monotonic()
+                if wait is not None and wait <= 0:
+                    yield "stderr", TIMEOUT_MARKER.format(timeout=timeout).encode()
+                    return
+                for key, _ in selector.select(wait):
+                    name = key.data
+                    chunk = os.read(key.fd, CHUNK_SIZE)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        continue
+                    limit = remaining[name]
+                    if limit is not None and len(chunk) > limit:
+                        if limit:
+                            yield name, chunk[:limit]
+                        yield name, TRUNCATION_MARKER.format(limit=max_output).encode()
+                        return
+                    if limit is not None:
+                        remaining[name] = limit - len(chunk)
+                    yield name, chunk
+        # Both pipes closed; the child may still be running
+        try:
+            proc.wait(None if deadline is None else max(deadline - monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            yield "stderr", TIMEOUT_MARKER.format(timeout=timeout).encode()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def spawn(args: Union[str, List[str]], shell: bool) -> subprocess.Popen:
+    return subprocess.Popen(
+        args,
+        shell=shell,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+
+def run_command(args: Union[str, List[str]], shell: bool = False, timeout: Optional[float] = None,
+                max_output: Optional[int] = None) -> CommandResult:
+    """
+    Run one command to completion. Executed inside a pool worker.
+    Returns: (stdout, stderr, return_code)
+    """
+    try:
+        proc = spawn(args, shell)
+    except Exception as e:
+        return ("", str(e), -1)
+    output = {"stdout": bytearray(), "stderr": bytearray()}
+    for name, chunk in relay_output(proc, timeout, max_output):
+        output[name] += chunk
+    return (
+        output["stdout"].decode(errors="replace"),
+        output["stderr"].decode(errors="replace"),
+        proc.returncode,
+    )
+
+
+class CommandStream:
+    """
+    Output of a running command as ("stdout" | "stderr", text) events,
+    followed by ("exit", return_code). close() kills the child if it is still
+    running and releases its admission slot; it is safe to call repeatedly.
+    """
+
+    def __init__(self, proc: Optional[subprocess.Popen], timeout: Optional[float],
+                 max_output: Optional[int], release: Callable[[], None], error: Optional[str] = None):
+        self.proc = proc
+        self._release = release
+        self._closed = False
+        self._events = self._relay(timeout, max_output, error)
+
+    def _relay(self, timeout: Optional[float], max_output: Optional[int],
+               error: Optional[str]) -> Iterator[Tuple[str, str]]:
+        if self.proc is None:
+            yield "stderr", error
+            yield "exit", "-1"
+            return
+        decoders = {
+            name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for name in ("stdout", "stderr")
+        }
+        try:
+            for name, chunk in relay_output(self.proc, timeout, max_output):
+                text = decoders[name].decode(chunk)
+                if text:
+                    yield name, text
+            for name, decoder in decoders.items():
+                text = decoder.decode(b"", final=True)
+                if text:
+                    yield name, text
+            yield "exit", str(self.proc.returncode)
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.kill()
+            self.proc.wait()
+            self.proc.stdout.close()
+            self.proc.stderr.close()
+        self._release()
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return self._events
+
+    def close(self) -> None:
+        self._events.close()
+        self._finish()
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def command_key(args: Union[str, List[str]], shell: bool) -> str:
+    """Name used for per-command concurrency limits"""
+    if shell:
+        return "shell"
+    return os.path.basename(args[0]) if args else ""
+
+
+class CommandExecutor:
+    """
+    Bounded pool of pre-spawned worker processes that run commands.
+    At most ``workers`` commands run at once and ``queue_size`` more may
+    wait; per-executable limits from Config.COMMAND_CONCURRENCY apply on
+    top. A command that cannot be admitted within ``admission_timeout``
+    seconds raises ExecutorBusy instead of piling up behind the others.
+    Every run is limited to ``timeout`` seconds and ``max_output`` bytes per
+    stream (see relay_output).
+    """
+
+    def __init__(self, workers: int, queue_size: int, admission_timeout: float,
+                 limits: Dict[str, int], start_method: str,
+                 timeout: Optional[float], max_output: Optional[int]):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.admission_timeout = admission_timeout
+        self.timeout = timeout
+        self.max_output = max_output
+        self.start_method = start_method
+        self._limits = {name: threading.BoundedSemaphore(limit) for name, limit in limits.items()}
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._counters = {"submitted": 0, "completed": 0, "rejected": 0, "restarts": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def start(self) -> ProcessPoolExecutor:
+        """
+        Spawn every worker up front so no request pays for process startup.
+        Returns the current pool, read under the lock so a concurrent
+        restart cannot hand out None.
+        """
+        with self._lock:
+            if self._pool is not None:
+                return self._pool
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+            )
+            pool = self._pool
+        try:
+            for future in [pool.submit(_warm) for _ in range(self.workers)]:
+                future.result()
+        except BaseException:
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        return pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a pool whose worker died, unless another thread already did"""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = None
+            self._counters["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    def _admit(self, key: str) -> Optional[threading.BoundedSemaphore]:
+        limit = self._limits.get(key)
+        if limit is not None and not limit.acquire(timeout=self.admission_timeout):
+            self._count("rejected")
+            raise ExecutorBusy(f"too many concurrent '{key}' commands")
+        if not self._slots.acquire(timeout=self.admission_timeout):
+            if limit is not None:
+                limit.release()
+            self._count("rejected")
+            raise ExecutorBusy("execution queue full")
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+            self._counters["submitted"] += 1
+        return limit
+
+    def _release(self, key: str, limit: Optional[threading.BoundedSemaphore]) -> None:
+        with self._lock:
+            self._in_flight[key] -= 1
+            self._counters["completed"] += 1
+        self._slots.release()
+        if limit is not None:
+            limit.release()
+
+    def _submit(self, args: Union[str, List[str]], shell: bool) -> Tuple[ProcessPoolExecutor, "Future[CommandResult]"]:
+        pool = self.start()
+        key = command_key(args, shell)
+        limit = self._admit(key)
+        try:
+            future = pool.submit(run_command, args, shell, self.timeout, self.max_output)
+        except BrokenProcessPool:
+            self._release(key, limit)
+            self._restart(pool)
+            return self._submit(args, shell)
+        except BaseException:
+            self._release(key, limit)
+            raise
+        future.add_done_callback(lambda _: self._release(key, limit))
+        return pool, future
+
+    def submit(self, args: Union[str, List[str]], shell: bool = False) -> "Future[CommandResult]":
+        """Admit a command and queue it on the pool; raises ExecutorBusy when full"""
+        return self._submit(args, shell)[1]
+
+    def run(self, args: Union[str, List[str]], shell: bool = False) -> CommandResult:
+        """Run a command on the pool and wait for its result"""
+        pool, future = self._submit(args, shell)
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            # A worker died mid-command; later commands get a fresh pool
+            self._restart(pool)
+            return ("", str(e) or "Worker process terminated", -1)
+
+    def stream(self, args: Union[str, List[str]], shell: bool = False) -> "CommandStream":
+        """
+        Admit a command and run it from the calling process so its output can
+        be relayed while it runs. It shares the admission limits with pooled
+        commands; raises ExecutorBusy when full.
+        """
+        key = command_key(args, shell)
+        limit = self._admit(key)
+        release = lambda: self._release(key, limit)
+        try:
+            proc = spawn(args, shell)
+        except Exception as e:
+            release()
+            return CommandStream(None, self.timeout, self.max_output, lambda: None, error=str(e))
+        return CommandStream(proc, self.timeout, self.max_output, release)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, queue capacity, commands in flight and admission counters"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "started": self._pool is not None,
+                "in_flight": {key: count for key, count in self._in_flight.items() if count},
+                **self._counters,
+            }
+
+
+command_executor = CommandExecutor(
+    workers=Config.EXECUTOR_WORKERS,
+    queue_size=Config.EXECUTOR_QUEUE_SIZE,
+    admission_timeout=Config.EXECUTOR_ADMISSION_TIMEOUT,
+    limits=Config.COMMAND_CONCURRENCY,
+    start_method=Config.EXECUTOR_START_METHOD,
+    timeout=Config.COMMAND_TIMEOUT,
+    max_output=Config.COMMAND_MAX_OUTPUT,
+)
+
+atexit.register(command_executor.shutdown)
@@ -1,7 +1,9 @@
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, constr, validator
+from pydantic import BaseModel, conlist, constr, field_validator, model_validator
+
+from validation import Whitelist
 
 
 class CommandType(str, Enum):
@@ -12,29 +14,28 @@ class CommandType(str, Enum):
     WHOAMI = "whoami"
 
 
+COMMAND_WHITELIST = Whitelist(cmd.value for cmd in CommandType)
+
+
 class CommandRequest(BaseModel):
     """Base model for command execution requests"""
 
     command: str
 
-    @validator("command")
+    @field_validator("command")
     def command_not_empty(cls, v):
-        if not v.strip():
+        v = v.strip()
+        if not v:
             raise ValueError("Command cannot be empty")
-        return v.strip()
+        return v
 
 
 class WhitelistCommandRequest(CommandRequest):
     """Request model for whitelist endpoint with additional validation"""
 
-    @validator("command")
+    @field_validator("command")
     def command_in_whitelist(cls, v):
-        allowed_commands = [cmd.value for cmd in CommandType]
-        if v not in allowed_commands:
-            raise ValueError(
-                f"Command not allowed. Allowed commands: {', '.join(allowed_commands)}"
-            )
-        return v
+        return COMMAND_WHITELIST.check(v)
 
 
 class LengthRestrictedRequest(CommandRequest):
@@ -46,7 +47,7 @@ class LengthRestrictedRequest(CommandRequest):
 class BlacklistKeywordsRequest(CommandRequest):
     """Request model with blacklisted keywords validation"""
 
-    @validator("command")
+    @field_validator("command")
     def check_blacklisted_keywords(cls, v):
         blacklist = ["rm", ";", "&&", "||", ">", "<", "|", "&"]
         for keyword in blacklist:
@@ -60,3 +61,11 @@ class MappedCommandRequest(BaseModel):
 
     command_type: CommandType
     args: Optional[constr(max_length=50)] = None
+    # Several hosts probed in one request by the ping engine
+    targets: Optional[conlist(constr(max_length=253), min_length=1, max_length=16)] = None
+
+    @model_validator(mode="after")
+    def args_or_targets(self):
+        if self.args is not None and self.targets is not None:
+            raise ValueError("Give either args or targets, not both")
+        return self
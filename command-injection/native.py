@@ -0,0 +1,42 @@
+import os
+import pwd
+from typing import Callable, Dict, Optional
+
+from config import Config
+from executor import CommandResult
+from models import CommandType
+
+
+def list_directory(path: str = ".") -> CommandResult:
+    """
+    In-process ``ls``: visible entries of ``path``, one per line, sorted by
+    code point (the order ``ls`` uses under the C locale).
+    """
+    try:
+        with os.scandir(path) as entries:
+            names = sorted(entry.name for entry in entries if not entry.name.startswith("."))
+    except OSError as e:
+        return ("", f"ls: cannot open directory '{path}': {e.strerror}\n", 2)
+    return ("".join(f"{name}\n" for name in names), "", 0)
+
+
+def current_user() -> CommandResult:
+    """In-process ``whoami``: name of the effective user ID"""
+    uid = os.geteuid()
+    try:
+        return (f"{pwd.getpwuid(uid).pw_name}\n", "", 0)
+    except KeyError:
+        return ("", f"whoami: cannot find name for user ID {uid}\n", 1)
+
+
+NATIVE_BACKENDS: Dict[CommandType, Callable[[], CommandResult]] = {
+    CommandType.LS: list_directory,
+    CommandType.WHOAMI: current_user,
+}
+
+
+def native_backend(command_type: CommandType) -> Optional[Callable[[], CommandResult]]:
+    """In-process implementation of a mapped command, if one exists and is enabled"""
+    if command_type not in Config.NATIVE_COMMANDS:
+        return None
+    return NATIVE_BACKENDS.get(command_type)
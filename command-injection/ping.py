@@ -0,0 +1,278 @@
+import asyncio
+import ipaddress
+import random
+import socket
+import struct
+import threading
+from functools import lru_cache
+from itertools import count
+from statistics import mean, pstdev
+from time import perf_counter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from config import Config
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+PAYLOAD = bytes(range(56))
+_HEADER = struct.Struct("!BBHHH")
+# Echo identifiers for raw sockets, which see every ICMP reply on the host
+_identifiers = count(random.randrange(0x10000))
+
+
+def checksum(data: bytes) -> int:
+    """RFC 1071 Internet checksum"""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def echo_request(identifier: int, sequence: int) -> bytes:
+    header = _HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    return _HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum(header + PAYLOAD), identifier, sequence) + PAYLOAD
+
+
+class PingStats(NamedTuple):
+    """Per-packet round-trip times in seconds (None for a lost packet)"""
+    target: str
+    address: Optional[str]
+    rtts: List[Optional[float]]
+    error: Optional[str] = None
+
+
+class IcmpSocket:
+    """
+    Echo requests over an unprivileged ICMP datagram socket, or a raw socket
+    where net.ipv4.ping_group_range does not allow datagram ones.
+    """
+
+    def __init__(self):
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self.raw = False
+        except PermissionError:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self.raw = True
+        self.sock.setblocking(False)
+        # Datagram sockets get their identifier rewritten by the kernel
+        self.identifier = next(_identifiers) & 0xFFFF
+
+    def send(self, address: str, sequence: int) -> None:
+        self.sock.sendto(echo_request(self.identifier, sequence), (address, 0))
+
+    async def receive(self, sequence: int, timeout: float) -> bool:
+        """Wait for the echo reply to ``sequence``; False once ``timeout`` passes"""
+        loop = asyncio.get_running_loop()
+        deadline = perf_counter() + timeout
+        while (remaining := deadline - perf_counter()) > 0:
+            try:
+                data = await asyncio.wait_for(loop.sock_recv(self.sock, 2048), remaining)
+            except asyncio.TimeoutError:
+                return False
+            if self.raw:
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < _HEADER.size:
+                continue
+            kind, _, _, identifier, reply_sequence = _HEADER.unpack_from(data)
+            if kind == ICMP_ECHO_REPLY and reply_sequence == sequence and (
+                not self.raw or identifier == self.identifier
+            ):
+                return True
+        return False
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class LoopbackSocket:
+    """Test transport: every echo request is answered in-process after ``rtt`` seconds"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self._replies: asyncio.Queue = asyncio.Queue()
+
+    def send(self, address: str, sequence: int) -> None:
+        asyncio.get_running_loop().call_later(self.rtt, self._replies.put_nowait, sequence)
+
+    async def receive(self, sequence: int, timeout: float) -> bool:
+        deadline = perf_counter() + timeout
+        while (remaining := deadline - perf_counter()) > 0:
+            try:
+                if await asyncio.wait_for(self._replies.get(), remaining) == sequence:
+                    return True
+            except asyncio.TimeoutError:
+                return False
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+async def resolve(target: str) -> str:
+    infos = await asyncio.get_running_loop().getaddrinfo(target, None, family=socket.AF_INET)
+    return infos[0][4][0]
+
+
+async def ping(target: str, count: int, interval: float, timeout: float,
+               loopback: bool = False) -> PingStats:
+    """
+    Send ``count`` echo requests to ``target`` (IPv4), one every ``interval``
+    seconds, each waiting up to ``timeout`` seconds for its reply.
+    """
+    try:
+        address = "127.0.0.1" if loopback else await resolve(target)
+    except (socket.gaierror, UnicodeError):
+        return PingStats(target, None, [], f"ping: {target}: Name or service not known")
+    try:
+        transport = LoopbackSocket(Config.PING_LOOPBACK_RTT) if loopback else IcmpSocket()
+    except OSError as e:
+        return PingStats(target, address, [], f"ping: socket: {e.strerror}")
+
+    rtts: List[Optional[float]] = []
+    try:
+        for sequence in range(1, count + 1):
+            started = perf_counter()
+            try:
+                transport.send(address, sequence)
+            except OSError as e:
+                return PingStats(target, address, rtts, f"ping: sendmsg: {e.strerror}")
+            replied = await transport.receive(sequence, timeout)
+            rtts.append(perf_counter() - started if replied else None)
+            if sequence < count:
+                await asyncio.sleep(max(interval - (perf_counter() - started), 0))
+    finally:
+        transport.close()
+    return PingStats(target, address, rtts)
+
+
+@lru_cache(maxsize=None)
+def icmp_available() -> bool:
+    """Whether this process may open an ICMP socket (checked once)"""
+    try:
+        IcmpSocket().close()
+    except OSError:
+        return False
+    return True
+
+
+def is_ipv6(target: str) -> bool:
+    try:
+        return ipaddress.ip_address(target).version == 6
+    except ValueError:
+        return False
+
+
+def engine_serves(targets: Sequence[str]) -> bool:
+    """
+    Whether the engine should answer a ping request: PING_ENGINE is on, an
+    ICMP socket can be opened (or PING_LOOPBACK is set) and no target is an
+    IPv6 address. Everything else is left to the ping binary.
+    """
+    if not Config.PING_ENGINE or any(is_ipv6(target) for target in targets):
+        return False
+    return Config.PING_LOOPBACK or icmp_available()
+
+
+async def ping_many(targets: Sequence[str], loopback: Optional[bool] = None) -> List[PingStats]:
+    """Ping every target, at most Config.PING_CONCURRENCY at a time, in request order"""
+    if loopback is None:
+        loopback = Config.PING_LOOPBACK
+    limit = asyncio.Semaphore(Config.PING_CONCURRENCY)
+
+    async def bounded(target: str) -> PingStats:
+        async with limit:
+            return await ping(target, Config.PING_COUNT, Config.PING_INTERVAL, Config.PING_TIMEOUT, loopback)
+
+    return list(await asyncio.gather(*(bounded(target) for target in targets)))
+
+
+class EngineLoop:
+    """
+    Event loop on a daemon thread, started on first use, that runs the
+    engine for WSGI request threads instead of a new loop per request.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def run(self, targets: Sequence[str]) -> List[PingStats]:
+        """ping_many() on the shared loop, waited for from the calling thread"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ping-engine", daemon=True).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(ping_many(targets), loop).result()
+
+
+engine_loop = EngineLoop()
+
+
+def summarize(stats: PingStats) -> Dict[str, Any]:
+    """Packet counts and RTT statistics in milliseconds, as ``ping`` reports them"""
+    received = [rtt * 1e3 for rtt in stats.rtts if rtt is not None]
+    transmitted = len(stats.rtts)
+    return {
+        "target": stats.target,
+        "address": stats.address,
+        "transmitted": transmitted,
+        "received": len(received),
+        "packet_loss": 100.0 * (transmitted - len(received)) / transmitted if transmitted else 100.0,
+        "rtt_ms": [None if rtt is None else round(rtt * 1e3, 3) for rtt in stats.rtts],
+        "min": round(min(received), 3) if received else None,
+        "avg": round(mean(received), 3) if received else None,
+        "max": round(max(received), 3) if received else None,
+        "mdev": round(pstdev(received), 3) if received else None,
+        "error": stats.error,
+    }
+
+
+def format_output(stats: PingStats, summary: Dict[str, Any]) -> str:
+    """iputils-style text for the ``stdout`` field"""
+    lines = [f"PING {stats.target} ({stats.address}) {len(PAYLOAD)}({len(PAYLOAD) + 28}) bytes of data."]
+    for sequence, rtt in enumerate(summary["rtt_ms"], 1):
+        if rtt is not None:
+            lines.append(f"{len(PAYLOAD) + 8} bytes from {stats.address}: icmp_seq={sequence} time={rtt:.3f} ms")
+    lines += [
+        "",
+        f"--- {stats.target} ping statistics ---",
+        f"{summary['transmitted']} packets transmitted, {summary['received']} received, "
+        f"{summary['packet_loss']:g}% packet loss",
+    ]
+    if summary["received"]:
+        lines.append(
+            f"rtt min/avg/max/mdev = {summary['min']:.3f}/{summary['avg']:.3f}/"
+            f"{summary['max']:.3f}/{summary['mdev']:.3f} ms"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def ping_response(results: List[PingStats]) -> Dict[str, Any]:
+    """
+    stdout / stderr / returncode as the ping binary would report them, plus
+    per-target statistics. The return code follows ping: 2 on errors, 1 if
+    a target never replied, 0 otherwise.
+    """
+    if not results:
+        return {
+            "stdout": "",
+            "stderr": "ping: usage error: Destination address required\n",
+            "returncode": 2,
+            "results": [],
+        }
+    summaries = [summarize(stats) for stats in results]
+    stdout = "\n".join(
+        format_output(stats, summary) for stats, summary in zip(results, summaries) if stats.address
+    )
+    stderr = "".join(f"{stats.error}\n" for stats in results if stats.error)
+    if any(stats.error for stats in results):
+        returncode = 2
+    elif any(summary["received"] == 0 for summary in summaries):
+        returncode = 1
+    else:
+        returncode = 0
+    return {"stdout": stdout, "stderr": stderr, "returncode": returncode, "results": summaries}
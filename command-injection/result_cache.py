@@ -0,0 +1,133 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from executor import CommandResult
+from models import CommandType
+
+CacheKey = Tuple[str, ...]
+
+
+class ResultCache:
+    """
+    Results of idempotent mapped commands, kept for the TTL configured per
+    CommandType; types without a TTL always run. Concurrent misses for the
+    same command are coalesced so they share one child process. Only runs
+    that exit with 0 are stored.
+    """
+
+    def __init__(self, ttls: Dict[CommandType, float], maxsize: int):
+        self.ttls = ttls
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, Tuple[CommandResult, float]]" = OrderedDict()
+        self._running: Dict[CacheKey, Future] = {}
+        self._running_async: Dict[CacheKey, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            command_type.value: {"hits": 0, "misses": 0, "coalesced": 0}
+            for command_type in CommandType
+        }
+
+    def _get(self, command_type: CommandType, key: CacheKey) -> Optional[CommandResult]:
+        """Return a fresh entry and count the hit; call with the lock held"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self._counters[command_type.value]["hits"] += 1
+        return result
+
+    def _store(self, key: CacheKey, result: CommandResult, ttl: float) -> None:
+        """Keep a successful result; call with the lock held"""
+        if result[2] != 0:
+            return
+        self._entries[key] = (result, monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def run(self, command_type: CommandType, command_parts: List[str],
+            execute: Callable[[], CommandResult]) -> CommandResult:
+        """Return the cached result of ``command_parts`` or run it via ``execute``"""
+        ttl = self.ttls.get(command_type)
+        if not ttl:
+            return execute()
+
+        key = tuple(command_parts)
+        with self._lock:
+            cached = self._get(command_type, key)
+            if cached is not None:
+                return cached
+            future = self._running.get(key)
+            leader = future is None
+            if leader:
+                future = self._running[key] = Future()
+            self._counters[command_type.value]["misses" if leader else "coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = execute()
+        except BaseException as e:
+            with self._lock:
+                del self._running[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._running[key]
+            self._store(key, result, ttl)
+        future.set_result(result)
+        return result
+
+    async def run_async(self, command_type: CommandType, command_parts: List[str],
+                        execute: Callable[[], Awaitable[CommandResult]]) -> CommandResult:
+        """
+        Asyncio counterpart of run(). The command runs as its own task, so a
+        caller that disconnects does not cancel it for the others waiting.
+        """
+        ttl = self.ttls.get(command_type)
+        if not ttl:
+            return await execute()
+
+        key = tuple(command_parts)
+        with self._lock:
+            cached = self._get(command_type, key)
+            if cached is not None:
+                return cached
+            task = self._running_async.get(key)
+            leader = task is None
+            self._counters[command_type.value]["misses" if leader else "coalesced"] += 1
+        if leader:
+            task = self._running_async[key] = asyncio.ensure_future(execute())
+            task.add_done_callback(lambda done: self._finish_async(key, done, ttl))
+        return await asyncio.shield(task)
+
+    def _finish_async(self, key: CacheKey, task: asyncio.Task, ttl: float) -> None:
+        with self._lock:
+            del self._running_async[key]
+            if not task.cancelled() and task.exception() is None:
+                self._store(key, task.result(), ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """TTL per command type, entry count and hit / miss / coalesced counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl": {command_type.value: ttl for command_type, ttl in self.ttls.items()},
+                "commands": {name: dict(counters) for name, counters in self._counters.items()},
+            }
+
+
+result_cache = ResultCache(Config.COMMAND_CACHE_TTL, Config.COMMAND_CACHE_SIZE)
@@ -0,0 +1,252 @@
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from statistics import quantiles
+from time import monotonic, perf_counter
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from config import Config
+from executor import ExecutorBusy
+
+
+class QuotaExceeded(Exception):
+    """Raised when a client or endpoint is over its rate or concurrency quota"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Quota exceeded: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``; callers serialize access"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = monotonic()
+
+    def wait(self, now: float) -> float:
+        """Refill; return 0.0 if a token is available, else seconds until one is"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> float:
+        """Take a token; return 0.0 on success, else seconds until one is available"""
+        wait = self.wait(now)
+        if not wait:
+            self.tokens -= 1
+        return wait
+
+
+class EndpointState:
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.async_slots: Optional[asyncio.Semaphore] = None
+        self.running = 0
+        self.queued = 0
+        self.queue_times: Deque[float] = deque(maxlen=1024)
+        self.counters = {
+            "admitted": 0,
+            "client_rate": 0,
+            "client_concurrency": 0,
+            "endpoint_rate": 0,
+            "queue_timeout": 0,
+        }
+
+
+class ClientState:
+    def __init__(self, rate: float, burst: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.in_flight = 0
+
+
+class ExecutionScheduler:
+    """
+    Admission for command-executing endpoints. Each request passes, in order:
+    its client's concurrency cap and token bucket, the endpoint's token
+    bucket (all rejected at once with QuotaExceeded; tokens are only taken
+    once every check passes), then waits up to
+    ``queue_timeout`` seconds for one of the endpoint's concurrency slots
+    (ExecutorBusy after that). Queue times and rejections are kept per
+    endpoint. Clients are tracked by address, least recently seen dropped
+    beyond ``max_clients``.
+    """
+
+    def __init__(self, endpoint_limits: Dict[str, Dict[str, float]], default_limits: Dict[str, float],
+                 client_rate: float, client_burst: int, client_concurrency: int,
+                 queue_timeout: float, max_clients: int):
+        self.endpoint_limits = endpoint_limits
+        self.default_limits = default_limits
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.client_concurrency = client_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_clients = max_clients
+        self._endpoints: Dict[str, EndpointState] = {}
+        self._clients: "OrderedDict[str, ClientState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _endpoint(self, name: str) -> EndpointState:
+        state = self._endpoints.get(name)
+        if state is None:
+            limits = {**self.default_limits, **self.endpoint_limits.get(name, {})}
+            state = self._endpoints[name] = EndpointState(
+                int(limits["concurrency"]), limits["rate"], int(limits["burst"])
+            )
+        return state
+
+    def _client(self, address: str) -> ClientState:
+        state = self._clients.get(address)
+        if state is None:
+            state = self._clients[address] = ClientState(self.client_rate, self.client_burst)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(address)
+        return state
+
+    def _check_quotas(self, name: str, address: str) -> Tuple[EndpointState, ClientState]:
+        """Apply the client and endpoint quotas and reserve a client slot"""
+        with self._lock:
+            endpoint = self._endpoint(name)
+            client = self._client(address)
+            now = monotonic()
+            if client.in_flight >= self.client_concurrency:
+                endpoint.counters["client_concurrency"] += 1
+                raise QuotaExceeded("too many concurrent requests from this client", 1.0)
+            wait = client.bucket.wait(now)
+            if wait:
+                endpoint.counters["client_rate"] += 1
+                raise QuotaExceeded("client request rate exceeded", wait)
+            wait = endpoint.bucket.wait(now)
+            if wait:
+                endpoint.counters["endpoint_rate"] += 1
+                raise QuotaExceeded(f"request rate for {name} exceeded", wait)
+            # A request one bucket rejects must not spend the other's token
+            client.bucket.take(now)
+            endpoint.bucket.take(now)
+            client.in_flight += 1
+            endpoint.queued += 1
+        return endpoint, client
+
+    def _admitted(self, endpoint: EndpointState, client: ClientState, waited: float, ok: bool) -> None:
+        with self._lock:
+            endpoint.queued -= 1
+            if ok:
+                endpoint.running += 1
+                endpoint.counters["admitted"] += 1
+                endpoint.queue_times.append(waited)
+            else:
+                client.in_flight -= 1
+                endpoint.counters["queue_timeout"] += 1
+
+    def _finished(self, endpoint: EndpointState, client: ClientState) -> None:
+        with self._lock:
+            endpoint.running -= 1
+            client.in_flight -= 1
+
+    def acquire(self, name: str, address: str) -> Callable[[], None]:
+        """Admit a request from a worker thread; returns the function that releases it"""
+        endpoint, client = self._check_quotas(name, address)
+        started = perf_counter()
+        ok = endpoint.slots.acquire(timeout=self.queue_timeout)
+        self._admitted(endpoint, client, perf_counter() - started, ok)
+        if not ok:
+            raise ExecutorBusy(f"no free {name} slot within {self.queue_timeout:g} seconds")
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                endpoint.slots.release()
+                self._finished(endpoint, client)
+
+        return release
+
+    async def acquire_async(self, name: str, address: str) -> Callable[[], None]:
+        """Admit a request on the event loop; returns the function that releases it"""
+        endpoint, client = self._check_quotas(name, address)
+        if endpoint.async_slots is None:
+            endpoint.async_slots = asyncio.Semaphore(endpoint.concurrency)
+        slots = endpoint.async_slots
+        started = perf_counter()
+        ok = False
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            ok = True
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Also runs when the client disconnects while queued
+            self._admitted(endpoint, client, perf_counter() - started, ok)
+        if not ok:
+            raise ExecutorBusy(f"no free {name} slot within {self.queue_timeout:g} seconds")
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                slots.release()
+                self._finished(endpoint, client)
+
+        return release
+
+    @contextmanager
+    def admit(self, name: str, address: str) -> Iterator[None]:
+        release = self.acquire(name, address)
+        try:
+            yield
+        finally:
+            release()
+
+    @asynccontextmanager
+    async def admit_async(self, name: str, address: str) -> AsyncIterator[None]:
+        release = await self.acquire_async(name, address)
+        try:
+            yield
+        finally:
+            release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint limits, running and queued requests, rejections and queue-time percentiles"""
+        with self._lock:
+            endpoints = {}
+            for name, state in self._endpoints.items():
+                samples = sorted(state.queue_times)
+                if len(samples) > 1:
+                    cuts = quantiles(samples, n=100, method="inclusive")
+                    queue_ms = {"p50": cuts[49] * 1e3, "p95": cuts[94] * 1e3, "p99": cuts[98] * 1e3}
+                else:
+                    value = samples[0] * 1e3 if samples else 0.0
+                    queue_ms = {"p50": value, "p95": value, "p99": value}
+                endpoints[name] = {
+                    "concurrency": state.concurrency,
+                    "rate": state.bucket.rate,
+                    "burst": state.bucket.burst,
+                    "running": state.running,
+                    "queued": state.queued,
+                    **state.counters,
+                    "queue_time_ms": {key: round(value, 3) for key, value in queue_ms.items()},
+                }
+            return {"clients": len(self._clients), "endpoints": endpoints}
+
+
+scheduler = ExecutionScheduler(
+    endpoint_limits=Config.ENDPOINT_LIMITS,
+    default_limits=Config.DEFAULT_ENDPOINT_LIMITS,
+    client_rate=Config.CLIENT_RATE,
+    client_burst=Config.CLIENT_BURST,
+    client_concurrency=Config.CLIENT_CONCURRENCY,
+    queue_timeout=Config.SCHEDULER_QUEUE_TIMEOUT,
+    max_clients=Config.SCHEDULER_MAX_CLIENTS,
+)
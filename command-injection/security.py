@@ -1,15 +1,15 @@
-import re
 import shlex
-import subprocess
 from typing import List, Tuple
 
+from async_executor import async_executor
+from executor import command_executor
 from models import CommandType
+from validation import strip_dangerous_chars
 
 
 def sanitize_input_regex(input_str: str) -> str:
-    """Sanitize input by removing dangerous characters using regex"""
-    dangerous_chars = r"[;&|><`$\{\}\(\)\n]"
-    return re.sub(dangerous_chars, "", input_str)
+    """Sanitize input by removing dangerous characters (see validation.py)"""
+    return strip_dangerous_chars(input_str)
 
 
 def escape_shell_input(input_str: str) -> str:
@@ -19,43 +19,46 @@ def escape_shell_input(input_str: str) -> str:
 
 def execute_safely_with_subprocess(command: str, shell=False) -> Tuple[str, str, int]:
     """
-    Execute command safely using subprocess
+    Execute command safely on the worker pool (see executor.py)
     Returns: (stdout, stderr, return_code)
+    Raises ExecutorBusy when the pool cannot admit the command.
     """
+    if shell:
+        # Still dangerous, only use for demonstration of vulnerable endpoint
+        return command_executor.run(command, shell=True)
     try:
-        if shell:
-            # Still dangerous, only use for demonstration of vulnerable endpoint
-            result = subprocess.run(
-                command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-        else:
-            # Split command into parts for safer execution
-            command_parts = shlex.split(command)
-            result = subprocess.run(
-                command_parts,
-                shell=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-        return (result.stdout, result.stderr, result.returncode)
-    except Exception as e:
+        # Split command into parts for safer execution
+        command_parts = shlex.split(command)
+    except ValueError as e:
         return ("", str(e), -1)
+    return command_executor.run(command_parts, shell=False)
+
+
+async def execute_safely_async(command: str, shell=False) -> Tuple[str, str, int]:
+    """
+    Asyncio counterpart of execute_safely_with_subprocess (see async_executor.py)
+    Returns: (stdout, stderr, return_code)
+    """
+    if shell:
+        # Still dangerous, only use for demonstration of vulnerable endpoint
+        return await async_executor.run(command, shell=True)
+    try:
+        command_parts = shlex.split(command)
+    except ValueError as e:
+        return ("", str(e), -1)
+    return await async_executor.run(command_parts, shell=False)
+
+
+COMMAND_MAP = {
+    CommandType.LS: ("ls",),
+    CommandType.PING: ("ping", "-c", "4"),
+    CommandType.WHOAMI: ("whoami",),
+}
 
 
 def get_mapped_command(command_type: CommandType, args: str = None) -> List[str]:
     """Map predefined commands to their executable forms"""
-    command_map = {
-        CommandType.LS: ["ls"],
-        CommandType.PING: ["ping", "-c", "4"],
-        CommandType.WHOAMI: ["whoami"],
-    }
-
-    base_command = command_map[command_type]
+    base_command = list(COMMAND_MAP[command_type])
     if args and command_type == CommandType.PING:
         return base_command + [args]
     return base_command
@@ -0,0 +1,4 @@
+def server_sent_event(event: str, data: str) -> str:
+    """One Server-Sent Events message; each line of ``data`` gets its own data field"""
+    lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n"
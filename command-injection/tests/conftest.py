@@ -0,0 +1,39 @@
+import pytest
+
+from app import app
+from config import Config
+from executor import CommandExecutor
+
+
+@pytest.fixture
+def make_executor():
+    """Build small CommandExecutors and shut them down after the test"""
+    executors = []
+
+    def make(**overrides):
+        options = {
+            "workers": 2,
+            "queue_size": 0,
+            "admission_timeout": 0.05,
+            "limits": {},
+            "start_method": Config.EXECUTOR_START_METHOD,
+            "timeout": Config.COMMAND_TIMEOUT,
+            "max_output": Config.COMMAND_MAX_OUTPUT,
+        }
+        options.update(overrides)
+        executor = CommandExecutor(**options)
+        executors.append(executor)
+        return executor
+
+    yield make
+    for executor in executors:
+        executor.shutdown()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Flask test client with the execution quotas off"""
+    monkeypatch.setattr(Config, "SCHEDULER_ENABLED", False)
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
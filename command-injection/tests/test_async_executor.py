@@ -0,0 +1,98 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+import security
+from asgi import app as asgi_app
+from async_executor import AsyncCommandExecutor
+from config import Config
+from executor import TIMEOUT_MARKER, ExecutorBusy
+
+
+def make_async_executor(**overrides):
+    options = {
+        "max_concurrency": 2,
+        "queue_size": 0,
+        "admission_timeout": 0.05,
+        "limits": {},
+        "timeout": Config.COMMAND_TIMEOUT,
+        "max_output": Config.COMMAND_MAX_OUTPUT,
+    }
+    options.update(overrides)
+    return AsyncCommandExecutor(**options)
+
+def test_async_executor_runs_commands():
+    """Test that commands run as asyncio subprocesses with the shared limits"""
+    async def run():
+        executor = make_async_executor(timeout=0.2)
+        return (
+            await executor.run(["echo", "hello"]),
+            await executor.run("echo started; sleep 5", shell=True),
+            executor.stats(),
+        )
+
+    output, timed_out, stats = asyncio.run(run())
+    assert output == ("hello\n", "", 0)
+    assert timed_out == ("started\n", TIMEOUT_MARKER.format(timeout=0.2), -9)
+    assert stats["submitted"] == stats["completed"] == 2
+
+def test_async_executor_sheds_commands_beyond_capacity():
+    """Test that a full executor rejects with ExecutorBusy"""
+    async def run():
+        executor = make_async_executor(max_concurrency=1, queue_size=0)
+        running = asyncio.create_task(executor.run(["sleep", "0.3"]))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorBusy, match="execution queue full"):
+            await executor.run(["echo", "late"])
+        await running
+        return executor.stats()
+
+    assert asyncio.run(run())["rejected"] == 1
+
+def test_async_executor_limits_commands_per_executable():
+    """Test that COMMAND_CONCURRENCY-style limits apply as in CommandExecutor"""
+    async def run():
+        executor = make_async_executor(max_concurrency=4, limits={"sleep": 1})
+        running = asyncio.create_task(executor.run(["sleep", "0.3"]))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorBusy, match="too many concurrent 'sleep' commands"):
+            await executor.run(["sleep", "0"])
+        # Other executables still run
+        assert (await executor.run(["echo", "ok"]))[2] == 0
+        await running
+        # The limit is released with the command
+        return await executor.run(["sleep", "0"])
+
+    assert asyncio.run(run())[2] == 0
+
+def test_asgi_routes_run_and_shed_commands(monkeypatch):
+    """Test that the ASGI app runs commands and answers shed ones with 503"""
+    monkeypatch.setattr(Config, "SCHEDULER_ENABLED", False)
+
+    async def run():
+        executor = make_async_executor(max_concurrency=1, queue_size=0)
+        monkeypatch.setattr(security, "async_executor", executor)
+        client = asgi_app.test_client()
+        ok = await client.post("/secure/subprocess_safe", json={"command": "echo hi"})
+        running = asyncio.create_task(executor.run(["sleep", "0.3"]))
+        await asyncio.sleep(0.05)
+        busy = await client.post("/secure/subprocess_safe", json={"command": "echo hi"})
+        await running
+        return ok.status_code, await ok.get_json(), busy.status_code, busy.headers.get("Retry-After")
+
+    ok_status, ok_body, busy_status, retry_after = asyncio.run(run())
+    assert ok_status == 200
+    assert ok_body["stdout"] == "hi\n"
+    assert (busy_status, retry_after) == (503, "1")
+
+def test_asgi_app_does_not_import_the_flask_app():
+    """Test that the ASGI entry point loads without building the Flask app"""
+    code = "import sys, asgi; print('app' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert result.stdout.strip() == "False"
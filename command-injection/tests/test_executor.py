@@ -0,0 +1,77 @@
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import security
+from executor import ExecutorBusy
+
+
+def test_executor_runs_commands_on_started_workers(make_executor):
+    """Test that commands run on the pre-spawned pool and are counted"""
+    executor = make_executor()
+    executor.start()
+    assert executor.stats()["started"] is True
+
+    assert executor.run(["echo", "hello"]) == ("hello\n", "", 0)
+    stdout, stderr, returncode = executor.run("echo out; echo err >&2; exit 3", shell=True)
+    assert (stdout, stderr, returncode) == ("out\n", "err\n", 3)
+
+    stats = executor.stats()
+    assert stats["submitted"] == stats["completed"] == 2
+    assert stats["in_flight"] == {}
+
+def test_executor_sheds_commands_beyond_capacity(make_executor):
+    """Test that a full pool rejects with ExecutorBusy instead of queueing"""
+    executor = make_executor(workers=1, queue_size=0)
+    running = executor.submit(["sleep", "0.5"])
+
+    with pytest.raises(ExecutorBusy):
+        executor.run(["echo", "late"])
+    assert executor.stats()["rejected"] == 1
+    assert running.result()[2] == 0
+
+    assert executor.run(["echo", "again"])[0] == "again\n"
+
+def test_executor_limits_commands_per_executable(make_executor):
+    """Test that per-executable limits apply on top of the pool"""
+    executor = make_executor(workers=2, limits={"sleep": 1})
+    running = executor.submit(["sleep", "0.5"])
+
+    with pytest.raises(ExecutorBusy, match="too many concurrent 'sleep' commands"):
+        executor.run(["sleep", "0"])
+    # Other executables still get the free worker
+    assert executor.run(["echo", "ok"])[2] == 0
+    running.result()
+
+def test_executor_replaces_a_broken_pool(make_executor):
+    """Test that concurrent commands survive killed workers and get a fresh pool"""
+    executor = make_executor(workers=2, queue_size=8, admission_timeout=5)
+    pool = executor.start()
+    for pid in list(pool._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        results = list(threads.map(lambda _: executor.run(["echo", "ok"]), range(8)))
+
+    # Commands caught in the dying pool report an error; none raise
+    assert all(result[2] in (0, -1) for result in results)
+    assert executor.stats()["restarts"] >= 1
+    assert executor.run(["echo", "ok"]) == ("ok\n", "", 0)
+
+def test_busy_executor_returns_503(client, make_executor, monkeypatch):
+    """Test that shed commands are answered with 503 and Retry-After"""
+    executor = make_executor(workers=1, queue_size=0, admission_timeout=0.01)
+    monkeypatch.setattr(security, "command_executor", executor)
+    running = executor.submit(["sleep", "0.5"])
+
+    response = client.post("/secure/subprocess_safe", json={"command": "echo hi"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert "execution queue full" in response.json["error"]
+    running.result()
+
+    response = client.post("/secure/subprocess_safe", json={"command": "echo hi"})
+    assert response.status_code == 200
+    assert response.json["stdout"] == "hi\n"
@@ -0,0 +1,47 @@
+import os
+import subprocess
+
+import app as app_module
+from config import Config
+from models import CommandType
+from native import current_user, list_directory, native_backend
+
+
+def test_list_directory_matches_ls(tmp_path):
+    """Test that the in-process ls lists like ls under the C locale"""
+    for name in ("b.txt", "A.txt", "_c", ".hidden"):
+        (tmp_path / name).touch()
+    (tmp_path / "dir").mkdir()
+
+    expected = subprocess.run(["ls", str(tmp_path)], capture_output=True, text=True,
+                              env={**os.environ, "LC_ALL": "C"}).stdout
+    assert list_directory(str(tmp_path)) == (expected, "", 0)
+    assert list_directory(str(tmp_path)) == ("A.txt\n_c\nb.txt\ndir\n", "", 0)
+
+def test_list_directory_reports_errors_like_ls(tmp_path):
+    """Test that a missing directory gives ls's message and exit status"""
+    stdout, stderr, returncode = list_directory(str(tmp_path / "missing"))
+    assert stdout == ""
+    assert stderr.startswith("ls: cannot open directory")
+    assert returncode == 2
+
+def test_current_user_matches_whoami():
+    """Test that the in-process whoami names the effective user"""
+    expected = subprocess.run(["whoami"], capture_output=True, text=True).stdout
+    assert current_user() == (expected, "", 0)
+
+def test_native_backend_follows_config(monkeypatch):
+    """Test that only types in NATIVE_COMMANDS are answered in-process"""
+    assert native_backend(CommandType.LS) is list_directory
+    assert native_backend(CommandType.PING) is None
+    monkeypatch.setattr(Config, "NATIVE_COMMANDS", {CommandType.WHOAMI})
+    assert native_backend(CommandType.LS) is None
+
+def test_mapped_native_command_spawns_nothing(client):
+    """Test that /secure/command_mapping answers whoami without the worker pool"""
+    before = app_module.command_executor.stats()["submitted"]
+    response = client.post("/secure/command_mapping", json={"command_type": "whoami"})
+
+    assert response.status_code == 200
+    assert (response.json["stdout"], response.json["returncode"]) == (current_user()[0], 0)
+    assert app_module.command_executor.stats()["submitted"] == before
@@ -0,0 +1,50 @@
+from executor import TIMEOUT_MARKER, TRUNCATION_MARKER
+
+
+def test_timed_out_command_is_killed(make_executor):
+    """Test that a command past the timeout is killed and marked"""
+    executor = make_executor(timeout=0.2)
+    stdout, stderr, returncode = executor.run("echo started; sleep 5", shell=True)
+
+    assert stdout == "started\n"
+    assert stderr == TIMEOUT_MARKER.format(timeout=0.2)
+    assert returncode == -9
+
+def test_output_is_truncated_at_the_cap(make_executor):
+    """Test that a stream past max_output is cut at the cap and the child killed"""
+    executor = make_executor(max_output=10)
+    stdout, stderr, returncode = executor.run(["yes"])
+
+    assert stdout == "y\n" * 5 + TRUNCATION_MARKER.format(limit=10)
+    assert returncode == -9
+
+def test_stream_relays_events_and_exit_code(make_executor):
+    """Test that a stream yields output as it runs, then the exit code"""
+    executor = make_executor(timeout=0.2)
+    events = list(executor.stream("echo one; echo two >&2; sleep 5", shell=True))
+
+    assert ("stdout", "one\n") in events
+    assert ("stderr", "two\n") in events
+    assert events[-2:] == [("stderr", TIMEOUT_MARKER.format(timeout=0.2)), ("exit", "-9")]
+    assert executor.stats()["in_flight"] == {}
+
+def test_closed_stream_kills_the_command(make_executor):
+    """Test that closing a stream early kills the child and frees its slot"""
+    executor = make_executor(workers=1)
+    stream = executor.stream(["sleep", "5"])
+    assert executor.stats()["in_flight"] == {"sleep": 1}
+
+    stream.close()
+    stream.close()
+    assert stream.proc.returncode == -9
+    assert executor.stats()["in_flight"] == {}
+
+def test_stream_route_sends_server_sent_events(client):
+    """Test that the streaming route relays output and exit code as SSE"""
+    response = client.post("/secure/command_mapping/stream", json={"command_type": "whoami"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    body = response.get_data(as_text=True)
+    assert body.startswith("event: stdout\ndata: ")
+    assert body.endswith("event: exit\ndata: 0\n\n")
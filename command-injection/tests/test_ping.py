@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app as app_module
+import ping
+from asgi import app as asgi_app
+from config import Config
+from ping import engine_loop, engine_serves, ping_many, ping_response
+
+
+@pytest.fixture
+def loopback_engine(monkeypatch):
+    """Ping engine on, answering every probe in-process"""
+    monkeypatch.setattr(Config, "PING_ENGINE", True)
+    monkeypatch.setattr(Config, "PING_LOOPBACK", True)
+    monkeypatch.setattr(Config, "PING_INTERVAL", 0.0)
+
+def test_engine_reports_like_ping(loopback_engine):
+    """Test that replies are summarized in ping's output format and return code"""
+    response = ping_response(asyncio.run(ping_many(["a.example", "b.example"])))
+
+    assert response["returncode"] == 0
+    assert [result["received"] for result in response["results"]] == [Config.PING_COUNT] * 2
+    assert "--- a.example ping statistics ---" in response["stdout"]
+    assert f"{Config.PING_COUNT} packets transmitted, {Config.PING_COUNT} received, 0% packet loss" in response["stdout"]
+
+def test_engine_reports_unknown_hosts():
+    """Test that an unresolvable target gives ping's error and return code 2"""
+    response = ping_response(asyncio.run(ping_many(["host.invalid"], loopback=False)))
+    assert response["returncode"] == 2
+    assert response["stderr"] == "ping: host.invalid: Name or service not known\n"
+
+def test_engine_serves_only_what_it_can(loopback_engine, monkeypatch):
+    """Test that the binary is kept for IPv6, missing ICMP access and PING_ENGINE off"""
+    assert engine_serves(["127.0.0.1", "localhost"])
+    assert not engine_serves(["::1"])
+    assert not engine_serves(["127.0.0.1", "2001:db8::1"])
+
+    monkeypatch.setattr(Config, "PING_LOOPBACK", False)
+    monkeypatch.setattr(ping, "icmp_available", lambda: False)
+    assert not engine_serves(["127.0.0.1"])
+
+    monkeypatch.setattr(Config, "PING_ENGINE", False)
+    monkeypatch.setattr(Config, "PING_LOOPBACK", True)
+    assert not engine_serves(["127.0.0.1"])
+
+def test_engine_loop_is_shared_across_threads(loopback_engine):
+    """Test that WSGI threads submit to one engine loop instead of creating their own"""
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        results = list(threads.map(lambda _: engine_loop.run(["127.0.0.1"]), range(8)))
+
+    assert all(stats.error is None and len(stats.rtts) == Config.PING_COUNT for [stats] in results)
+    assert [thread.name for thread in threading.enumerate()].count("ping-engine") == 1
+
+def test_mapping_route_probes_targets(client, loopback_engine):
+    """Test that /secure/command_mapping answers every target through the engine"""
+    response = client.post("/secure/command_mapping", json={"command_type": "ping", "targets": ["a", "b"]})
+    assert response.status_code == 200
+    assert response.json["command"] == "ping -c 4 a b"
+    assert [result["target"] for result in response.json["results"]] == ["a", "b"]
+
+def test_mapping_route_rejects_args_with_targets(client, loopback_engine):
+    """Test that args and targets together are rejected instead of ignoring args"""
+    response = client.post(
+        "/secure/command_mapping", json={"command_type": "ping", "args": "a", "targets": ["b"]}
+    )
+    assert response.status_code == 400
+    assert "either args or targets" in response.json["error"]
+
+def test_mapping_route_falls_back_to_the_binary(client, loopback_engine, monkeypatch):
+    """Test that IPv6 targets run the binary instead of failing in the engine"""
+    ran = []
+
+    def run(parts, shell=False):
+        ran.append(parts)
+        return ("", "", 0)
+
+    monkeypatch.setattr(app_module.command_executor, "run", run)
+    response = client.post("/secure/command_mapping", json={"command_type": "ping", "args": "::1"})
+    assert response.status_code == 200
+    assert "results" not in response.json
+    assert ran == [["ping", "-c", "4", "::1"]]
+
+    response = client.post("/secure/command_mapping", json={"command_type": "ping", "targets": ["::1"]})
+    assert response.status_code == 400
+
+def test_stream_route_rejects_targets(client, monkeypatch):
+    """Test that the streaming routes reject targets instead of pinging no host"""
+    monkeypatch.setattr(app_module.command_executor, "stream", pytest.fail)
+    body = {"command_type": "ping", "targets": ["a", "b"]}
+    response = client.post("/secure/command_mapping/stream", json=body)
+    assert response.status_code == 400
+    assert "targets is not supported when streaming" in response.json["error"]
+
+    async def run():
+        response = await asgi_app.test_client().post("/secure/command_mapping/stream", json=body)
+        return response.status_code, await response.get_json()
+
+    status, payload = asyncio.run(run())
+    assert status == 400
+    assert "targets is not supported when streaming" in payload["error"]
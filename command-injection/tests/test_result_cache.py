@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from models import CommandType
+from result_cache import ResultCache
+
+
+class CountingCommand:
+    """Stand-in for an executor run that counts how often it actually ran"""
+
+    def __init__(self, result=("out\n", "", 0), delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.result
+
+    async def run_async(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+def test_cache_reuses_results_within_ttl():
+    """Test that a successful result is reused until its TTL passes"""
+    cache = ResultCache({CommandType.PING: 0.1}, maxsize=8)
+    command = CountingCommand()
+
+    assert cache.run(CommandType.PING, ["ping", "a"], command) == command.result
+    assert cache.run(CommandType.PING, ["ping", "a"], command) == command.result
+    assert command.calls == 1
+    cache.run(CommandType.PING, ["ping", "b"], command)
+    assert command.calls == 2
+
+    time.sleep(0.15)
+    cache.run(CommandType.PING, ["ping", "a"], command)
+    assert command.calls == 3
+    assert cache.stats()["commands"]["ping"] == {"hits": 1, "misses": 3, "coalesced": 0}
+
+def test_cache_skips_failures_and_types_without_ttl():
+    """Test that failed runs and types without a TTL always run again"""
+    cache = ResultCache({CommandType.PING: 10}, maxsize=8)
+    failing = CountingCommand(result=("", "unknown host\n", 2))
+    cache.run(CommandType.PING, ["ping", "x"], failing)
+    cache.run(CommandType.PING, ["ping", "x"], failing)
+    assert failing.calls == 2
+
+    uncached = CountingCommand()
+    cache.run(CommandType.LS, ["ls"], uncached)
+    cache.run(CommandType.LS, ["ls"], uncached)
+    assert uncached.calls == 2
+    assert cache.stats()["entries"] == 0
+
+def test_cache_coalesces_concurrent_misses():
+    """Test that concurrent identical requests share one run"""
+    cache = ResultCache({CommandType.PING: 10}, maxsize=8)
+    command = CountingCommand(delay=0.2)
+
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        results = list(threads.map(lambda _: cache.run(CommandType.PING, ["ping", "a"], command), range(8)))
+
+    assert results == [command.result] * 8
+    assert command.calls == 1
+    counters = cache.stats()["commands"]["ping"]
+    assert counters["misses"] == 1
+    assert counters["coalesced"] == 7
+
+def test_async_cache_coalesces_concurrent_misses():
+    """Test that concurrent identical coroutines share one task"""
+    cache = ResultCache({CommandType.PING: 10}, maxsize=8)
+    command = CountingCommand(delay=0.1)
+
+    async def run():
+        return await asyncio.gather(*(
+            cache.run_async(CommandType.PING, ["ping", "a"], command.run_async) for _ in range(8)
+        ))
+
+    assert asyncio.run(run()) == [command.result] * 8
+    assert command.calls == 1
+    assert cache.stats()["commands"]["ping"]["coalesced"] == 7
+
+def test_default_ttls_cover_spawned_commands_only():
+    """Test that no default TTL is configured for a natively answered type"""
+    assert Config.COMMAND_CACHE_TTL
+    assert not set(Config.COMMAND_CACHE_TTL) & Config.NATIVE_COMMANDS
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+import app as app_module
+from config import Config
+from executor import ExecutorBusy
+from scheduler import ExecutionScheduler, QuotaExceeded, TokenBucket
+
+
+def make_scheduler(**overrides):
+    options = {
+        "endpoint_limits": {},
+        "default_limits": {"concurrency": 4, "rate": 100.0, "burst": 100},
+        "client_rate": 100.0,
+        "client_burst": 100,
+        "client_concurrency": 4,
+        "queue_timeout": 0.05,
+        "max_clients": 100,
+    }
+    options.update(overrides)
+    return ExecutionScheduler(**options)
+
+def test_token_bucket_waits_without_taking():
+    """Test that wait() refills without spending and take() spends one token"""
+    bucket = TokenBucket(rate=2.0, burst=1)
+    now = bucket.updated
+    assert bucket.wait(now) == 0.0
+    assert bucket.take(now) == 0.0
+    assert bucket.wait(now) == bucket.take(now) == pytest.approx(0.5)
+    assert bucket.take(now + 0.5) == 0.0
+
+def test_endpoint_rejection_keeps_client_token():
+    """Test that a request the endpoint bucket rejects does not spend the client's token"""
+    scheduler = make_scheduler(
+        endpoint_limits={"limited": {"rate": 0.01, "burst": 1}}, client_rate=0.01, client_burst=2
+    )
+    scheduler.acquire("limited", "client")()
+    with pytest.raises(QuotaExceeded, match="request rate for limited exceeded"):
+        scheduler.acquire("limited", "client")
+    # The client's second token is still there for another endpoint
+    scheduler.acquire("other", "client")()
+    with pytest.raises(QuotaExceeded, match="client request rate exceeded"):
+        scheduler.acquire("other", "client")
+
+    counters = scheduler.stats()["endpoints"]
+    assert counters["limited"]["admitted"] == 1
+    assert counters["limited"]["endpoint_rate"] == 1
+    assert counters["other"]["admitted"] == 1
+    assert counters["other"]["client_rate"] == 1
+
+def test_client_concurrency_cap():
+    """Test that a client over its concurrency cap is rejected until a request finishes"""
+    scheduler = make_scheduler(client_concurrency=1)
+    release = scheduler.acquire("endpoint", "client")
+    with pytest.raises(QuotaExceeded) as excinfo:
+        scheduler.acquire("endpoint", "client")
+    assert excinfo.value.retry_after == 1.0
+    scheduler.acquire("endpoint", "other client")()
+    release()
+    scheduler.acquire("endpoint", "client")()
+    assert scheduler.stats()["endpoints"]["endpoint"]["client_concurrency"] == 1
+
+def test_queue_timeout_raises_executor_busy():
+    """Test that a request waiting longer than queue_timeout for a slot is shed"""
+    scheduler = make_scheduler(default_limits={"concurrency": 1, "rate": 100.0, "burst": 100},
+                               client_concurrency=1)
+    release = scheduler.acquire("endpoint", "first")
+    with pytest.raises(ExecutorBusy, match="no free endpoint slot"):
+        scheduler.acquire("endpoint", "second")
+    release()
+    # The timed-out request gave its client slot back
+    scheduler.acquire("endpoint", "second")()
+
+    stats = scheduler.stats()["endpoints"]["endpoint"]
+    assert stats["admitted"] == 2
+    assert stats["queue_timeout"] == 1
+    assert stats["running"] == stats["queued"] == 0
+
+def test_async_queue_timeout_raises_executor_busy():
+    """Test that acquire_async sheds requests after queue_timeout and releases slots"""
+    scheduler = make_scheduler(default_limits={"concurrency": 1, "rate": 100.0, "burst": 100})
+
+    async def run():
+        release = await scheduler.acquire_async("endpoint", "client")
+        with pytest.raises(ExecutorBusy):
+            await scheduler.acquire_async("endpoint", "client")
+        release()
+        async with scheduler.admit_async("endpoint", "client"):
+            pass
+
+    asyncio.run(run())
+    stats = scheduler.stats()["endpoints"]["endpoint"]
+    assert stats["admitted"] == 2
+    assert stats["queue_timeout"] == 1
+
+def test_client_rate_returns_429_with_retry_after(client, monkeypatch):
+    """Test that a client over its rate gets 429 and a Retry-After header"""
+    scheduler = make_scheduler(client_rate=0.5, client_burst=2)
+    monkeypatch.setattr(Config, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(app_module, "scheduler", scheduler)
+
+    for _ in range(2):
+        assert client.post("/secure/whitelist", json={"command": "pwd"}).status_code == 400
+    response = client.post("/secure/whitelist", json={"command": "pwd"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert "client request rate exceeded" in response.get_json()["error"]
+    assert scheduler.stats()["endpoints"]["secure_whitelist"]["client_rate"] == 1
+
+def test_endpoint_rate_returns_429_with_retry_after(client, monkeypatch):
+    """Test that requests over an endpoint's rate get 429 and a Retry-After header"""
+    scheduler = make_scheduler(endpoint_limits={"secure_whitelist": {"rate": 0.25, "burst": 1}})
+    monkeypatch.setattr(Config, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(app_module, "scheduler", scheduler)
+
+    assert client.post("/secure/whitelist", json={"command": "pwd"}).status_code == 400
+    response = client.post("/secure/whitelist", json={"command": "pwd"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "4"
+    assert "request rate for secure_whitelist exceeded" in response.get_json()["error"]
+    # Other endpoints are not limited by it
+    assert client.post("/secure/blacklist_keywords", json={"command": "ls;"}).status_code == 400
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+from pydantic import ValidationError
+
+from models import BlacklistKeywordsRequest, CommandType, WhitelistCommandRequest
+from validation import DANGEROUS_CHARS, Whitelist, strip_dangerous_chars
+
+
+def legacy_sanitize(value):
+    return re.sub(r"[;&|><`$\{\}\(\)\n]", "", value)
+
+
+@pytest.mark.parametrize("size", [0, 16, 127, 128, 4096])
+def test_strip_dangerous_chars_matches_regex(size):
+    """Test that short (regex) and long (translate) inputs are stripped alike"""
+    text = "ls -la $(id) `whoami` {a,b} (x) > out; a && b || c <in\n"
+    value = (text * (size // len(text) + 1))[:size]
+    stripped = strip_dangerous_chars(value)
+    assert stripped == legacy_sanitize(value)
+    assert not set(stripped) & set(DANGEROUS_CHARS)
+
+def test_whitelist_checks_membership():
+    """Test that the whitelist accepts its values and rejects everything else"""
+    whitelist = Whitelist(["ls", "whoami"])
+    assert whitelist.check("ls") == "ls"
+    for value in ("l", "pwd", "ls -la", "whoami" * 1000):
+        with pytest.raises(ValueError, match="Allowed commands: ls, whoami"):
+            whitelist.check(value)
+
+def test_whitelist_model_strips_and_rejects():
+    """Test that the whitelist model strips the command and lists the allowed ones"""
+    assert WhitelistCommandRequest(command="  whoami ").command == "whoami"
+    allowed = ", ".join(cmd.value for cmd in CommandType)
+    with pytest.raises(ValidationError, match=f"Allowed commands: {allowed}"):
+        WhitelistCommandRequest(command="ls; id")
+    with pytest.raises(ValidationError, match="Command cannot be empty"):
+        WhitelistCommandRequest(command="   ")
+
+@pytest.mark.parametrize("command, keyword", [
+    ("rm -rf /", "rm"),
+    ("ls; id", ";"),
+    ("ls && id", "&&"),
+    ("ls || id", "||"),
+    ("ls > out", ">"),
+    ("ls < in", "<"),
+    ("ls | id", "|"),
+    ("ls & id", "&"),
+    ("ls | rm", "rm"),
+])
+def test_blacklist_model_reports_first_keyword(command, keyword):
+    """Test that the blacklist model names the first blacklisted keyword found"""
+    with pytest.raises(ValidationError, match=f"blacklisted keyword: {re.escape(keyword)} "):
+        BlacklistKeywordsRequest(command=command)
+
+def test_blacklist_model_accepts_clean_commands():
+    """Test that commands without blacklisted keywords pass unchanged"""
+    assert BlacklistKeywordsRequest(command=" ls -la ").command == "ls -la"
+
+def test_validation_errors_are_400(client):
+    """Test that the whitelist and blacklist endpoints reject bad input with 400"""
+    response = client.post("/secure/whitelist", json={"command": "cat /etc/passwd"})
+    assert response.status_code == 400
+    assert "Command not allowed" in response.get_json()["error"]
+
+    response = client.post("/secure/blacklist_keywords", json={"command": "whoami; id"})
+    assert response.status_code == 400
+    assert "blacklisted keyword: ;" in response.get_json()["error"]
+
+def test_regex_filter_strips_command(client):
+    """Test that the regex filter endpoint runs the stripped command"""
+    response = client.post("/secure/regex_filter", json={"command": "whoami; id"})
+    assert response.status_code == 200
+    assert response.get_json()["sanitized_command"] == "whoami id"
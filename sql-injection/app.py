@@ -1,14 +1,66 @@
 import logging
 
+import click
 from flask import Flask
 
-from database.models import Base, engine, create_peewee_tables
+from config import Config
+from database.login_cache import login_cache
+from database.migrations import BACKFILL_BATCH_SIZE, backfill_password_hashes
+from database.models import (
+    create_orm_tables,
+    create_peewee_tables,
+    remove_request_session,
+)
 from middleware.waf import WebApplicationFirewall
+from routes.admin import bp as admin_bp
 from routes.insecure import bp as insecure_bp
 from routes.secure import bp as secure_bp
+from utils.instrumentation import init_instrumentation, timed
 from utils.logging import setup_logging
 
 
+def init_database():
+    """Create the schema, apply migrations, hash legacy passwords and create the ORM tables"""
+    from database.queries import RawQueryExecutor
+    RawQueryExecutor.setup_database()
+    if backfill_password_hashes():
+        login_cache.invalidate_all()
+    
+    # Create database tables for ORM
+    create_orm_tables()
+    create_peewee_tables()
+
+def api_index():
+    """Endpoint listing served at / by both the WSGI and ASGI apps"""
+    return {
+        "message": "SQL Injection Demo API",
+        "endpoints": {
+            "vulnerable": {
+                "/insecure/login_string_format": "String formatting SQL injection",
+                "/insecure/login_sqlite_concatenate": "String concatenation SQL injection"
+            },
+            "protected": {
+                "/secure/login_parameterized": "Parameterized queries protection",
+                "/secure/login_orm": "ORM protection",
+                "/secure/login_peewee": "Query builder protection",
+                "/secure/login_input_validation": "Input validation protection",
+                "/secure/login_stored_procedure": "Stored procedure protection",
+                "/secure/login_readonly_user": "Read-only DB user protection",
+                "/secure/login_combined": "Combined protections"
+            },
+            "admin": {
+                "/admin/waf_cache": "WAF verdict cache statistics",
+                "/admin/orm": "ORM session checkout timings and pool status",
+                "/admin/logging": "Logging queue depth and drop counters",
+                "/admin/replicas": "Read replica routing and lag",
+                "/admin/login_cache": "Login lookup cache statistics"
+            },
+            "metrics": {
+                "/metrics": "Per-request phase histograms (METRICS_ENABLED=1)"
+            }
+        }
+    }
+
 # Update the create_app function in app.py
 def create_app():
     """Create and configure the Flask application"""
@@ -18,24 +70,46 @@ def create_app():
     # Setup logging
     setup_logging()
     
-    # Initialize database
-    from database.queries import RawQueryExecutor
-    RawQueryExecutor.setup_database()
+    if Config.INIT_DB_ON_STARTUP:
+        init_database()
     
-    # Create database tables for ORM
-    Base.metadata.create_all(bind=engine)
-    create_peewee_tables()
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables, apply pending migrations and insert the sample users"""
+        init_database()
+        click.echo("Database initialized")
+    
+    @app.cli.command('backfill-passwords')
+    @click.option('--batch-size', default=BACKFILL_BATCH_SIZE, show_default=True, help='Rows hashed per transaction')
+    def backfill_passwords_command(batch_size):
+        """Hash the plaintext passwords of users that have no password_hash yet"""
+        hashed = backfill_password_hashes(
+            batch_size, progress=lambda count: click.echo(f"{count} passwords hashed")
+        )
+        if hashed:
+            login_cache.invalidate_all()
+        click.echo(f"Backfill complete: {hashed} passwords hashed")
     
     # Register blueprints
     app.register_blueprint(insecure_bp)
     app.register_blueprint(secure_bp)
+    app.register_blueprint(admin_bp)
+    
+    # Request timing hooks go first so the WAF is included in the total
+    if Config.METRICS_ENABLED:
+        init_instrumentation(app)
     
     # Add WAF middleware
     @app.before_request
     def before_request():
-        if result := WebApplicationFirewall.check_request():
+        with timed("waf"):
+            result = WebApplicationFirewall.check_request()
+        if result:
             return result, 403
     
+    # Close the request-scoped ORM session
+    app.teardown_appcontext(remove_request_session)
+    
     # Add error handler
     @app.errorhandler(500)
     def internal_error(error):
@@ -44,24 +118,7 @@ def create_app():
     
     @app.route('/')
     def index():
-        return {
-            "message": "SQL Injection Demo API",
-            "endpoints": {
-                "vulnerable": {
-                    "/insecure/login_string_format": "String formatting SQL injection",
-                    "/insecure/login_sqlite_concatenate": "String concatenation SQL injection"
-                },
-                "protected": {
-                    "/secure/login_parameterized": "Parameterized queries protection",
-                    "/secure/login_orm": "ORM protection",
-                    "/secure/login_peewee": "Query builder protection",
-                    "/secure/login_input_validation": "Input validation protection",
-                    "/secure/login_stored_procedure": "Stored procedure protection",
-                    "/secure/login_readonly_user": "Read-only DB user protection",
-                    "/secure/login_combined": "Combined protections"
-                }
-            }
-        }
+        return api_index()
     
     return app
 
@@ -0,0 +1,72 @@
+import logging
+
+from quart import Quart
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app import api_index, init_database
+from config import Config
+from database.aio import async_db, create_async_orm_engine
+from middleware.async_waf import check_request
+from routes.async_insecure import bp as insecure_bp
+from routes.async_secure import bp as secure_bp
+from utils.logging import setup_logging
+
+
+def create_asgi_app():
+    """
+    Create the ASGI (Quart) variant of the API.
+    Same endpoints and WAF as create_app, served on async database drivers.
+    Run with: hypercorn "asgi:create_asgi_app()"
+    """
+    app = Quart(__name__)
+    app.config['JSON_SORT_KEYS'] = False
+    
+    # Setup logging
+    setup_logging()
+    
+    # Schema and migrations run synchronously, before the event loop serves requests
+    if Config.INIT_DB_ON_STARTUP:
+        init_database()
+    
+    # Register blueprints
+    app.register_blueprint(insecure_bp)
+    app.register_blueprint(secure_bp)
+    
+    # Async pools are bound to the serving event loop
+    @app.before_serving
+    async def open_pools():
+        await async_db.connect()
+        engine = create_async_orm_engine()
+        app.config['ASYNC_ENGINE'] = engine
+        app.config['ASYNC_SESSION'] = async_sessionmaker(engine, expire_on_commit=False)
+    
+    @app.after_serving
+    async def close_pools():
+        await async_db.close()
+        await app.config['ASYNC_ENGINE'].dispose()
+    
+    # Add WAF middleware
+    @app.before_request
+    async def before_request():
+        if result := await check_request():
+            return result, 403
+    
+    # Add error handler
+    @app.errorhandler(500)
+    async def internal_error(error):
+        logging.error(f"Server error: {error}")
+        return {"status": "error", "message": "Internal server error"}, 500
+    
+    @app.route('/')
+    async def index():
+        endpoints = api_index()
+        # The admin and metrics endpoints are only served by the WSGI app
+        endpoints["endpoints"].pop("admin")
+        endpoints["endpoints"].pop("metrics")
+        return endpoints
+    
+    return app
+
+if __name__ == '__main__':
+    app = create_asgi_app()
+    app.run(debug=True)
@@ -0,0 +1,113 @@
+"""
+Benchmark: credential lookup latency on large user tables.
+
+Compares the legacy login query (SELECT * ... AND password = ?) with the
+hashed-credential lookup (SELECT id, password_hash ... WHERE username = ?)
+per backend. Tables are topped up with synthetic users first, so repeated
+runs reuse the seeded data. MySQL and Postgres use Config.MYSQL_CONFIG /
+Config.POSTGRES_CONFIG and are skipped when unreachable.
+
+Run from the sql-injection directory:
+    python -m benchmarks.credential_lookup --users 10000000 --backends sqlite postgres
+"""
+import argparse
+import random
+from time import perf_counter
+from typing import List
+
+from benchmarks.timing import latency_summary
+from config import Config, DatabaseType
+from database import db_manager
+from database.migrations import migrate
+from database.schema import PLACEHOLDERS, create_users_table
+from database.seeding import generate_users, seed_users
+from utils.passwords import verify_password
+
+
+def ensure_users(target: int, chunk_size: int) -> int:
+    """Seed synthetic users until the table holds ``target`` rows"""
+    conn = db_manager.connect()
+    try:
+        create_users_table(conn, Config.DATABASE_TYPE)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM users WHERE username LIKE 'user%'")
+        existing = cursor.fetchone()[0]
+    finally:
+        conn.close()
+    migrate()
+    if existing < target:
+        result = seed_users(generate_users(target - existing, start=existing), chunk_size=chunk_size)
+        print(f"  seeded {result['rows']:,} users at {result['rows_per_sec']:,.0f} rows/sec")
+    return target
+
+def time_queries(query: str, params: List[tuple]) -> List[float]:
+    """Run each lookup on one pooled connection; return latencies in microseconds"""
+    samples = []
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        for args in params:
+            started = perf_counter()
+            cursor.execute(query, args)
+            cursor.fetchall()
+            samples.append((perf_counter() - started) * 1e6)
+    return samples
+
+def run_backend(db_type: DatabaseType, users: int, lookups: int, chunk_size: int) -> None:
+    Config.DATABASE_TYPE = db_type
+    db_manager.dispose()
+    print(f"{db_type.value}:")
+    try:
+        ensure_users(users, chunk_size)
+    except Exception as e:
+        print(f"  skipped ({e.__class__.__name__}: {e})")
+        return
+
+    p = PLACEHOLDERS[db_type]
+    indices = [random.randrange(users) for _ in range(lookups)]
+    queries = {
+        "legacy SELECT * AND password": (
+            f"SELECT * FROM users WHERE username = {p} AND password = {p}",
+            [(f"user{i}", f"Pass@{i}") for i in indices],
+        ),
+        "id, password_hash by username": (
+            f"SELECT id, password_hash FROM users WHERE username = {p}",
+            [(f"user{i}",) for i in indices],
+        ),
+    }
+    for name, (query, params) in queries.items():
+        stats = latency_summary(time_queries(query, params))
+        print(
+            f"  {name:<32} p50 {stats['p50']:>8.1f}us  p95 {stats['p95']:>8.1f}us  "
+            f"p99 {stats['p99']:>8.1f}us"
+        )
+
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT password_hash FROM users WHERE username = {p}", ("user0",))
+        stored_hash = cursor.fetchone()[0]
+    started = perf_counter()
+    verify_password(stored_hash, "Pass@0")
+    print(f"  hash verification ({stored_hash.split('$')[0]}): {(perf_counter() - started) * 1e6:.1f}us")
+    db_manager.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Credential lookup latency benchmark")
+    parser.add_argument("--users", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=[db_type.value for db_type in DatabaseType],
+        default=[DatabaseType.SQLITE.value],
+    )
+    parser.add_argument("--sqlite-path", default="instance/benchmark_users.db")
+    args = parser.parse_args()
+
+    Config.SQLITE_DB_PATH = args.sqlite_path
+    for backend in args.backends:
+        run_backend(DatabaseType(backend), args.users, args.lookups, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Load test: latency and throughput of every login route, per protection strategy.
+
+Each route is driven twice per backend: in-process through the Flask test
+client (framework + defense cost, no network) and over HTTP against a
+threaded werkzeug WSGI server with concurrent keep-alive clients. Reports
+p50/p95/p99 latency in milliseconds, requests/sec and unexpected responses.
+MySQL and Postgres use Config.MYSQL_CONFIG / Config.POSTGRES_CONFIG and are
+skipped when unreachable.
+
+Run from the sql-injection directory:
+    python -m benchmarks.login_routes --requests 500 --concurrency 8 --backends sqlite postgres
+"""
+import argparse
+import http.client
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from benchmarks.timing import latency_summary
+from config import Config, DatabaseType
+from database import db_manager
+from database.models import configure_engine, configure_peewee
+
+# Sample users created by setup_database / create_peewee_tables
+CREDENTIALS = {"username": "testuser", "password": "testpass"}
+PEEWEE_CREDENTIALS = {"username": "bob", "password": "Bob@123"}
+
+# strategy -> (path, JSON body)
+ROUTES: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "insecure: string format": ("/insecure/login_string_format", CREDENTIALS),
+    "insecure: concatenation": ("/insecure/login_sqlite_concatenate", CREDENTIALS),
+    "parameterized": ("/secure/login_parameterized", CREDENTIALS),
+    "orm (sqlalchemy)": ("/secure/login_orm", CREDENTIALS),
+    "query builder (peewee)": ("/secure/login_peewee", PEEWEE_CREDENTIALS),
+    "input validation": ("/secure/login_input_validation", CREDENTIALS),
+    "stored procedure": ("/secure/login_stored_procedure", CREDENTIALS),
+    "read-only user": ("/secure/login_readonly_user", CREDENTIALS),
+    "combined": ("/secure/login_combined", CREDENTIALS),
+}
+
+# (latencies in ms, wall-clock seconds, unexpected responses)
+RunResult = Tuple[List[float], float, int]
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Keep-alive handler without per-request access logging"""
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def failed(status: int, body: Optional[bytes]) -> bool:
+    """Routes report rejected logins as HTTP 200 with "status": "error", so check the body too"""
+    if status != 200:
+        return True
+    try:
+        return json.loads(body).get("status") != "success"
+    except (TypeError, ValueError, AttributeError):
+        return True
+
+def run_test_client(app: Any, path: str, body: Dict[str, str], requests: int) -> RunResult:
+    """Sequential in-process requests through the Flask test client"""
+    samples, errors = [], 0
+    client = app.test_client()
+    started = perf_counter()
+    for _ in range(requests):
+        request_started = perf_counter()
+        response = client.post(path, json=body)
+        samples.append((perf_counter() - request_started) * 1e3)
+        errors += failed(response.status_code, response.get_data())
+    return samples, perf_counter() - started, errors
+
+def run_wsgi_server(port: int, path: str, body: Dict[str, str], requests: int, concurrency: int) -> RunResult:
+    """``concurrency`` keep-alive clients sharing ``requests`` POSTs against a live server"""
+    payload = json.dumps(body)
+    headers = {"Content-Type": "application/json"}
+    per_worker = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+
+    def worker(count: int) -> Tuple[List[float], int]:
+        samples, errors = [], 0
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        try:
+            for _ in range(count):
+                request_started = perf_counter()
+                conn.request("POST", path, payload, headers)
+                response = conn.getresponse()
+                data = response.read()
+                samples.append((perf_counter() - request_started) * 1e3)
+                errors += failed(response.status, data)
+        finally:
+            conn.close()
+        return samples, errors
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, per_worker))
+    elapsed = perf_counter() - started
+    return [s for samples, _ in results for s in samples], elapsed, sum(e for _, e in results)
+
+def report(mode: str, strategy: str, result: RunResult) -> None:
+    samples, elapsed, errors = result
+    stats = latency_summary(samples)
+    print(
+        f"  {mode:<7} {strategy:<25} p50 {stats['p50']:>7.2f}ms  p95 {stats['p95']:>7.2f}ms  "
+        f"p99 {stats['p99']:>7.2f}ms  {len(samples) / elapsed:>8.0f} req/s  errors {errors}"
+        + ("  (every login failed: latency is not a valid result)" if samples and errors == len(samples) else "")
+    )
+
+def run_backend(db_type: DatabaseType, requests: int, concurrency: int) -> None:
+    Config.DATABASE_TYPE = db_type
+    db_manager.dispose()
+    print(f"{db_type.value}:")
+    try:
+        configure_engine()
+        configure_peewee()
+        app = create_app()
+    except Exception as e:
+        print(f"  skipped ({e.__class__.__name__}: {e})")
+        return
+
+    # Access logs would otherwise dominate the server-side numbers
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for strategy, (path, body) in ROUTES.items():
+            # Warm pools, caches and compiled statements before measuring
+            run_test_client(app, path, body, min(requests, 10))
+            report("client", strategy, run_test_client(app, path, body, requests))
+            report("server", strategy, run_wsgi_server(server.server_port, path, body, requests, concurrency))
+    finally:
+        server.shutdown()
+        thread.join()
+        db_manager.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Login route load test")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and mode")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent clients against the WSGI server")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=[db_type.value for db_type in DatabaseType],
+        default=[DatabaseType.SQLITE.value],
+    )
+    parser.add_argument("--hash-method", help="Config.PASSWORD_HASH_METHOD used when the sample users are created")
+    parser.add_argument("--sqlite-path", default="instance/benchmark_routes.db")
+    parser.add_argument("--log-file", default="logs/benchmark_routes.log")
+    args = parser.parse_args()
+
+    Config.SQLITE_DB_PATH = args.sqlite_path
+    Config.LOG_FILE = args.log_file
+    if args.hash_method:
+        Config.PASSWORD_HASH_METHOD = args.hash_method
+
+    for backend in args.backends:
+        run_backend(DatabaseType(backend), args.requests, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Startup report: import time per top-level package and create_app() boot time
+with and without the database initialization step.
+
+Every sample runs in a fresh interpreter so module caches do not carry over.
+The app is pointed at its own SQLite file and log so the tracked database
+and log stay untouched.
+
+Run from the sql-injection directory:
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from statistics import median
+from typing import Dict, List
+
+CONFIGURE = (
+    "from config import Config; "
+    "Config.SQLITE_DB_PATH = {sqlite_path!r}; Config.LOG_FILE = {log_file!r}; "
+)
+
+BOOT = (
+    "from time import perf_counter; started = perf_counter(); "
+    "from app import create_app; imported = perf_counter(); "
+    "create_app(); "
+    "print(imported - started, perf_counter() - imported)"
+)
+
+
+def run_python(code: str, env: Dict[str, str], importtime: bool = False) -> subprocess.CompletedProcess:
+    args = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", code]
+    return subprocess.run(args, env={**os.environ, **env}, capture_output=True, text=True, check=True)
+
+def import_times(stderr: str) -> Dict[str, int]:
+    """Self time in microseconds per top-level package from -X importtime output"""
+    totals: Dict[str, int] = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        totals[module.strip().split(".")[0]] += int(self_us)
+    return totals
+
+def import_report(configure: str, runs: int, top: int) -> None:
+    samples: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(runs):
+        result = run_python(configure + "import app", {}, importtime=True)
+        for package, self_us in import_times(result.stderr).items():
+            samples[package].append(self_us)
+
+    medians = {package: median(values) for package, values in samples.items()}
+    print(f"import time by package (median of {runs}, ms):")
+    for package, self_us in sorted(medians.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<24} {self_us / 1000:>8.1f}")
+    print(f"  {'total':<24} {sum(medians.values()) / 1000:>8.1f}")
+    for driver in ("mysql", "psycopg2", "pymysql"):
+        print(f"  {driver} imported: {'yes' if driver in medians else 'no'}")
+
+def boot_report(configure: str, runs: int) -> None:
+    print(f"create_app() boot (median of {runs}, ms):")
+    for label, init in (("with init_database", "1"), ("INIT_DB_ON_STARTUP=0", "0")):
+        imports, boots = [], []
+        for _ in range(runs):
+            result = run_python(configure + BOOT, {"INIT_DB_ON_STARTUP": init})
+            imported, booted = map(float, result.stdout.split()[-2:])
+            imports.append(imported * 1000)
+            boots.append(booted * 1000)
+        print(f"  {label:<24} import {median(imports):>7.1f}  create_app {median(boots):>7.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time and boot-time report")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--sqlite-path", default="instance/benchmark_startup.db")
+    parser.add_argument("--log-file", default="logs/benchmark_startup.log")
+    args = parser.parse_args()
+
+    configure = CONFIGURE.format(sqlite_path=args.sqlite_path, log_file=args.log_file)
+    # Create and migrate the database once so both boot modes start from the same schema
+    run_python(configure + "from app import init_database; init_database()", {})
+    import_report(configure, args.runs, args.top)
+    boot_report(configure, args.runs)
+
+
+if __name__ == '__main__':
+    main()
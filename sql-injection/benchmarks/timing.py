@@ -0,0 +1,16 @@
+from statistics import quantiles
+from typing import Dict, Sequence
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99 and mean of latency samples, in the samples' unit"""
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "mean": value}
+    cuts = quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "mean": sum(samples) / len(samples),
+    }
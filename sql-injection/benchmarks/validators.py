@@ -0,0 +1,89 @@
+"""
+Microbenchmark: per-request validation cost of the login routes, before and
+after compiling the whitelist once and upper-casing the username once for
+the keyword check (WebApplicationFirewall.contains_keyword).
+
+Run from the sql-injection directory:
+    python -m benchmarks.validators
+"""
+import re
+import timeit
+from typing import Callable, Dict, Tuple
+
+from pydantic import BaseModel, constr, field_validator
+
+from config import Config
+from middleware.waf import WebApplicationFirewall
+from schemas.models import UserLogin
+from utils.validators import validate_input
+
+
+class LegacyUserLogin(BaseModel):
+    """Original UserLogin: re.match with the pattern string per field"""
+    username: constr(max_length=Config.MAX_INPUT_LENGTH)
+    password: constr(max_length=Config.MAX_INPUT_LENGTH)
+
+    @field_validator('username')
+    def validate_username_chars(cls, v):
+        if not re.match(Config.ALLOWED_CHARS, v):
+            raise ValueError("Username contains invalid characters")
+        return v
+
+    @field_validator('password')
+    def validate_password_chars(cls, v):
+        if not re.match(Config.ALLOWED_CHARS, v):
+            raise ValueError("Password contains invalid characters")
+        return v
+
+
+def legacy_validate_input(input_str) -> bool:
+    if not isinstance(input_str, str):
+        return True
+    if len(input_str) > Config.MAX_INPUT_LENGTH:
+        return False
+    if not re.match(Config.ALLOWED_CHARS, input_str):
+        return False
+    return True
+
+def legacy_contains_keyword(username: str) -> bool:
+    return any(keyword.lower() in username.lower() for keyword in WebApplicationFirewall.SQL_KEYWORDS)
+
+
+CREDENTIALS = {
+    "alphanumeric": {"username": "testuser", "password": "testpass123"},
+    "punctuated": {"username": "john.doe@example.com", "password": "Pass_word-1.x"},
+}
+
+def request_paths(username: str, password: str) -> Dict[str, Tuple[Callable[[], object], Callable[[], object]]]:
+    """(legacy, current) work done by each route for one request"""
+    body = {"username": username, "password": password}
+    return {
+        "login_input_validation": (
+            lambda: legacy_validate_input(username) and legacy_validate_input(password),
+            lambda: validate_input(username) and validate_input(password),
+        ),
+        "login_readonly_user": (
+            lambda: LegacyUserLogin(**body),
+            lambda: UserLogin(**body),
+        ),
+        "login_combined": (
+            lambda: legacy_contains_keyword(LegacyUserLogin(**body).username),
+            lambda: WebApplicationFirewall.contains_keyword(UserLogin(**body).username),
+        ),
+    }
+
+def per_call_us(fn: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+def main():
+    number = 20000
+    print(f"{'route':<24} {'credentials':<14} {'legacy us':>10} {'current us':>12} {'saved us':>9}")
+    for label, creds in CREDENTIALS.items():
+        for route, (legacy, current) in request_paths(**creds).items():
+            before = per_call_us(legacy, number)
+            after = per_call_us(current, number)
+            print(f"{route:<24} {label:<14} {before:>10.2f} {after:>12.2f} {before - after:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
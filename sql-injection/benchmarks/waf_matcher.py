@@ -0,0 +1,96 @@
+"""
+Microbenchmark: the WAF keyword scan vs. the original keyword scan plus
+legacy regexes, with and without the verdict cache.
+
+Run from the sql-injection directory:
+    python -m benchmarks.waf_matcher
+"""
+import re
+import timeit
+from typing import Callable, Dict
+
+from config import Config
+from middleware.waf import WebApplicationFirewall
+
+
+def legacy_detect_sql_injection(input_str: str) -> bool:
+    """Original implementation: one substring scan per keyword plus three re.match calls"""
+    if not isinstance(input_str, str):
+        return False
+
+    input_upper = input_str.upper()
+    for keyword in WebApplicationFirewall.SQL_KEYWORDS:
+        if keyword in input_upper:
+            return True
+
+    patterns = [
+        r".*'.*--.*",
+        r".*;.*",
+        r".*/\*.*\*/.*"
+    ]
+
+    for pattern in patterns:
+        if re.match(pattern, input_upper):
+            return True
+
+    return False
+
+
+def build_payloads(size: int) -> Dict[str, str]:
+    """Benign and malicious payloads of roughly ``size`` characters"""
+    benign = ("user_1234 x@example.com " * (size // 25 + 1))[:size]
+    return {
+        "benign": benign,
+        "attack_at_start": "' OR 1=1 -- " + benign,
+        "attack_at_end": benign + " UNION SELECT password FROM users",
+    }
+
+
+def build_quote_payload(size: int) -> str:
+    """Many quotes and no comment: the legacy '.*'.*--.*' pattern backtracks per quote"""
+    return ("x'" * (size // 2 + 1))[:size]
+
+
+def bench(func: Callable[[str], bool], payload: str, number: int) -> float:
+    """Return microseconds per call"""
+    return timeit.timeit(lambda: func(payload), number=number) / number * 1e6
+
+
+def report(name: str, size: int, payload: str, number: int) -> None:
+    detect = WebApplicationFirewall.detect_sql_injection
+    legacy_us = bench(legacy_detect_sql_injection, payload, number)
+
+    Config.WAF_CACHE_ENABLED = False
+    assert detect(payload) == legacy_detect_sql_injection(payload), name
+    scan_us = bench(detect, payload, number)
+
+    # Every call after the first is a verdict cache hit
+    Config.WAF_CACHE_ENABLED = True
+    cached_us = bench(detect, payload, number)
+
+    print(
+        f"{name:<22}{size:>10}{legacy_us:>14.1f}{scan_us:>14.1f}{cached_us:>12.1f}"
+        f"{legacy_us / scan_us:>9.1f}x"
+    )
+
+
+def main():
+    print(
+        f"{'payload':<22}{'size':>10}{'legacy us':>14}{'scan us':>14}"
+        f"{'cached us':>12}{'speedup':>10}"
+    )
+    # Typical form fields
+    for value in ("alice", "admin@example.com"):
+        report(value, len(value), value, 200_000)
+    for size in (100, 10_000, 1_000_000):
+        number = max(5, 200_000 // size)
+        for name, payload in build_payloads(size).items():
+            report(name, size, payload, number)
+
+    # Legacy cost grows quadratically here, so keep the sizes small
+    for size in (100, 1_000, 10_000):
+        report("quotes_no_comment", size, build_quote_payload(size), max(5, 20_000 // size))
+
+
+if __name__ == '__main__':
+    main()
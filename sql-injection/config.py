@@ -1,3 +1,4 @@
+import os
 from enum import Enum
 
 
@@ -21,5 +22,62 @@ class Config:
         "password": "",
         "database": "vulnerable_app"
     }
+    # Connection pool (see database/pool.py)
+    POOL_SIZE = 5
+    POOL_TIMEOUT = 5.0
+    POOL_IDLE_TIMEOUT = 300.0
+    POOL_PRE_PING = True
+    STATEMENT_CACHE_SIZE = 128
+    # Read replicas for execute_select and login lookups (see database/replicas.py):
+    # SQLite file paths, or MySQL/Postgres settings merged over the primary's,
+    # e.g. [{"host": "replica-1"}]. Replicas lagging more than REPLICA_MAX_LAG
+    # seconds, or failing to connect, are skipped in favour of the primary.
+    SQLITE_REPLICAS = []
+    MYSQL_REPLICAS = []
+    POSTGRES_REPLICAS = []
+    REPLICA_MAX_LAG = 5.0
+    REPLICA_LAG_CHECK_INTERVAL = 1.0
+    REPLICA_RETRY_AFTER = 30.0
+    # SQLAlchemy engine (shares POOL_SIZE / POOL_TIMEOUT)
+    ORM_MAX_OVERFLOW = 5
+    ORM_POOL_RECYCLE = 1800
+    ORM_QUERY_CACHE_SIZE = 500
+    # WAF inspection budget for JSON bodies
+    WAF_MAX_JSON_DEPTH = 32
+    WAF_MAX_JSON_NODES = 10000
+    # WAF verdict cache. Off by default: hashing a value costs more than
+    # scanning it for the keywords (see benchmarks/waf_matcher.py), so it
+    # only helps rule sets much heavier than SQL_KEYWORDS.
+    WAF_CACHE_ENABLED = False
+    WAF_CACHE_SIZE = 4096
+    WAF_CACHE_TTL = 300.0
+    # Login lookup cache (see database/login_cache.py): user rows and hashes
+    # by username, never plaintext. Any write to users clears it; in
+    # multi-process deployments other workers see changes after the TTL.
+    LOGIN_CACHE_ENABLED = False
+    LOGIN_CACHE_SIZE = 10000
+    LOGIN_CACHE_TTL = 30.0
+    LOGIN_CACHE_NEGATIVE_TTL = 5.0
+    # Password hashing (werkzeug.security method strings). Seeded load-test
+    # users use a cheap method so millions of rows can be generated quickly.
+    PASSWORD_HASH_METHOD = "scrypt"
+    SEED_PASSWORD_HASH_METHOD = "pbkdf2:sha256:1"
+    # Logging pipeline (see utils/logging.py). Records at LOG_BLOCK_LEVEL and
+    # above wait up to LOG_BLOCK_TIMEOUT for queue space; lower ones are
+    # dropped immediately when the queue is full.
+    LOG_FILE = "logs/sql_injection_demo.log"
+    LOG_MAX_BYTES = 50 * 1024 * 1024
+    LOG_BACKUP_COUNT = 5
+    LOG_QUEUE_SIZE = 10000
+    LOG_BATCH_SIZE = 256
+    LOG_BLOCK_LEVEL = 30  # logging.WARNING
+    LOG_BLOCK_TIMEOUT = 0.05
+    # Run table creation, migrations and sample data on every create_app().
+    # Multi-worker deployments set INIT_DB_ON_STARTUP=0 and run
+    # `flask --app app init-db` once per deploy instead.
+    INIT_DB_ON_STARTUP = os.environ.get("INIT_DB_ON_STARTUP", "1").lower() not in ("0", "false", "no")
+    # Per-request phase histograms served at /metrics (utils/instrumentation.py);
+    # enable with METRICS_ENABLED=1
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
     MAX_INPUT_LENGTH = 100
     ALLOWED_CHARS = r'^[a-zA-Z0-9_\-\.@ ]+$'
\ No newline at end of file
@@ -1,32 +1,182 @@
+import importlib
+import threading
 from contextlib import contextmanager
-from sqlite3 import connect as sqlite_connect
-from typing import Any, Union
-
-from mysql.connector import connect as mysql_connect
-from psycopg2 import connect as postgres_connect
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from config import Config, DatabaseType
+from database.pool import ConnectionPool, MySQLPool, PostgresPool, SQLitePool
+from database.replicas import Replica, ReplicaSet
+from utils.instrumentation import timed
+
+
+# DB-API driver module per backend, imported on first use so a SQLite-only
+# deployment never loads mysql.connector or psycopg2
+DRIVERS = {
+    DatabaseType.SQLITE: "sqlite3",
+    DatabaseType.MYSQL: "mysql.connector",
+    DatabaseType.POSTGRES: "psycopg2",
+}
+
+@lru_cache(maxsize=None)
+def load_driver(db_type: DatabaseType) -> Any:
+    """Import and return the DB-API module for ``db_type``"""
+    if db_type not in DRIVERS:
+        raise ValueError("Unsupported database type")
+    return importlib.import_module(DRIVERS[db_type])
 
 
 class DatabaseManager:
     def __init__(self):
         self.config = Config()
+        self._pool: Optional[ConnectionPool] = None
+        self._replicas: Optional[ReplicaSet] = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        # Pool that handed out each checked-out connection, keyed by id(conn)
+        self._owners: Dict[int, ConnectionPool] = {}
 
-    @contextmanager
-    def get_connection(self) -> Any:
-        """Yield a database connection based on configuration"""
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool for the configured backend, created on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+
+    @property
+    def replicas(self) -> Optional[ReplicaSet]:
+        """Read replicas for the configured backend, or None if none are configured"""
+        if self._replicas is None and self._replica_targets():
+            with self._pool_lock:
+                if self._replicas is None:
+                    self._replicas = self._create_replicas()
+        return self._replicas
+
+    def _replica_targets(self) -> List[Any]:
+        """SQLite file paths or connection settings of the configured replicas"""
+        return {
+            DatabaseType.SQLITE: self.config.SQLITE_REPLICAS,
+            DatabaseType.MYSQL: self.config.MYSQL_REPLICAS,
+            DatabaseType.POSTGRES: self.config.POSTGRES_REPLICAS,
+        }.get(self.config.DATABASE_TYPE, [])
+
+    def _connect_factory(self, replica: Any = None) -> Callable[[], Any]:
+        """
+        Return a zero-argument callable opening a connection to the configured
+        backend, or to ``replica`` (a SQLite path or settings overriding the
+        primary's, e.g. {"host": "replica-1"}) when given.
+        """
         if self.config.DATABASE_TYPE == DatabaseType.SQLITE:
-            conn = sqlite_connect(self.config.SQLITE_DB_PATH)
+            # Pooled connections move between request threads; replica
+            # files are opened read-only
+            target = f"{Path(replica).resolve().as_uri()}?mode=ro" if replica else self.config.SQLITE_DB_PATH
+            return partial(
+                load_driver(DatabaseType.SQLITE).connect,
+                target,
+                uri=bool(replica),
+                check_same_thread=False,
+                cached_statements=self.config.STATEMENT_CACHE_SIZE,
+            )
         elif self.config.DATABASE_TYPE == DatabaseType.MYSQL:
-            conn = mysql_connect(**self.config.MYSQL_CONFIG)
+            return partial(load_driver(DatabaseType.MYSQL).connect, **{**self.config.MYSQL_CONFIG, **(replica or {})})
         elif self.config.DATABASE_TYPE == DatabaseType.POSTGRES:
-            conn = postgres_connect(**self.config.POSTGRES_CONFIG)
+            return partial(load_driver(DatabaseType.POSTGRES).connect, **{**self.config.POSTGRES_CONFIG, **(replica or {})})
         else:
             raise ValueError("Unsupported database type")
-        
+
+    def _create_pool(self, replica: Any = None) -> ConnectionPool:
+        pool_classes = {
+            DatabaseType.SQLITE: SQLitePool,
+            DatabaseType.MYSQL: MySQLPool,
+            DatabaseType.POSTGRES: PostgresPool,
+        }
+        return pool_classes[self.config.DATABASE_TYPE](
+            self._connect_factory(replica),
+            max_size=self.config.POOL_SIZE,
+            timeout=self.config.POOL_TIMEOUT,
+            idle_timeout=self.config.POOL_IDLE_TIMEOUT,
+            pre_ping=self.config.POOL_PRE_PING,
+            statement_cache_size=self.config.STATEMENT_CACHE_SIZE,
+        )
+
+    def _create_replicas(self) -> ReplicaSet:
+        replicas = [
+            Replica(target if isinstance(target, str) else target.get("host", str(i)), self._create_pool(target))
+            for i, target in enumerate(self._replica_targets())
+        ]
+        return ReplicaSet(
+            replicas,
+            max_lag=self.config.REPLICA_MAX_LAG,
+            check_interval=self.config.REPLICA_LAG_CHECK_INTERVAL,
+            retry_after=self.config.REPLICA_RETRY_AFTER,
+        )
+
+    def connect(self) -> Any:
+        """Open a dedicated connection outside the pool, e.g. for bulk loads"""
+        return self._connect_factory()()
+
+    @contextmanager
+    def get_connection(self, readonly: bool = False) -> Any:
+        """
+        Yield a pooled database connection based on configuration.
+        ``readonly`` connections come from the next in-sync read replica,
+        falling back to the primary when none is configured or eligible.
+        Nested calls on the same thread share the connection already checked
+        out; reads nested in a primary checkout stay on the primary so they
+        see its uncommitted writes.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None and readonly:
+            conn = getattr(self._local, "replica_conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        checkout = None
+        with timed("db_checkout"):
+            if readonly and self.replicas is not None:
+                checkout = self.replicas.acquire()
+            if checkout is not None:
+                pool, conn, slot = checkout[0].pool, checkout[1], "replica_conn"
+            else:
+                pool, slot = self.pool, "conn"
+                conn = pool.acquire()
+        self._owners[id(conn)] = pool
+        setattr(self._local, slot, conn)
         try:
             yield conn
         finally:
-            conn.close()
+            setattr(self._local, slot, None)
+            self._owners.pop(id(conn), None)
+            pool.release(conn)
+
+    def cursor(self, conn: Any, query: str) -> Any:
+        """Return a cursor for ``query`` from the connection's statement cache"""
+        return self._owners.get(id(conn), self.pool).cursor_for(conn, query)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return occupancy and counters of the active pool"""
+        if self._pool is None:
+            return {}
+        return self._pool.stats()
+
+    def replica_stats(self) -> Dict[str, Any]:
+        """Return routing counters and per-replica state, if replicas are in use"""
+        if self._replicas is None:
+            return {}
+        return self._replicas.stats()
+
+    def dispose(self) -> None:
+        """Close pooled connections and rebuild the pools from config on next use"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            replicas, self._replicas = self._replicas, None
+        if pool is not None:
+            pool.dispose()
+        if replicas is not None:
+            replicas.dispose()
 
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
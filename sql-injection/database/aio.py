@@ -0,0 +1,170 @@
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from config import Config, DatabaseType
+from database.models import database_url
+from utils.passwords import verify_password
+
+_PLACEHOLDER = re.compile(r"\?")
+
+
+class _SQLiteBackend:
+    """Bounded pool of aiosqlite connections"""
+
+    def __init__(self):
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(Config.POOL_SIZE)
+        self._connections: List[Any] = []
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        for conn in self._connections:
+            await conn.close()
+        self._connections.clear()
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[Any]:
+        import aiosqlite
+
+        async with self._slots:
+            if self._idle.empty():
+                conn = await aiosqlite.connect(Config.SQLITE_DB_PATH)
+                self._connections.append(conn)
+            else:
+                conn = self._idle.get_nowait()
+            try:
+                yield conn
+            finally:
+                await conn.rollback()
+                self._idle.put_nowait(conn)
+
+    async def fetch(self, query: str, params: tuple, one: bool) -> Any:
+        async with self._connection() as conn:
+            async with conn.execute(query, params) as cursor:
+                return await (cursor.fetchone() if one else cursor.fetchall())
+
+
+class _PostgresBackend:
+    """asyncpg pool; ? placeholders are rewritten to $1, $2, ..."""
+
+    def __init__(self):
+        self._pool = None
+
+    async def open(self) -> None:
+        import asyncpg
+
+        self._pool = await asyncpg.create_pool(
+            min_size=1, max_size=Config.POOL_SIZE, **Config.POSTGRES_CONFIG
+        )
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    async def fetch(self, query: str, params: tuple, one: bool) -> Any:
+        if params:
+            counter = iter(range(1, len(params) + 1))
+            query = _PLACEHOLDER.sub(lambda _: f"${next(counter)}", query)
+        async with self._pool.acquire() as conn:
+            if one:
+                row = await conn.fetchrow(query, *params)
+                return tuple(row) if row is not None else None
+            return [tuple(row) for row in await conn.fetch(query, *params)]
+
+
+class _MySQLBackend:
+    """aiomysql pool; ? placeholders are rewritten to %s"""
+
+    def __init__(self):
+        self._pool = None
+
+    async def open(self) -> None:
+        import aiomysql
+
+        settings = dict(Config.MYSQL_CONFIG)
+        self._pool = await aiomysql.create_pool(
+            db=settings.pop("database"), maxsize=Config.POOL_SIZE, autocommit=True, **settings
+        )
+
+    async def close(self) -> None:
+        self._pool.close()
+        await self._pool.wait_closed()
+
+    async def fetch(self, query: str, params: tuple, one: bool) -> Any:
+        if params:
+            query = _PLACEHOLDER.sub("%s", query)
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params or None)
+                return await (cursor.fetchone() if one else cursor.fetchall())
+
+
+class AsyncDatabaseManager:
+    """Async counterpart of DatabaseManager for the ASGI app"""
+
+    def __init__(self):
+        self._backend = None
+
+    async def connect(self) -> None:
+        """Open the pool for the configured backend; call once the event loop is running"""
+        backends = {
+            DatabaseType.SQLITE: _SQLiteBackend,
+            DatabaseType.MYSQL: _MySQLBackend,
+            DatabaseType.POSTGRES: _PostgresBackend,
+        }
+        if Config.DATABASE_TYPE not in backends:
+            raise ValueError("Unsupported database type")
+        backend = backends[Config.DATABASE_TYPE]()
+        await backend.open()
+        self._backend = backend
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+
+    async def fetchone(self, query: str, params: tuple = ()) -> Optional[tuple]:
+        """Run a query and return its first row; parameters use ? placeholders"""
+        return await self._backend.fetch(query, params, one=True)
+
+    async def fetchall(self, query: str, params: tuple = ()) -> List[tuple]:
+        """Run a query and return every row; parameters use ? placeholders"""
+        return await self._backend.fetch(query, params, one=False)
+
+    async def authenticate(self, username: str, password: str) -> Optional[int]:
+        """
+        Async counterpart of RawQueryExecutor.authenticate.
+        Hash verification is CPU-bound, so it runs in a worker thread
+        instead of stalling the event loop.
+        """
+        row = await self.fetchone("SELECT id, password_hash FROM users WHERE username = ?", (username,))
+        user_id, stored_hash = row if row else (None, None)
+        if await asyncio.to_thread(verify_password, stored_hash, password):
+            return user_id
+        return None
+
+
+ASYNC_DRIVERS = {
+    DatabaseType.SQLITE: "sqlite+aiosqlite",
+    DatabaseType.MYSQL: "mysql+aiomysql",
+    DatabaseType.POSTGRES: "postgresql+asyncpg",
+}
+
+def create_async_orm_engine() -> AsyncEngine:
+    """SQLAlchemy engine on the async driver for the configured backend"""
+    return create_async_engine(
+        database_url().set(drivername=ASYNC_DRIVERS[Config.DATABASE_TYPE]),
+        pool_size=Config.POOL_SIZE,
+        max_overflow=Config.ORM_MAX_OVERFLOW,
+        pool_timeout=Config.POOL_TIMEOUT,
+        pool_recycle=Config.ORM_POOL_RECYCLE,
+        pool_pre_ping=True,
+        query_cache_size=Config.ORM_QUERY_CACHE_SIZE,
+    )
+
+async_db = AsyncDatabaseManager()
@@ -0,0 +1,72 @@
+import re
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from config import Config
+from utils.cache import TTLCache
+
+# Writes whose SQL mentions the users table may change credentials
+_USERS_TABLE = re.compile(r"\busers\b", re.IGNORECASE)
+_MISS = object()
+
+
+class CredentialRow(NamedTuple):
+    """Columns a login needs; the plaintext password is never cached"""
+    id: int
+    password_hash: Optional[str]
+    username: Optional[str] = None
+    email: Optional[str] = None
+
+
+class LoginCache:
+    """
+    Positive and negative credential lookups keyed by username.
+    Unknown usernames are cached for LOGIN_CACHE_NEGATIVE_TTL so bursts of
+    guesses for the same name skip the database too. A generation counter
+    keeps a lookup that raced with a write from caching the old row.
+    """
+
+    def __init__(self):
+        self._entries = TTLCache(Config.LOGIN_CACHE_SIZE, Config.LOGIN_CACHE_TTL)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def lookup(
+        self, source: str, username: str, load: Callable[[str], Optional[CredentialRow]]
+    ) -> Optional[CredentialRow]:
+        """
+        Return the cached row for (source, username), calling ``load`` on a miss.
+        ``source`` separates loaders that fill different columns.
+        """
+        if not Config.LOGIN_CACHE_ENABLED:
+            return load(username)
+
+        key = (source, username)
+        row = self._entries.get(key, _MISS)
+        if row is not _MISS:
+            return row
+
+        generation = self._generation
+        row = load(username)
+        ttl = Config.LOGIN_CACHE_TTL if row is not None else Config.LOGIN_CACHE_NEGATIVE_TTL
+        with self._lock:
+            if generation == self._generation:
+                self._entries.set(key, row, ttl)
+        return row
+
+    def invalidate_all(self) -> None:
+        """Drop every entry, including lookups still in flight"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def invalidate_for(self, query: str) -> None:
+        """Clear the cache if a write statement touches the users table"""
+        if _USERS_TABLE.search(query):
+            self.invalidate_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": Config.LOGIN_CACHE_ENABLED, **self._entries.stats()}
+
+
+login_cache = LoginCache()
@@ -0,0 +1,119 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+from config import Config, DatabaseType
+from database import db_manager
+from database.schema import CREDENTIALS_INDEX_DDL, PLACEHOLDERS, column_exists
+from utils.passwords import hash_password
+
+SCHEMA_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(100) NOT NULL
+    )
+"""
+
+# Rows hashed and committed per backfill transaction
+BACKFILL_BATCH_SIZE = 1000
+
+def _add_password_hash(conn: Any, db_type: DatabaseType) -> None:
+    """
+    Add users.password_hash. Existing rows are hashed afterwards by
+    backfill_password_hashes(), outside the migration transaction.
+    """
+    if not column_exists(conn, "users", "password_hash"):
+        column_type = "TEXT" if db_type == DatabaseType.SQLITE else "VARCHAR(255)"
+        conn.cursor().execute(f"ALTER TABLE users ADD COLUMN password_hash {column_type}")
+
+def _add_credentials_index(conn: Any, db_type: DatabaseType) -> None:
+    """Cover the username -> (id, password_hash) lookup used by the secure login path"""
+    if db_type in CREDENTIALS_INDEX_DDL:
+        conn.cursor().execute(CREDENTIALS_INDEX_DDL[db_type])
+
+# Ordered list of (version, name, apply); append new migrations, never reorder
+MIGRATIONS: List[Tuple[int, str, Callable[[Any, DatabaseType], None]]] = [
+    (1, "add_users_password_hash", _add_password_hash),
+    (2, "add_users_credentials_index", _add_credentials_index),
+]
+
+def applied_versions(conn: Any) -> List[int]:
+    """Return the migration versions already recorded in schema_migrations"""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_MIGRATIONS_DDL)
+    conn.commit()
+    cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
+    return [row[0] for row in cursor.fetchall()]
+
+def migrate(db_type: Optional[DatabaseType] = None) -> List[str]:
+    """
+    Apply pending migrations in order, each in its own transaction.
+    Returns the names of the migrations that were applied.
+    """
+    db_type = db_type or Config.DATABASE_TYPE
+    placeholder = PLACEHOLDERS[db_type]
+    applied = []
+
+    conn = db_manager.connect()
+    try:
+        done = set(applied_versions(conn))
+        for version, name, apply in MIGRATIONS:
+            if version in done:
+                continue
+            try:
+                apply(conn, db_type)
+                conn.cursor().execute(
+                    f"INSERT INTO schema_migrations (version, name) VALUES ({placeholder}, {placeholder})",
+                    (version, name),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(name)
+    finally:
+        conn.close()
+    return applied
+
+def backfill_password_hashes(
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    db_type: Optional[DatabaseType] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Hash the plaintext password of every user without a password_hash.
+    Rows are read in id order, ``batch_size`` at a time from the last id
+    seen, and each batch is committed on its own, so the work holds no long
+    transaction or full result set and resumes where it stopped.
+    Returns the number of rows hashed.
+    """
+    db_type = db_type or Config.DATABASE_TYPE
+    placeholder = PLACEHOLDERS[db_type]
+    # The plaintext column stays: the insecure demo endpoints compare it in SQL
+    select_sql = (
+        "SELECT id, password FROM users "
+        f"WHERE password_hash IS NULL AND id > {placeholder} ORDER BY id LIMIT {placeholder}"
+    )
+    update_sql = f"UPDATE users SET password_hash = {placeholder} WHERE id = {placeholder}"
+    hashed = 0
+    last_id = 0
+
+    conn = db_manager.connect()
+    try:
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(select_sql, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            try:
+                cursor.executemany(update_sql, [(hash_password(password or ""), user_id) for user_id, password in rows])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            last_id = rows[-1][0]
+            hashed += len(rows)
+            if progress:
+                progress(hashed)
+    finally:
+        conn.close()
+    return hashed
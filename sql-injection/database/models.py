@@ -1,13 +1,25 @@
-from sqlalchemy import Column, Integer, String, create_engine
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, Optional
+
+from flask.globals import app_ctx
+from sqlalchemy import Column, Integer, String, bindparam, create_engine, select
+from sqlalchemy.engine import URL, Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from peewee import SqliteDatabase, Model, CharField, TextField
+from sqlalchemy.orm import Session, load_only, scoped_session, sessionmaker
+from peewee import DatabaseProxy, Model, CharField, TextField
+from playhouse.pool import PooledMySQLDatabase, PooledPostgresqlDatabase, PooledSqliteDatabase
 
-from config import Config
+from config import Config, DatabaseType
+from database.login_cache import CredentialRow
+from utils.instrumentation import timed
+from utils.metrics import TimingStats
 
 Base = declarative_base()
 
-peewee_db = SqliteDatabase(Config.SQLITE_DB_PATH)
+# Single Peewee database shared by every model and route; initialized from
+# Config by configure_peewee()
+peewee_db = DatabaseProxy()
 
 class User(Base):
     __tablename__ = "users"
@@ -16,10 +28,105 @@ class User(Base):
     username = Column(String(50), unique=True)
     email = Column(String(100))
     password = Column(String(100))
+    password_hash = Column(String(255))
+
+def database_url() -> URL:
+    """SQLAlchemy URL for the configured backend"""
+    if Config.DATABASE_TYPE == DatabaseType.SQLITE:
+        return URL.create("sqlite", database=Config.SQLITE_DB_PATH)
+    elif Config.DATABASE_TYPE == DatabaseType.MYSQL:
+        settings, drivername = Config.MYSQL_CONFIG, "mysql+mysqlconnector"
+    elif Config.DATABASE_TYPE == DatabaseType.POSTGRES:
+        settings, drivername = Config.POSTGRES_CONFIG, "postgresql+psycopg2"
+    else:
+        raise ValueError("Unsupported database type")
+    return URL.create(
+        drivername,
+        username=settings["user"],
+        password=settings["password"] or None,
+        host=settings["host"],
+        database=settings["database"],
+    )
+
+def create_orm_engine() -> Engine:
+    """Build the shared engine with a bounded, pre-pinged connection pool"""
+    connect_args = {}
+    if Config.DATABASE_TYPE == DatabaseType.SQLITE:
+        # Pooled connections are handed to whichever request thread needs one
+        connect_args["check_same_thread"] = False
+    return create_engine(
+        database_url(),
+        connect_args=connect_args,
+        pool_size=Config.POOL_SIZE,
+        max_overflow=Config.ORM_MAX_OVERFLOW,
+        pool_timeout=Config.POOL_TIMEOUT,
+        pool_recycle=Config.ORM_POOL_RECYCLE,
+        pool_pre_ping=True,
+        query_cache_size=Config.ORM_QUERY_CACHE_SIZE,
+    )
 
-engine = create_engine(f"sqlite:///{Config.SQLITE_DB_PATH}")
+engine = create_orm_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _app_ctx_id() -> int:
+    return id(app_ctx._get_current_object())
+
+# One session per Flask application context, removed on teardown
+RequestSession = scoped_session(SessionLocal, scopefunc=_app_ctx_id)
+session_checkout_stats = TimingStats()
+
+# Built once so every login reuses the same statement and the engine's
+# cached compiled form of it; only the columns the login needs are loaded
+LOGIN_QUERY = (
+    select(User)
+    .options(load_only(User.id, User.username, User.email, User.password_hash))
+    .where(User.username == bindparam("username"))
+)
+
+def create_peewee_database():
+    """Build a pooled Peewee database for the configured backend"""
+    pool_options = {
+        "max_connections": Config.POOL_SIZE,
+        "stale_timeout": Config.POOL_IDLE_TIMEOUT,
+        "timeout": Config.POOL_TIMEOUT,
+    }
+    if Config.DATABASE_TYPE == DatabaseType.SQLITE:
+        # Pooled connections are handed to whichever thread checks them out next
+        return PooledSqliteDatabase(
+            Config.SQLITE_DB_PATH, check_same_thread=False, **pool_options
+        )
+    elif Config.DATABASE_TYPE == DatabaseType.MYSQL:
+        settings = dict(Config.MYSQL_CONFIG)
+        return PooledMySQLDatabase(settings.pop("database"), **settings, **pool_options)
+    elif Config.DATABASE_TYPE == DatabaseType.POSTGRES:
+        settings = dict(Config.POSTGRES_CONFIG)
+        return PooledPostgresqlDatabase(settings.pop("database"), **settings, **pool_options)
+    else:
+        raise ValueError("Unsupported database type")
+
+def configure_peewee():
+    """(Re)initialize the shared Peewee database from Config"""
+    if peewee_db.obj is not None:
+        peewee_db.close_all()
+    peewee_db.initialize(create_peewee_database())
+
+configure_peewee()
+
+@contextmanager
+def peewee_connection() -> Iterator[None]:
+    """
+    Check out a pooled Peewee connection for the block and return it after.
+    Only routes that query through Peewee take one, so the pool's
+    POOL_SIZE connections do not cap requests to the other routes.
+    """
+    with timed("db_checkout"):
+        peewee_db.connect(reuse_if_open=True)
+    try:
+        yield
+    finally:
+        if not peewee_db.is_closed():
+            peewee_db.close()
+
 class PeeweeUser(Model):
     username = CharField(unique=True)
     email = CharField()
@@ -34,7 +141,7 @@ def create_peewee_tables():
         peewee_db.create_tables([PeeweeUser])
         
         # Insert sample data if table is empty
-        if PeeweeUser.select().count() == 0:
+        if not PeeweeUser.select().exists():
             sample_users = [
                 {'username': 'admin', 'email': 'admin@example.com', 'password': 'Admin@123'},
                 {'username': 'alice', 'email': 'alice@example.com', 'password': 'Alice@123'},
@@ -42,6 +149,43 @@ def create_peewee_tables():
             ]
             PeeweeUser.insert_many(sample_users).execute()
 
+def configure_engine():
+    """Rebuild the shared engine after Config changes (e.g. a new database path)"""
+    global engine
+    engine.dispose()
+    engine = create_orm_engine()
+    SessionLocal.configure(bind=engine)
+
+def create_orm_tables():
+    """Create tables for SQLAlchemy models"""
+    Base.metadata.create_all(bind=engine)
+
+def get_request_session() -> Session:
+    """
+    Return the session bound to the current request.
+    The first call per request checks out its connection and records how
+    long that took in session_checkout_stats.
+    """
+    if not RequestSession.registry.has():
+        started = perf_counter()
+        with timed("db_checkout"):
+            RequestSession().connection()
+        session_checkout_stats.observe(perf_counter() - started)
+    return RequestSession()
+
+def lookup_orm_credentials(username: str) -> Optional[CredentialRow]:
+    """Run LOGIN_QUERY on the request's session and detach the columns a login needs"""
+    db = get_request_session()
+    with timed("query"):
+        user = db.execute(LOGIN_QUERY, {"username": username}).scalar_one_or_none()
+    if user is None:
+        return None
+    return CredentialRow(user.id, user.password_hash, user.username, user.email)
+
+def remove_request_session(exception=None):
+    """Flask teardown hook: close the request's session and return its connection"""
+    RequestSession.remove()
+
 def get_db_session():
     """Provide a database session for ORM operations"""
     db = SessionLocal()
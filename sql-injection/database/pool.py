@@ -0,0 +1,269 @@
+import threading
+from collections import OrderedDict, deque
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection becomes available before the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable DB-API connections.
+    Idle connections are handed out most-recently-used first so the warmest
+    ones stay busy and the rest age out through idle eviction.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 5,
+        timeout: float = 5.0,
+        idle_timeout: float = 300.0,
+        pre_ping: bool = True,
+        statement_cache_size: int = 128,
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self.statement_cache_size = statement_cache_size
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0  # idle + checked out
+        self._disposed = False
+        self._cond = threading.Condition()
+        # Prepared cursors per open connection, keyed by id(conn); a
+        # connection is used by one thread at a time so entries need no lock
+        self._statements: Dict[int, "OrderedDict[str, Any]"] = {}
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "checkouts": 0,
+            "evicted": 0,
+            "discarded": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "statement_hits": 0,
+            "statement_misses": 0,
+        }
+
+    def ping(self, conn: Any) -> bool:
+        """Return True if the connection is still usable"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def reset(self, conn: Any) -> None:
+        """Drop any transaction left open by the previous borrower"""
+        conn.rollback()
+
+    def prepare(self, conn: Any, query: str) -> Any:
+        """Create a cursor that will run ``query``; backends with server-side prepare override this"""
+        return conn.cursor()
+
+    def cursor_for(self, conn: Any, query: str) -> Any:
+        """Return a cursor for ``query``, reusing the one prepared earlier on this connection"""
+        cache = self._statements.setdefault(id(conn), OrderedDict())
+        cursor = cache.get(query)
+        if cursor is not None:
+            cache.move_to_end(query)
+            with self._cond:
+                self._counters["statement_hits"] += 1
+            return cursor
+
+        with self._cond:
+            self._counters["statement_misses"] += 1
+        cursor = cache[query] = self.prepare(conn, query)
+        if len(cache) > self.statement_cache_size:
+            _, oldest = cache.popitem(last=False)
+            try:
+                oldest.close()
+            except Exception:
+                pass
+        return cursor
+
+    def replication_lag(self, conn: Any) -> Optional[float]:
+        """Seconds a replica lags behind its primary, or None if the backend cannot tell"""
+        return None
+
+    def acquire(self) -> Any:
+        """Check out a connection, waiting up to ``timeout`` seconds for one"""
+        deadline = monotonic() + self.timeout
+        stale: List[Any] = []
+        with self._cond:
+            while True:
+                stale.extend(self._evict_idle())
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No connection available within {self.timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                self._counters["waits"] += 1
+                self._cond.wait(remaining)
+        self._close_all(stale)
+
+        if conn is not None and self.pre_ping and not self.ping(conn):
+            self._close_all([conn])
+            with self._cond:
+                self._counters["discarded"] += 1
+            conn = None
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._counters["created"] += 1
+                self._counters["checkouts"] += 1
+        else:
+            with self._cond:
+                self._counters["reused"] += 1
+                self._counters["checkouts"] += 1
+        return conn
+
+    def release(self, conn: Any) -> None:
+        """
+        Return a connection to the pool, closing it if it cannot be reset or
+        the pool has been disposed
+        """
+        try:
+            self.reset(conn)
+            healthy = True
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            keep = healthy and not self._disposed
+            if keep:
+                self._idle.append((conn, monotonic()))
+            else:
+                self._size -= 1
+                if not healthy:
+                    self._counters["discarded"] += 1
+            self._cond.notify()
+        if not keep:
+            self._close_all([conn])
+
+    def dispose(self) -> None:
+        """Close every idle connection; checked-out ones close on release"""
+        with self._cond:
+            self._disposed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close_all(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and lifetime counters"""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._counters,
+            }
+
+    def _evict_idle(self) -> List[Any]:
+        """Pop connections idle for longer than ``idle_timeout``; caller holds the lock"""
+        stale = []
+        cutoff = monotonic() - self.idle_timeout
+        # Oldest returns sit at the left end of the deque
+        while self._idle and self._idle[0][1] < cutoff:
+            stale.append(self._idle.popleft()[0])
+        self._size -= len(stale)
+        self._counters["evicted"] += len(stale)
+        return stale
+
+    def _close_all(self, conns: List[Any]) -> None:
+        for conn in conns:
+            self._statements.pop(id(conn), None)
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class SQLitePool(ConnectionPool):
+    """Pool for sqlite3 connections"""
+
+    # SQLite replicas are file copies refreshed outside the app (e.g. by
+    # Litestream or a backup job), so there is no lag to query: the
+    # inherited replication_lag() returns None
+
+    def ping(self, conn: Any) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchall()
+            return True
+        except Exception:
+            return False
+
+
+class MySQLPool(ConnectionPool):
+    """Pool for mysql.connector connections"""
+
+    def prepare(self, conn: Any, query: str) -> Any:
+        # Prepared cursors send COM_STMT_PREPARE once and re-execute the
+        # server-side statement while the query text stays the same
+        return conn.cursor(prepared=True)
+
+    def ping(self, conn: Any) -> bool:
+        try:
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    def replication_lag(self, conn: Any) -> Optional[float]:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SHOW REPLICA STATUS")
+        status = cursor.fetchone()
+        cursor.close()
+        if status is None:
+            return 0.0  # not a replica
+        # NULL while the SQL thread is stopped: treat as infinitely behind
+        lag = status.get("Seconds_Behind_Source")
+        return float("inf") if lag is None else float(lag)
+
+
+class PostgresPool(ConnectionPool):
+    """Pool for psycopg2 connections"""
+
+    def ping(self, conn: Any) -> bool:
+        if conn.closed:
+            return False
+        return super().ping(conn)
+
+    def replication_lag(self, conn: Any) -> Optional[float]:
+        cursor = conn.cursor()
+        # A replica that has replayed everything it received is current even
+        # if the last replayed transaction is old (idle primary)
+        cursor.execute(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() "
+            "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )
+        lag = cursor.fetchone()[0]
+        cursor.close()
+        return float("inf") if lag is None else float(lag)
@@ -1,26 +1,52 @@
-from typing import Any, Dict, List
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from flask import request
 
 from database import db_manager
+from database.login_cache import CredentialRow, login_cache
+from database.migrations import migrate
+from database.schema import PLACEHOLDERS, create_users_table, users_table_empty
+from utils.instrumentation import timed
 from utils.logging import log_attack_attempt
+from utils.passwords import hash_password, verify_password
 
+SelectResult = Union[List[Dict[str, Any]], List[tuple], Dict[str, List[Any]]]
+
+
+class RowMode(str, Enum):
+    """Shape of the rows returned by RawQueryExecutor.execute_select"""
+    DICT = "dict"        # one dict per row
+    TUPLE = "tuple"      # driver tuples, no per-row allocation
+    COLUMNS = "columns"  # {column: [values, ...]}
 
 class RawQueryExecutor:
     """Helper class for executing raw SQL queries safely"""
     
     @staticmethod
-    def execute_select(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    def _shape_rows(cursor: Any, rows: List[tuple], row_mode: RowMode) -> SelectResult:
+        if row_mode == RowMode.TUPLE:
+            return rows
+        columns = [col[0] for col in cursor.description]
+        if row_mode == RowMode.COLUMNS:
+            values = list(zip(*rows)) if rows else [()] * len(columns)
+            return {column: list(col) for column, col in zip(columns, values)}
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    def execute_select(query: str, params: tuple = (), row_mode: RowMode = RowMode.DICT) -> SelectResult:
         """
-        Execute a SELECT query safely with parameters
-        Returns list of dictionaries representing rows
+        Execute a SELECT query safely with parameters, on a read replica when configured
+        Returns list of dictionaries representing rows, or tuples / a
+        column-oriented dict depending on row_mode
         """
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
+        with db_manager.get_connection(readonly=True) as conn:
+            cursor = db_manager.cursor(conn, query)
             try:
-                cursor.execute(query, params)
-                columns = [col[0] for col in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                with timed("query"):
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+                return RawQueryExecutor._shape_rows(cursor, rows, row_mode)
             except Exception as e:
                 log_attack_attempt(
                     request,
@@ -29,18 +55,49 @@ class RawQueryExecutor:
                     False
                 )
                 raise e
+
+    @staticmethod
+    def execute_many_select(
+        query: str, params_seq: Iterable[tuple], row_mode: RowMode = RowMode.DICT
+    ) -> List[SelectResult]:
+        """
+        Execute the same SELECT for each parameter tuple on one connection
+        (a read replica when configured) and one prepared statement.
+        Returns one result per parameter tuple
+        """
+        with db_manager.get_connection(readonly=True) as conn:
+            cursor = db_manager.cursor(conn, query)
+            results = []
+            for params in params_seq:
+                try:
+                    with timed("query"):
+                        cursor.execute(query, params)
+                        rows = cursor.fetchall()
+                    results.append(RawQueryExecutor._shape_rows(cursor, rows, row_mode))
+                except Exception as e:
+                    log_attack_attempt(
+                        request,
+                        request.path,
+                        {"query": query, "params": params},
+                        False
+                    )
+                    raise e
+            return results
     
     @staticmethod
     def execute_write(query: str, params: tuple = ()) -> int:
         """
         Execute INSERT/UPDATE/DELETE query safely with parameters
+        Writes to the users table invalidate the login lookup cache
         Returns number of affected rows
         """
         with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = db_manager.cursor(conn, query)
             try:
-                cursor.execute(query, params)
-                conn.commit()
+                with timed("query"):
+                    cursor.execute(query, params)
+                    conn.commit()
+                login_cache.invalidate_for(query)
                 return cursor.rowcount
             except Exception as e:
                 conn.rollback()
@@ -55,31 +112,52 @@ class RawQueryExecutor:
     @staticmethod
     def setup_database():
         """Initialize database with sample data"""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT,
-            password TEXT
-        )
-        """
-        
         sample_users = [
             ("admin", "admin@example.com", "securepassword123"),
             ("user1", "user1@example.com", "password123"),
             ("testuser", "test@example.com", "testpass")
         ]
         
+        db_type = db_manager.config.DATABASE_TYPE
+        with db_manager.get_connection() as conn:
+            create_users_table(conn, db_type)
+        
+        # Older databases need password_hash before sample users can be inserted
+        migrate(db_type)
+        
         with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(create_table_sql)
-            
-            # Check if table is empty
-            cursor.execute("SELECT COUNT(*) FROM users")
-            count = cursor.fetchone()[0]
-            
-            if count == 0:
-                insert_sql = "INSERT INTO users (username, email, password) VALUES (?, ?, ?)"
-                for user in sample_users:
-                    cursor.execute(insert_sql, user)
-                conn.commit()
\ No newline at end of file
+            if users_table_empty(conn):
+                placeholder = PLACEHOLDERS[db_type]
+                insert_sql = (
+                    "INSERT INTO users (username, email, password, password_hash) "
+                    f"VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder})"
+                )
+                conn.cursor().executemany(
+                    insert_sql,
+                    [(*user, hash_password(user[2])) for user in sample_users]
+                )
+                conn.commit()
+                login_cache.invalidate_all()
+
+    @staticmethod
+    def lookup_credentials(username: str) -> Optional[CredentialRow]:
+        """
+        Fetch id and password_hash by username alone, so the lookup is
+        answered from the covering credentials index
+        """
+        placeholder = PLACEHOLDERS[db_manager.config.DATABASE_TYPE]
+        query = f"SELECT id, password_hash FROM users WHERE username = {placeholder}"
+        rows = RawQueryExecutor.execute_select(query, (username,), RowMode.TUPLE)
+        return CredentialRow(*rows[0]) if rows else None
+
+    @staticmethod
+    def authenticate(username: str, password: str) -> Optional[int]:
+        """
+        Verify credentials against the stored password hash.
+        The lookup goes through the login cache when it is enabled
+        Returns the user id, or None if the credentials are invalid
+        """
+        row = login_cache.lookup("sql", username, RawQueryExecutor.lookup_credentials)
+        if verify_password(row.password_hash if row else None, password):
+            return row.id
+        return None
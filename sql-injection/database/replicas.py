@@ -0,0 +1,114 @@
+import threading
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.pool import ConnectionPool
+
+
+class Replica:
+    """Connection pool of one read replica plus its last observed state"""
+
+    def __init__(self, name: str, pool: ConnectionPool):
+        self.name = name
+        self.pool = pool
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self.down_until = 0.0
+        self.reads = 0
+
+
+class ReplicaSet:
+    """
+    Round-robin selection over read replicas.
+    A replica is skipped while its measured replication lag exceeds
+    ``max_lag`` (re-measured at most every ``check_interval`` seconds, on the
+    connection being checked out) and for ``retry_after`` seconds after a
+    failed checkout. acquire() returns None when no replica is eligible, so
+    the caller falls back to the primary.
+    """
+
+    def __init__(self, replicas: List[Replica], max_lag: float, check_interval: float, retry_after: float):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._next = 0
+        self._counters = {"lagging": 0, "failures": 0, "fallbacks": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _measure_lag(self, replica: Replica, conn: Any, now: float) -> bool:
+        """Refresh the replica's lag if due; return False if the connection is unusable"""
+        if now - replica.checked_at < self.check_interval:
+            return True
+        try:
+            replica.lag = replica.pool.replication_lag(conn)
+        except Exception:
+            return False
+        replica.checked_at = now
+        return True
+
+    def acquire(self) -> Optional[Tuple[Replica, Any]]:
+        """Check out a connection from the next eligible replica"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            now = monotonic()
+            if replica.down_until > now:
+                continue
+            known_lagging = replica.lag is not None and replica.lag > self.max_lag
+            if known_lagging and now - replica.checked_at < self.check_interval:
+                continue
+
+            try:
+                conn = replica.pool.acquire()
+            except Exception:
+                replica.down_until = now + self.retry_after
+                self._count("failures")
+                continue
+            if not self._measure_lag(replica, conn, now):
+                replica.pool.release(conn)
+                replica.down_until = now + self.retry_after
+                self._count("failures")
+                continue
+            if replica.lag is not None and replica.lag > self.max_lag:
+                replica.pool.release(conn)
+                self._count("lagging")
+                continue
+
+            with self._lock:
+                replica.reads += 1
+            return replica, conn
+
+        self._count("fallbacks")
+        return None
+
+    def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.pool.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-replica reads, lag and availability, plus routing counters"""
+        now = monotonic()
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "max_lag": self.max_lag,
+            **counters,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "reads": replica.reads,
+                    "lag": replica.lag,
+                    "available": replica.down_until <= now,
+                    "pool": replica.pool.stats(),
+                }
+                for replica in self.replicas
+            ],
+        }
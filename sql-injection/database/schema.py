@@ -0,0 +1,69 @@
+from typing import Any
+
+from config import DatabaseType
+
+USERS_TABLE_DDL = {
+    DatabaseType.SQLITE: """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT,
+            password TEXT,
+            password_hash TEXT
+        )
+    """,
+    DatabaseType.MYSQL: """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTO_INCREMENT,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100),
+            password VARCHAR(100),
+            password_hash VARCHAR(255)
+        )
+    """,
+    DatabaseType.POSTGRES: """
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100),
+            password VARCHAR(100),
+            password_hash VARCHAR(255)
+        )
+    """,
+}
+
+# Index for credential lookups: SELECT id, password_hash FROM users WHERE username = ?
+# SQLite and MySQL always resolve that equality through the UNIQUE username
+# index (one probe plus a rowid / clustered-key fetch) and never pick a wider
+# covering index, so only Postgres gets one, enabling an index-only scan.
+CREDENTIALS_INDEX_DDL = {
+    DatabaseType.POSTGRES: (
+        "CREATE INDEX IF NOT EXISTS idx_users_credentials ON users (username) INCLUDE (id, password_hash)"
+    ),
+}
+
+# DB-API paramstyle of each driver
+PLACEHOLDERS = {
+    DatabaseType.SQLITE: "?",
+    DatabaseType.MYSQL: "%s",
+    DatabaseType.POSTGRES: "%s",
+}
+
+def create_users_table(conn: Any, db_type: DatabaseType) -> None:
+    """Create the users table for the given backend if it does not exist"""
+    cursor = conn.cursor()
+    cursor.execute(USERS_TABLE_DDL[db_type])
+    conn.commit()
+
+def column_exists(conn: Any, table: str, column: str) -> bool:
+    """Check for a column using the cursor description, which every driver supports"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+    cursor.fetchall()
+    return column in (col[0] for col in cursor.description)
+
+def users_table_empty(conn: Any) -> bool:
+    """Check for any user row without scanning the whole table like COUNT(*)"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM users LIMIT 1")
+    return cursor.fetchone() is None
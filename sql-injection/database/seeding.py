@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+from itertools import islice
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config, DatabaseType
+from database import db_manager
+from database.migrations import migrate
+from database.schema import create_users_table
+from utils.passwords import hash_password
+
+UserRow = Tuple[str, str, str]
+HashedUserRow = Tuple[str, str, str, str]
+
+# Applied per connection for the duration of a SQLite bulk load. WAL lets
+# readers keep working while chunks commit; synchronous=OFF skips the fsync
+# per transaction, which is acceptable for disposable load-test data.
+SQLITE_BULK_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+]
+
+def read_csv_users(path: str) -> Iterator[UserRow]:
+    """Stream (username, email, password) rows from a CSV file with a header row"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield (row["username"], row.get("email") or "", row.get("password") or "")
+
+def read_jsonl_users(path: str) -> Iterator[UserRow]:
+    """Stream users from a JSON Lines file, one object per line"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                user = json.loads(line)
+                yield (user["username"], user.get("email", ""), user.get("password", ""))
+
+def generate_users(count: int, start: int = 0, prefix: str = "user") -> Iterator[UserRow]:
+    """Generate synthetic users user<N> / user<N>@example.com / Pass@<N>"""
+    for i in range(start, start + count):
+        yield (f"{prefix}{i}", f"{prefix}{i}@example.com", f"Pass@{i}")
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split a stream of rows into lists of at most ``size`` rows"""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def with_password_hashes(rows: Iterable[UserRow], method: str) -> Iterator[HashedUserRow]:
+    """Append a password hash to every row"""
+    for username, email, password in rows:
+        yield (username, email, password, hash_password(password, method))
+
+def _load_sqlite(conn: Any, chunks: Iterable[List[HashedUserRow]], on_chunk: Callable[[int], None]) -> None:
+    for pragma in SQLITE_BULK_PRAGMAS:
+        conn.execute(pragma)
+    sql = "INSERT OR IGNORE INTO users (username, email, password, password_hash) VALUES (?, ?, ?, ?)"
+    for chunk in chunks:
+        cursor = conn.executemany(sql, chunk)
+        conn.commit()
+        on_chunk(cursor.rowcount)
+
+def _load_mysql(conn: Any, chunks: Iterable[List[HashedUserRow]], on_chunk: Callable[[int], None]) -> None:
+    # mysql.connector rewrites executemany INSERTs into multi-row statements
+    sql = "INSERT IGNORE INTO users (username, email, password, password_hash) VALUES (%s, %s, %s, %s)"
+    cursor = conn.cursor()
+    for chunk in chunks:
+        cursor.executemany(sql, chunk)
+        conn.commit()
+        on_chunk(cursor.rowcount)
+
+def _load_postgres(conn: Any, chunks: Iterable[List[HashedUserRow]], on_chunk: Callable[[int], None]) -> None:
+    # COPY has no conflict handling: usernames must not exist yet
+    cursor = conn.cursor()
+    for chunk in chunks:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(chunk)
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY users (username, email, password, password_hash) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+        conn.commit()
+        on_chunk(len(chunk))
+
+LOADERS = {
+    DatabaseType.SQLITE: _load_sqlite,
+    DatabaseType.MYSQL: _load_mysql,
+    DatabaseType.POSTGRES: _load_postgres,
+}
+
+def seed_users(
+    rows: Iterable[UserRow],
+    chunk_size: int = 10000,
+    hash_method: Optional[str] = None,
+    progress: Optional[Callable[[int, float], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Bulk-load users into the configured database, one transaction per chunk.
+    Passwords are hashed with hash_method (Config.SEED_PASSWORD_HASH_METHOD
+    by default), a cheap setting meant for load-test data only.
+    Returns the number of inserted rows, elapsed seconds and rows/sec.
+    """
+    db_type = db_manager.config.DATABASE_TYPE
+    inserted = 0
+    started = perf_counter()
+
+    def on_chunk(count: int) -> None:
+        nonlocal inserted
+        inserted += count
+        if progress:
+            progress(inserted, perf_counter() - started)
+
+    conn = db_manager.connect()
+    try:
+        create_users_table(conn, db_type)
+        # Bring tables created before password_hash existed up to date
+        migrate(db_type)
+        hashed = with_password_hashes(rows, hash_method or Config.SEED_PASSWORD_HASH_METHOD)
+        LOADERS[db_type](conn, chunked(hashed, chunk_size), on_chunk)
+    finally:
+        conn.close()
+
+    elapsed = perf_counter() - started
+    return {
+        "rows": inserted,
+        "seconds": elapsed,
+        "rows_per_sec": inserted / elapsed if elapsed else 0.0,
+    }
@@ -1,6 +1,8 @@
 import sqlite3
 from pathlib import Path
 
+from utils.passwords import hash_password
+
 
 def initialize_database():
     # Create the instance directory if it doesn't exist
@@ -17,7 +19,8 @@ def initialize_database():
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         username TEXT UNIQUE NOT NULL,
         email TEXT,
-        password TEXT
+        password TEXT,
+        password_hash TEXT
     )
     """)
     
@@ -29,18 +32,17 @@ def initialize_database():
         ('testuser', 'test@example.com', 'Test@123')
     ]
     
-    # Check if table is empty
-    cursor.execute("SELECT COUNT(*) FROM users")
-    count = cursor.fetchone()[0]
+    # Check if table is empty (LIMIT 1 avoids a full COUNT(*) scan on large tables)
+    cursor.execute("SELECT 1 FROM users LIMIT 1")
     
-    if count == 0:
+    if cursor.fetchone() is None:
         cursor.executemany(
-            "INSERT INTO users (username, email, password) VALUES (?, ?, ?)",
-            sample_users
+            "INSERT INTO users (username, email, password, password_hash) VALUES (?, ?, ?, ?)",
+            [(*user, hash_password(user[2])) for user in sample_users]
         )
         print(f"Inserted {len(sample_users)} sample users")
     else:
-        print(f"Database already contains {count} users")
+        print("Database already contains users")
     
     conn.commit()
     conn.close()
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+
+from quart import request
+
+from middleware.waf import WebApplicationFirewall
+
+
+async def check_request() -> Optional[Dict[str, Any]]:
+    """
+    Async counterpart of WebApplicationFirewall.check_request for the ASGI app.
+    Quart reads the body without blocking the event loop and caches the parsed
+    JSON, so handlers awaiting request.get_json() reuse it.
+    """
+    if result := WebApplicationFirewall.scan_values(request.args.values()):
+        return result
+
+    form = await request.form
+    if form:
+        if result := WebApplicationFirewall.scan_values(form.values()):
+            return result
+
+    if request.is_json:
+        return WebApplicationFirewall.scan_json(await request.get_json(silent=True))
+
+    return None
@@ -1,8 +1,15 @@
-import re
-from typing import Any, Dict, Optional
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 from flask import jsonify, request
 
+from config import Config
+from utils.cache import TTLCache
+
+
+class InspectionBudgetExceeded(Exception):
+    """Raised when a request body is too large or too deep to inspect fully"""
+
 
 class WebApplicationFirewall:
     """Simple WAF to detect and block SQL injection attempts"""
@@ -12,50 +19,108 @@ class WebApplicationFirewall:
         'UNION', 'OR', 'AND', '--', ';', '/*', '*/', 'EXEC'
     ]
     
+    # The legacy quote-comment, statement-terminator and block-comment
+    # regexes each required a literal already in SQL_KEYWORDS ('--', ';',
+    # '/*'), so the keyword scan alone gives the same verdicts without their
+    # per-quote backtracking. Keywords are matched with one C substring
+    # search each: a single compiled alternation was slower, because the
+    # regex engine tries every keyword at every position of the value.
+
+    # Verdicts keyed by a digest of the normalized value, so large payloads
+    # are not retained and repeated inputs skip rule evaluation
+    _verdicts = TTLCache(Config.WAF_CACHE_SIZE, Config.WAF_CACHE_TTL)
+
+    @classmethod
+    def _matches(cls, normalized: str) -> bool:
+        """Check an upper-cased value for any SQL_KEYWORDS entry"""
+        for keyword in cls.SQL_KEYWORDS:
+            if keyword in normalized:
+                return True
+        return False
+
+    @classmethod
+    def contains_keyword(cls, value: str) -> bool:
+        """Case-insensitive check for any SQL_KEYWORDS entry"""
+        return cls._matches(value.upper())
+
     @classmethod
     def detect_sql_injection(cls, input_str: str) -> bool:
         """Check if input contains potential SQL injection patterns"""
         if not isinstance(input_str, str):
             return False
-            
-        input_upper = input_str.upper()
-        for keyword in cls.SQL_KEYWORDS:
-            if keyword in input_upper:
-                # Simple pattern matching - could be enhanced
-                return True
-                
-        # Check for common injection patterns
-        patterns = [
-            r".*'.*--.*",    # Single quote followed by comment
-            r".*;.*",        # Statement termination
-            r".*/\*.*\*/.*"  # Block comments
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, input_upper):
-                return True
-                
-        return False
+
+        normalized = input_str.upper()
+        if not Config.WAF_CACHE_ENABLED:
+            return cls._matches(normalized)
+
+        key = blake2b(normalized.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        verdict = cls._verdicts.get(key)
+        if verdict is None:
+            verdict = cls._matches(normalized)
+            cls._verdicts.set(key, verdict)
+        return verdict
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """Hit/miss counters of the verdict cache"""
+        return {"enabled": Config.WAF_CACHE_ENABLED, **cls._verdicts.stats()}
     
+    @classmethod
+    def scan_values(cls, values: Iterable[Any]) -> Optional[Dict[str, Any]]:
+        """Return the block response for the first value that looks like SQL injection"""
+        for value in values:
+            if cls.detect_sql_injection(value):
+                return {"status": "error", "message": "Potential SQL injection detected"}
+        return None
+
+    @classmethod
+    def scan_json(cls, data: Any) -> Optional[Dict[str, Any]]:
+        """Scan every string in a parsed JSON document within the inspection budget"""
+        try:
+            return cls.scan_values(cls.iter_json_strings(data))
+        except InspectionBudgetExceeded:
+            return {"status": "error", "message": "Request body exceeds inspection limits"}
+
     @classmethod
     def check_request(cls) -> Optional[Dict[str, Any]]:
         """Check incoming request for SQL injection attempts"""
         # Check query parameters
-        for _, value in request.args.items():
-            if cls.detect_sql_injection(value):
-                return {"status": "error", "message": "Potential SQL injection detected"}
+        if result := cls.scan_values(request.args.values()):
+            return result
         
         # Check form data
         if request.form:
-            for _, value in request.form.items():
-                if cls.detect_sql_injection(value):
-                    return {"status": "error", "message": "Potential SQL injection detected"}
+            if result := cls.scan_values(request.form.values()):
+                return result
         
-        # Check JSON body
+        # Check JSON body. Flask caches the parsed document on the request,
+        # so handlers reading request.json do not parse the body again.
         if request.is_json:
-            data = request.get_json(silent=True) or {}
-            for _, value in data.items():
-                if isinstance(value, str) and cls.detect_sql_injection(value):
-                    return {"status": "error", "message": "Potential SQL injection detected"}
+            return cls.scan_json(request.get_json(silent=True, cache=True))
         
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def iter_json_strings(data: Any) -> Iterator[str]:
+        """
+        Yield every string value in a parsed JSON document, depth-first.
+        Containers are walked lazily so scanning stops at the first hit, and
+        documents nested deeper than WAF_MAX_JSON_DEPTH or holding more than
+        WAF_MAX_JSON_NODES values raise InspectionBudgetExceeded.
+        """
+        stack = [iter((data,))]
+        nodes = 0
+        while stack:
+            for value in stack[-1]:
+                nodes += 1
+                if nodes > Config.WAF_MAX_JSON_NODES:
+                    raise InspectionBudgetExceeded("Too many JSON values")
+                if isinstance(value, str):
+                    yield value
+                elif isinstance(value, (dict, list)):
+                    if len(stack) > Config.WAF_MAX_JSON_DEPTH:
+                        raise InspectionBudgetExceeded("JSON nested too deeply")
+                    stack.append(iter(value.values() if isinstance(value, dict) else value))
+                    break
+            else:
+                stack.pop()
\ No newline at end of file
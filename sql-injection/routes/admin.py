@@ -0,0 +1,42 @@
+from typing import Any, Dict
+
+from flask import Blueprint
+
+from database import db_manager, models
+from database.login_cache import login_cache
+from middleware.waf import WebApplicationFirewall
+from utils.logging import logging_stats
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+@bp.route('/waf_cache', methods=['GET'])
+def waf_cache() -> Dict[str, Any]:
+    """Hit/miss counters of the WAF verdict cache"""
+    return {"status": "success", "waf_cache": WebApplicationFirewall.cache_stats()}
+
+
+@bp.route('/orm', methods=['GET'])
+def orm_stats() -> Dict[str, Any]:
+    """Session checkout timings and SQLAlchemy pool status"""
+    return {
+        "status": "success",
+        "session_checkout": models.session_checkout_stats.snapshot(),
+        "pool": models.engine.pool.status(),
+    }
+
+@bp.route('/logging', methods=['GET'])
+def logging_pipeline() -> Dict[str, Any]:
+    """Queue depth, drop and batch counters of the logging pipeline"""
+    return {"status": "success", "logging": logging_stats()}
+
+
+@bp.route('/replicas', methods=['GET'])
+def replicas() -> Dict[str, Any]:
+    """Read routing counters and per-replica lag and availability"""
+    return {"status": "success", "replicas": db_manager.replica_stats()}
+
+
+@bp.route('/login_cache', methods=['GET'])
+def login_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the login lookup cache"""
+    return {"status": "success", "login_cache": login_cache.stats()}
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+
+from quart import Blueprint, request
+
+from database.aio import async_db
+
+bp = Blueprint('insecure', __name__, url_prefix='/insecure')
+
+@bp.route('/login_string_format', methods=['POST'])
+async def login_string_format() -> Dict[str, Any]:
+    """
+    Vulnerable endpoint using string formatting for SQL queries (async driver).
+    SQL Injection possible with payloads like: " OR 1=1 --
+    """
+    data = await request.get_json()
+    username = data.get('username', '')
+    password = data.get('password', '')
+
+    query = f"SELECT * FROM users WHERE username = '{username}' AND password = '{password}'"
+
+    result = await async_db.fetchone(query)
+
+    if result:
+        return {"status": "success", "message": "Logged in"}
+    
+    return {"status": "error", "message": "Invalid credentials"}
+
+@bp.route('/login_sqlite_concatenate', methods=['POST'])
+async def login_sqlite_concatenate() -> Dict[str, Any]:
+    """
+    Vulnerable endpoint using string concatenation (async driver).
+    SQL Injection possible with payloads like: " OR 1=1 --
+    """
+    data = await request.get_json()
+    username = data.get('username', '')
+    password = data.get('password', '')
+
+    query = "SELECT * FROM users WHERE username = '" + username + "' AND password = '" + password + "'"
+
+    result = await async_db.fetchone(query)
+
+    if result:
+        return {"status": "success", "message": "Logged in"}
+    
+    return {"status": "error", "message": "Invalid credentials"}
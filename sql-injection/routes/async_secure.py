@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Dict
+
+from peewee import DoesNotExist
+from quart import Blueprint, current_app, request
+
+from config import Config
+from database.aio import async_db
+from database.models import LOGIN_QUERY, PeeweeUser, peewee_db
+from middleware.waf import WebApplicationFirewall
+from schemas.models import LoginSchema, UserLogin, UserResponse
+from utils.passwords import verify_password
+from utils.validators import validate_input
+
+bp = Blueprint('secure', __name__, url_prefix='/secure')
+
+# --------------------------
+# 1. Parameterized Queries
+# --------------------------
+@bp.route('/login_parameterized', methods=['POST'])
+async def login_parameterized() -> Dict[str, Any]:
+    """
+    Secure endpoint using parameterized queries (async driver).
+    SQL Injection prevented by separating SQL code from data.
+    """
+    data = await request.get_json()
+    username = data.get('username', '')
+    password = data.get('password', '')
+    
+    if await async_db.authenticate(username, password):
+        return {"status": "success", "message": "Logged in"}
+    return {"status": "error", "message": "Invalid credentials"}
+
+# --------------------------
+# 2. ORM Usage (SQLAlchemy asyncio)
+# --------------------------
+async def _orm_lookup(username: str) -> Any:
+    async with current_app.config['ASYNC_SESSION']() as db:
+        result = await db.execute(LOGIN_QUERY, {"username": username})
+        return result.scalar_one_or_none()
+
+@bp.route('/login_orm', methods=['POST'])
+async def login_orm() -> Dict[str, Any]:
+    """
+    Secure endpoint using ORM (SQLAlchemy asyncio).
+    SQL Injection prevented by using ORM which handles parameterization.
+    """
+    try:
+        data = LoginSchema(**await request.get_json())
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    
+    user = await _orm_lookup(data.username)
+    stored_hash = user.password_hash if user else None
+    if await asyncio.to_thread(verify_password, stored_hash, data.password):
+        return {"status": "success", "message": "Logged in"}
+    return {"status": "error", "message": "Invalid credentials"}
+
+# --------------------------
+# 3. Query Builder (Peewee)
+# --------------------------
+def _peewee_login(username: str, password: str) -> bool:
+    # Peewee has no asyncio driver: run on a worker thread with a pooled connection
+    with peewee_db.connection_context():
+        try:
+            PeeweeUser.get(
+                (PeeweeUser.username == username) &
+                (PeeweeUser.password == password)
+            )
+            return True
+        except DoesNotExist:
+            return False
+
+@bp.route('/login_peewee', methods=['POST'])
+async def login_peewee() -> Dict[str, Any]:
+    """
+    Secure endpoint using Query Builder (Peewee, on a worker thread).
+    SQL Injection prevented by using high-level query builder.
+    """
+    try:
+        data = LoginSchema(**await request.get_json())
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    
+    if await asyncio.to_thread(_peewee_login, data.username, data.password):
+        return {"status": "success", "message": "Logged in"}
+    return {"status": "error", "message": "Invalid credentials"}
+
+# --------------------------
+# 4. Input Validation
+# --------------------------
+@bp.route('/login_input_validation', methods=['POST'])
+async def login_input_validation() -> Dict[str, Any]:
+    """
+    Secure endpoint using strict input validation (async driver).
+    SQL Injection prevented by whitelisting allowed characters.
+    """
+    data = await request.get_json()
+    username = data.get('username', '')
+    password = data.get('password', '')
+    
+    # Validate input against whitelist
+    if not validate_input(username) or not validate_input(password):
+        return {"status": "error", "message": "Invalid input characters"}
+    
+    # Also check length
+    if len(username) > Config.MAX_INPUT_LENGTH or len(password) > Config.MAX_INPUT_LENGTH:
+        return {"status": "error", "message": "Input too long"}
+    
+    if await async_db.authenticate(username, password):
+        return {"status": "success", "message": "Logged in"}
+    return {"status": "error", "message": "Invalid credentials"}
+
+# --------------------------
+# 5. Stored Procedures
+# --------------------------
+@bp.route('/login_stored_procedure', methods=['POST'])
+async def login_stored_procedure() -> Dict[str, Any]:
+    """
+    Secure endpoint using stored procedure (async driver).
+    Note: This requires the procedure to exist in the database.
+    """
+    data = await request.get_json()
+    username = data.get('username', '')
+    password = data.get('password', '')
+    
+    try:
+        result = await async_db.fetchone("CALL authenticate_user(?, ?)", (username, password))
+    except Exception as e:
+        return {"status": "error", "message": "Authentication failed"}
+        
+    if result:
+        return {"status": "success", "message": "Logged in"}
+    return {"status": "error", "message": "Invalid credentials"}
+
+# --------------------------
+# 6. Read-Only DB User
+# --------------------------
+@bp.route('/login_readonly_user', methods=['POST'])
+async def login_readonly_user() -> Dict[str, Any]:
+    """
+    Secure endpoint demonstrating principle of least privilege (async driver).
+    The database user should only have SELECT privileges.
+    """
+    try:
+        data = UserLogin(**await request.get_json())
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    
+    try:
+        if await async_db.authenticate(data.username, data.password):
+            return {"status": "success", "message": "Logged in"}
+        return {"status": "error", "message": "Invalid credentials"}
+    except Exception as e:
+        # This would fail for INSERT/UPDATE/DELETE operations
+        return {"status": "error", "message": "Database operation not permitted"}
+
+# --------------------------
+# 7. Combination of Protections
+# --------------------------
+@bp.route('/login_combined', methods=['POST'])
+async def login_combined() -> Dict[str, Any]:
+    """
+    Secure endpoint combining multiple protection layers (async):
+    - Input validation
+    - Parameterized queries
+    - ORM
+    - Length limits
+    """
+    try:
+        # Pydantic validation (length and character set)
+        data = UserLogin(**await request.get_json())
+        
+        # Additional manual validation
+        if WebApplicationFirewall.contains_keyword(data.username):
+            return {"status": "error", "message": "Invalid username"}
+        
+        # ORM query
+        user = await _orm_lookup(data.username)
+        stored_hash = user.password_hash if user else None
+        if await asyncio.to_thread(verify_password, stored_hash, data.password):
+            profile = UserResponse(id=user.id, username=user.username, email=user.email)
+            return {"status": "success", "message": "Logged in", "user": profile.model_dump()}
+        return {"status": "error", "message": "Invalid credentials"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
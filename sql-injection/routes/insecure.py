@@ -3,6 +3,7 @@ from typing import Any, Dict
 from flask import Blueprint, request
 
 from database import db_manager
+from utils.instrumentation import timed
 
 bp = Blueprint('insecure', __name__, url_prefix='/insecure')
 
@@ -20,8 +21,9 @@ def login_string_format() -> Dict[str, Any]:
 
     with db_manager.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(query)
-        result = cursor.fetchone()
+        with timed("query"):
+            cursor.execute(query)
+            result = cursor.fetchone()
 
     if result:
         return {"status": "success", "message": "Logged in"}
@@ -42,8 +44,9 @@ def login_sqlite_concatenate() -> Dict[str, Any]:
 
     with db_manager.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(query)
-        result = cursor.fetchone()
+        with timed("query"):
+            cursor.execute(query)
+            result = cursor.fetchone()
 
     if result:
         return {"status": "success", "message": "Logged in"}
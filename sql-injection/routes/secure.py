@@ -1,14 +1,17 @@
 from typing import Any, Dict
 
 from flask import Blueprint, request
-from peewee import CharField, DoesNotExist, Model, SqliteDatabase
-from pydantic import BaseModel, constr, validator
+from peewee import DoesNotExist
 
 from config import Config
 from database import db_manager
-from database.models import User, get_db_session
+from database.login_cache import login_cache
+from database.models import PeeweeUser, lookup_orm_credentials, peewee_connection
+from database.queries import RawQueryExecutor
 from middleware.waf import WebApplicationFirewall
-from schemas.models import UserLogin, UserResponse
+from schemas.models import LoginSchema, UserLogin, UserResponse
+from utils.instrumentation import timed
+from utils.passwords import verify_password
 from utils.validators import validate_input
 
 bp = Blueprint('secure', __name__, url_prefix='/secure')
@@ -26,24 +29,15 @@ def login_parameterized() -> Dict[str, Any]:
     username = data.get('username', '')
     password = data.get('password', '')
     
-    query = "SELECT * FROM users WHERE username = ? AND password = ?"
-    
-    with db_manager.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, (username, password))
-        result = cursor.fetchone()
-        
-    if result:
+    # Parameterized lookup by username only; the password is verified
+    # against the stored hash instead of being compared in SQL
+    if RawQueryExecutor.authenticate(username, password):
         return {"status": "success", "message": "Logged in"}
     return {"status": "error", "message": "Invalid credentials"}
 
 # --------------------------
 # 2. ORM Usage (SQLAlchemy)
 # --------------------------
-class LoginSchema(BaseModel):
-    username: constr(max_length=50)
-    password: constr(max_length=100)
-
 @bp.route('/login_orm', methods=['POST'])
 def login_orm() -> Dict[str, Any]:
     """
@@ -51,37 +45,22 @@ def login_orm() -> Dict[str, Any]:
     SQL Injection prevented by using ORM which handles parameterization.
     """
     try:
-        data = LoginSchema(**request.json)
+        with timed("validation"):
+            data = LoginSchema(**request.json)
     except Exception as e:
         return {"status": "error", "message": str(e)}
     
-    db = next(get_db_session())
-    try:
-        user = db.query(User).filter(
-            User.username == data.username,
-            User.password == data.password
-        ).first()
-        
-        if user:
-            return {"status": "success", "message": "Logged in"}
-        return {"status": "error", "message": "Invalid credentials"}
-    finally:
-        db.close()
+    # Request-scoped session, closed by the app's teardown handler; served
+    # from the login cache when it is enabled
+    row = login_cache.lookup("orm", data.username, lookup_orm_credentials)
+    
+    if verify_password(row.password_hash if row else None, data.password):
+        return {"status": "success", "message": "Logged in"}
+    return {"status": "error", "message": "Invalid credentials"}
 
 # --------------------------
 # 3. Query Builder (Peewee)
 # --------------------------
-# Initialize Peewee database
-peewee_db = SqliteDatabase(Config.SQLITE_DB_PATH)
-
-class PeeweeUser(Model):
-    username = CharField()
-    email = CharField()
-    password = CharField()
-    
-    class Meta:
-        database = peewee_db
-
 @bp.route('/login_peewee', methods=['POST'])
 def login_peewee() -> Dict[str, Any]:
     """
@@ -89,15 +68,17 @@ def login_peewee() -> Dict[str, Any]:
     SQL Injection prevented by using high-level query builder.
     """
     try:
-        data = LoginSchema(**request.json)
+        with timed("validation"):
+            data = LoginSchema(**request.json)
     except Exception as e:
         return {"status": "error", "message": str(e)}
     
     try:
-        user = PeeweeUser.get(
-            (PeeweeUser.username == data.username) &
-            (PeeweeUser.password == data.password)
-        )
+        with peewee_connection(), timed("query"):
+            user = PeeweeUser.get(
+                (PeeweeUser.username == data.username) &
+                (PeeweeUser.password == data.password)
+            )
         return {"status": "success", "message": "Logged in"}
     except DoesNotExist:
         return {"status": "error", "message": "Invalid credentials"}
@@ -116,21 +97,16 @@ def login_input_validation() -> Dict[str, Any]:
     password = data.get('password', '')
     
     # Validate input against whitelist
-    if not validate_input(username) or not validate_input(password):
+    with timed("validation"):
+        valid = validate_input(username) and validate_input(password)
+    if not valid:
         return {"status": "error", "message": "Invalid input characters"}
     
     # Also check length
     if len(username) > Config.MAX_INPUT_LENGTH or len(password) > Config.MAX_INPUT_LENGTH:
         return {"status": "error", "message": "Input too long"}
     
-    query = "SELECT * FROM users WHERE username = ? AND password = ?"
-    
-    with db_manager.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, (username, password))
-        result = cursor.fetchone()
-        
-    if result:
+    if RawQueryExecutor.authenticate(username, password):
         return {"status": "success", "message": "Logged in"}
     return {"status": "error", "message": "Invalid credentials"}
 
@@ -157,8 +133,9 @@ def login_stored_procedure() -> Dict[str, Any]:
         try:
             # For demonstration, we'll use a parameterized query
             # In real implementation, you'd call the stored procedure
-            cursor.execute("CALL authenticate_user(?, ?)", (username, password))
-            result = cursor.fetchone()
+            with timed("query"):
+                cursor.execute("CALL authenticate_user(?, ?)", (username, password))
+                result = cursor.fetchone()
         except Exception as e:
             return {"status": "error", "message": "Authentication failed"}
         
@@ -176,19 +153,13 @@ def login_readonly_user() -> Dict[str, Any]:
     The database user should only have SELECT privileges.
     """
     try:
-        data = UserLogin(**request.json)
+        with timed("validation"):
+            data = UserLogin(**request.json)
     except Exception as e:
         return {"status": "error", "message": str(e)}
     
-    query = "SELECT * FROM users WHERE username = ? AND password = ?"
-    
     try:
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (data.username, data.password))
-            result = cursor.fetchone()
-            
-        if result:
+        if RawQueryExecutor.authenticate(data.username, data.password):
             return {"status": "success", "message": "Logged in"}
         return {"status": "error", "message": "Invalid credentials"}
     except Exception as e:
@@ -208,26 +179,21 @@ def login_combined() -> Dict[str, Any]:
     - Length limits
     """
     try:
-        # Pydantic validation (length and character set)
-        data = UserLogin(**request.json)
-        
-        # Additional manual validation
-        if any(keyword.lower() in data.username.lower() 
-               for keyword in WebApplicationFirewall.SQL_KEYWORDS):
+        with timed("validation"):
+            # Pydantic validation (length and character set)
+            data = UserLogin(**request.json)
+            
+            # Additional manual validation
+            blocked = WebApplicationFirewall.contains_keyword(data.username)
+        if blocked:
             return {"status": "error", "message": "Invalid username"}
         
         # ORM query
-        db = next(get_db_session())
-        try:
-            user = db.query(User).filter(
-                User.username == data.username,
-                User.password == data.password
-            ).first()
-            
-            if user:
-                return {"status": "success", "message": "Logged in", "user": UserResponse.from_orm(user).dict()}
-            return {"status": "error", "message": "Invalid credentials"}
-        finally:
-            db.close()
+        row = login_cache.lookup("orm", data.username, lookup_orm_credentials)
+        
+        if verify_password(row.password_hash if row else None, data.password):
+            user = UserResponse(id=row.id, username=row.username, email=row.email)
+            return {"status": "success", "message": "Logged in", "user": user.model_dump()}
+        return {"status": "error", "message": "Invalid credentials"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
\ No newline at end of file
@@ -1,24 +1,28 @@
-import re
-
-from pydantic import BaseModel, constr, validator
+from pydantic import BaseModel, ConfigDict, constr, field_validator
 
 from config import Config
+from utils.validators import EMAIL_PATTERN, has_allowed_chars
+
 
+class LoginSchema(BaseModel):
+    """Length-only validation model used by the ORM and query builder logins"""
+    username: constr(max_length=50)
+    password: constr(max_length=100)
 
 class UserLogin(BaseModel):
     """Validation model for user login"""
     username: constr(max_length=Config.MAX_INPUT_LENGTH)
     password: constr(max_length=Config.MAX_INPUT_LENGTH)
     
-    @validator('username')
+    @field_validator('username')
     def validate_username_chars(cls, v):
-        if not re.match(Config.ALLOWED_CHARS, v):
+        if not has_allowed_chars(v):
             raise ValueError("Username contains invalid characters")
         return v
     
-    @validator('password')
+    @field_validator('password')
     def validate_password_chars(cls, v):
-        if not re.match(Config.ALLOWED_CHARS, v):
+        if not has_allowed_chars(v):
             raise ValueError("Password contains invalid characters")
         return v
 
@@ -26,9 +30,9 @@ class UserCreate(UserLogin):
     """Validation model for user creation"""
     email: constr(max_length=100)
     
-    @validator('email')
+    @field_validator('email')
     def validate_email(cls, v):
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", v):
+        if not EMAIL_PATTERN.match(v):
             raise ValueError("Invalid email format")
         return v
 
@@ -37,6 +41,5 @@ class UserResponse(BaseModel):
     id: int
     username: str
     email: str
-    
-    class Config:
-        orm_mode = True
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import argparse
+import sys
+
+from config import Config, DatabaseType
+from database.seeding import generate_users, read_csv_users, read_jsonl_users, seed_users
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk-load users into the users table for load testing"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="CSV file with a username,email,password header")
+    source.add_argument("--jsonl", help="JSON Lines file with username/email/password objects")
+    source.add_argument("--generate", type=int, metavar="N", help="Generate N synthetic users")
+    parser.add_argument("--start", type=int, default=0, help="First index for generated users")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per transaction")
+    parser.add_argument(
+        "--database-type",
+        choices=[db_type.value for db_type in DatabaseType],
+        default=Config.DATABASE_TYPE.value,
+        help="Target backend (defaults to Config.DATABASE_TYPE)",
+    )
+    parser.add_argument(
+        "--hash-method",
+        default=Config.SEED_PASSWORD_HASH_METHOD,
+        help="werkzeug password hash method for seeded users",
+    )
+    parser.add_argument("--sqlite-path", default=Config.SQLITE_DB_PATH, help="SQLite database file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    Config.DATABASE_TYPE = DatabaseType(args.database_type)
+    Config.SQLITE_DB_PATH = args.sqlite_path
+
+    if args.csv:
+        rows = read_csv_users(args.csv)
+    elif args.jsonl:
+        rows = read_jsonl_users(args.jsonl)
+    else:
+        rows = generate_users(args.generate, start=args.start)
+
+    def progress(inserted, elapsed):
+        rate = inserted / elapsed if elapsed else 0.0
+        print(f"\r{inserted:>12,} rows  {rate:>12,.0f} rows/sec", end="", file=sys.stderr)
+
+    result = seed_users(
+        rows, chunk_size=args.chunk_size, hash_method=args.hash_method, progress=progress
+    )
+    print(file=sys.stderr)
+    print(
+        f"Inserted {result['rows']:,} users in {result['seconds']:.2f}s "
+        f"({result['rows_per_sec']:,.0f} rows/sec)"
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+import pytest
+
+from config import Config
+from database import db_manager
+from database.models import configure_engine, configure_peewee
+
+
+@pytest.fixture
+def tmp_database(tmp_path, monkeypatch):
+    """Point the pooled DatabaseManager, both ORMs and the log file at a temp directory"""
+    monkeypatch.setattr(Config, "SQLITE_DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(Config, "LOG_FILE", str(tmp_path / "app.log"))
+    # Keep password hashing cheap in tests
+    monkeypatch.setattr(Config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+    db_manager.dispose()
+    configure_engine()
+    configure_peewee()
+    yield Config.SQLITE_DB_PATH
+    monkeypatch.undo()
+    db_manager.dispose()
+    configure_engine()
+    configure_peewee()
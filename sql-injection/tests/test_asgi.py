@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from asgi import create_asgi_app
+
+
+@pytest.fixture
+def asgi_app(tmp_database):
+    app = create_asgi_app()
+    app.config['TESTING'] = True
+    return app
+
+def run_requests(app, requests):
+    """Serve the app for the duration of the given (path, json) POSTs"""
+    async def run():
+        responses = []
+        async with app.test_app() as test_app:
+            client = test_app.test_client()
+            for path, payload in requests:
+                response = await client.post(path, json=payload)
+                responses.append((response.status_code, await response.get_json()))
+        return responses
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("path, username, password", [
+    ('/secure/login_parameterized', 'testuser', 'testpass'),
+    ('/secure/login_orm', 'testuser', 'testpass'),
+    ('/secure/login_peewee', 'bob', 'Bob@123'),
+    ('/secure/login_input_validation', 'testuser', 'testpass'),
+    ('/secure/login_readonly_user', 'testuser', 'testpass'),
+    ('/secure/login_combined', 'testuser', 'testpass'),
+])
+def test_secure_endpoints(asgi_app, path, username, password):
+    """Test that every async secure route accepts valid and rejects wrong credentials"""
+    ok, wrong = run_requests(asgi_app, [
+        (path, {'username': username, 'password': password}),
+        (path, {'username': username, 'password': 'wrong'}),
+    ])
+    assert ok[0] == 200
+    assert ok[1]['status'] == 'success'
+    assert wrong[1]['status'] == 'error'
+
+def test_insecure_endpoint(asgi_app):
+    """Test that the async insecure route stays injectable"""
+    [(status, body)] = run_requests(asgi_app, [
+        ('/insecure/login_string_format', {'username': "bob' --", 'password': 'x'}),
+    ])
+    # The WAF still sits in front of the vulnerable route
+    assert status == 403
+
+    [(status, body)] = run_requests(asgi_app, [
+        ('/insecure/login_sqlite_concatenate', {'username': 'testuser', 'password': 'testpass'}),
+    ])
+    assert status == 200
+    assert body['status'] == 'success'
+
+def test_waf_protection(asgi_app):
+    """Test that the async WAF blocks obvious SQL injection attempts"""
+    [(status, body)] = run_requests(asgi_app, [
+        ('/secure/login_combined', {'username': "admin' UNION SELECT * FROM users --", 'password': ''}),
+    ])
+    assert status == 403
+    assert 'Potential SQL injection detected' in body['message']
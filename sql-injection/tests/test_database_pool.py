@@ -0,0 +1,65 @@
+import sqlite3
+from functools import partial
+
+import pytest
+
+from database.pool import PoolTimeoutError, SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    connect = partial(sqlite3.connect, str(tmp_path / "pool.db"), check_same_thread=False)
+    pool = SQLitePool(connect, max_size=2, timeout=0.05)
+    yield pool
+    pool.dispose()
+
+def test_pool_reuses_connections(pool):
+    """Test that a released connection is handed out again"""
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    pool.release(second)
+
+    assert first is second
+    stats = pool.stats()
+    assert stats["created"] == 1
+    assert stats["reused"] == 1
+    assert stats["in_use"] == 0
+
+def test_pool_is_bounded(pool):
+    """Test that checkout times out once every connection is in use"""
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+    for conn in held:
+        pool.release(conn)
+
+def test_pool_replaces_dead_and_idle_connections(pool):
+    """Test that unhealthy connections are discarded and idle ones evicted"""
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert pool.stats()["discarded"] == 1
+    pool.release(replacement)
+
+    pool.idle_timeout = 0
+    fresh = pool.acquire()
+    assert fresh is not replacement
+    assert pool.stats()["evicted"] == 1
+    pool.release(fresh)
+
+def test_pool_closes_connections_released_after_dispose(pool):
+    """Test that a connection checked out across dispose() is closed, not pooled"""
+    conn = pool.acquire()
+    pool.dispose()
+    pool.release(conn)
+
+    stats = pool.stats()
+    assert stats["idle"] == 0
+    assert stats["size"] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
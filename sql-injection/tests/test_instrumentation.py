@@ -0,0 +1,49 @@
+import pytest
+
+from app import create_app
+from config import Config
+from utils.instrumentation import REQUEST_DURATION, REQUEST_PHASE_DURATION
+from utils.metrics import Histogram
+
+
+@pytest.fixture
+def client(tmp_database, monkeypatch):
+    monkeypatch.setattr(Config, "METRICS_ENABLED", True)
+    REQUEST_DURATION.clear()
+    REQUEST_PHASE_DURATION.clear()
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_histogram_render():
+    """Test that buckets are cumulative and labels are escaped"""
+    histogram = Histogram("demo_seconds", "Demo", ("path",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, '/a"b')
+    histogram.observe(0.5, '/a"b')
+    histogram.observe(5.0, '/a"b')
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP demo_seconds Demo", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{path="/a\\"b",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{path="/a\\"b",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{path="/a\\"b",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{path="/a\\"b"} 3' in lines
+
+def test_metrics_record_request_phases(client):
+    """Test that a login records every phase it goes through"""
+    client.post('/secure/login_orm', json={'username': 'testuser', 'password': 'testpass'})
+    client.post('/secure/login_parameterized', json={'username': 'testuser', 'password': 'testpass'})
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    for phase in ("waf", "validation", "db_checkout", "query", "password_verify", "serialization"):
+        assert f'http_request_phase_duration_seconds_count{{endpoint="secure.login_orm",phase="{phase}"}}' in body
+    assert 'http_request_phase_duration_seconds_count{endpoint="secure.login_parameterized",phase="query"} 1' in body
+    assert 'http_request_duration_seconds_count{endpoint="secure.login_orm",method="POST",status="200"} 1' in body
+
+def test_metrics_disabled_by_default(tmp_database):
+    """Test that /metrics is not served unless enabled"""
+    app = create_app()
+    assert app.test_client().get('/metrics').status_code == 404
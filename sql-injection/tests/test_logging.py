@@ -0,0 +1,83 @@
+import json
+import logging
+import queue
+
+from flask import Flask, request
+
+from config import Config
+from utils.logging import (
+    BatchedRotatingFileHandler,
+    BatchingQueueListener,
+    DroppingQueueHandler,
+    JsonFormatter,
+    log_attack_attempt,
+    logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def make_record(level=logging.INFO, msg="hello"):
+    return logging.makeLogRecord({"name": "test", "levelno": level, "levelname": logging.getLevelName(level), "msg": msg})
+
+def test_full_queue_drops_and_counts():
+    """Test that a full queue drops low-level records at once and counts them"""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1), logging.WARNING, 0.01)
+    handler.handle(make_record())
+    handler.handle(make_record())
+    handler.handle(make_record(logging.ERROR))
+    assert handler.counters == {"enqueued": 1, "dropped": 2, "blocked": 1}
+
+def test_listener_writes_json_batches(tmp_path):
+    """Test that queued records are written as JSON lines, several per flush"""
+    log_queue = queue.Queue()
+    queue_handler = DroppingQueueHandler(log_queue, logging.WARNING, 0.01)
+    file_handler = BatchedRotatingFileHandler(str(tmp_path / "app.log"), maxBytes=10**6, backupCount=1)
+    file_handler.setFormatter(JsonFormatter())
+    for i in range(10):
+        queue_handler.handle(make_record(msg=f"record {i}"))
+
+    listener = BatchingQueueListener(log_queue, file_handler, batch_size=4, dropped=queue_handler.counters)
+    listener.start()
+    listener.stop()
+    file_handler.close()
+
+    lines = [json.loads(line) for line in (tmp_path / "app.log").read_text().splitlines()]
+    assert [line["message"] for line in lines] == [f"record {i}" for i in range(10)]
+    assert listener.counters == {"batches": 3, "records": 10}
+
+def test_file_handler_rolls_over_per_batch(tmp_path):
+    """Test that the tracked file size triggers rollover at the batch flush"""
+    path = tmp_path / "app.log"
+    file_handler = BatchedRotatingFileHandler(str(path), maxBytes=200, backupCount=2, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    for i in range(4):
+        file_handler.emit(make_record(msg=f"record {i}"))
+    assert not (tmp_path / "app.log.1").exists()
+
+    file_handler.flush()
+    assert (tmp_path / "app.log.1").exists()
+    assert path.read_text() == ""
+    assert file_handler.bytes_written == 0
+
+    file_handler.emit(make_record(msg="after rollover"))
+    file_handler.close()
+    assert json.loads(path.read_text())["message"] == "after rollover"
+    assert len((tmp_path / "app.log.1").read_text().splitlines()) == 4
+
+def test_attack_attempt_is_structured(tmp_path, monkeypatch):
+    """Test that attack attempts keep their fields as JSON keys"""
+    monkeypatch.setattr(Config, "LOG_FILE", str(tmp_path / "app.log"))
+    setup_logging()
+    app = Flask(__name__)
+    with app.test_request_context('/secure/login', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        log_attack_attempt(request, request.path, {"query": "SELECT 1", "params": ("x",)}, True)
+    assert logging_stats()["enqueued"] >= 1
+    shutdown_logging()
+
+    entries = [json.loads(line) for line in (tmp_path / "app.log").read_text().splitlines()]
+    [entry] = [e for e in entries if e["logger"] == "security"]
+    assert entry["message"] == "SQL Injection Attempt"
+    assert entry["ip"] == "10.0.0.1"
+    assert entry["payload"] == {"query": "SELECT 1", "params": ["x"]}
+    assert entry["blocked"] is True
@@ -0,0 +1,65 @@
+import pytest
+
+from app import create_app
+from config import Config
+from database import db_manager
+from database.login_cache import CredentialRow, LoginCache, login_cache
+from database.queries import RawQueryExecutor
+
+
+@pytest.fixture
+def cache_enabled(tmp_database, monkeypatch):
+    monkeypatch.setattr(Config, "LOGIN_CACHE_ENABLED", True)
+    RawQueryExecutor.setup_database()
+    login_cache.invalidate_all()
+    yield login_cache
+    login_cache.invalidate_all()
+
+def test_lookups_are_cached_positive_and_negative(cache_enabled):
+    """Test that repeated logins, good or bad, reuse one database lookup"""
+    before = db_manager.pool_stats()["checkouts"]
+    counters = cache_enabled.stats()
+    for _ in range(3):
+        assert RawQueryExecutor.authenticate("testuser", "testpass")
+        assert RawQueryExecutor.authenticate("testuser", "wrong") is None
+        assert RawQueryExecutor.authenticate("nobody", "x") is None
+
+    assert db_manager.pool_stats()["checkouts"] - before == 2
+    stats = cache_enabled.stats()
+    assert stats["misses"] - counters["misses"] == 2
+    assert stats["hits"] - counters["hits"] == 7
+
+def test_write_to_users_invalidates(cache_enabled):
+    """Test that a credential change through execute_write is seen at once"""
+    assert RawQueryExecutor.authenticate("testuser", "testpass")
+    RawQueryExecutor.execute_write("DELETE FROM users WHERE username = ?", ("testuser",))
+    assert RawQueryExecutor.authenticate("testuser", "testpass") is None
+
+def test_lookup_racing_a_write_is_not_cached():
+    """Test that a row loaded before an invalidation is not stored"""
+    cache = LoginCache()
+
+    def load(username):
+        cache.invalidate_all()  # a write commits while the lookup runs
+        return CredentialRow(1, "old-hash")
+
+    original = Config.LOGIN_CACHE_ENABLED
+    Config.LOGIN_CACHE_ENABLED = True
+    try:
+        cache.lookup("sql", "alice", load)
+        assert cache.stats()["size"] == 0
+    finally:
+        Config.LOGIN_CACHE_ENABLED = original
+
+def test_orm_routes_use_cache(cache_enabled):
+    """Test that the ORM logins share cached rows and return the user"""
+    client = create_app().test_client()
+    counters = cache_enabled.stats()
+    response = client.post('/secure/login_combined', json={'username': 'testuser', 'password': 'testpass'})
+    assert response.json['user'] == {'id': 3, 'username': 'testuser', 'email': 'test@example.com'}
+    response = client.post('/secure/login_orm', json={'username': 'testuser', 'password': 'testpass'})
+    assert response.json['status'] == 'success'
+
+    stats = client.get('/admin/login_cache').json['login_cache']
+    assert stats['hits'] - counters['hits'] == 1
+    assert stats['misses'] - counters['misses'] == 1
@@ -0,0 +1,47 @@
+import sqlite3
+
+from database.migrations import MIGRATIONS, backfill_password_hashes, migrate
+from database.queries import RawQueryExecutor
+
+
+def test_migrate_hashes_legacy_plaintext_users(tmp_database):
+    """Test that a pre-hash users table is migrated, backfilled and indexed"""
+    conn = sqlite3.connect(tmp_database)
+    conn.execute(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "username TEXT UNIQUE NOT NULL, email TEXT, password TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO users (username, email, password) VALUES (?, ?, ?)",
+        [("alice", "a@example.com", "Alice@123"), ("bob", "b@example.com", "Bob@123"),
+         ("carol", "c@example.com", "Carol@123")],
+    )
+    conn.commit()
+    conn.close()
+
+    assert migrate() == [name for _, name, _ in MIGRATIONS]
+    assert migrate() == []
+
+    batches = []
+    assert backfill_password_hashes(batch_size=2, progress=batches.append) == 3
+    assert batches == [2, 3]
+    assert backfill_password_hashes(batch_size=2) == 0
+
+    conn = sqlite3.connect(tmp_database)
+    stored_hash = conn.execute("SELECT password_hash FROM users WHERE username = 'alice'").fetchone()[0]
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id, password_hash FROM users WHERE username = ?", ("alice",)
+    ).fetchall()
+    conn.close()
+
+    assert stored_hash and stored_hash != "Alice@123"
+    assert plan[0][-1].startswith("SEARCH users USING INDEX")
+
+def test_authenticate_verifies_hash(tmp_database):
+    """Test that authentication checks the stored hash and returns the user id"""
+    RawQueryExecutor.setup_database()
+
+    assert RawQueryExecutor.authenticate("admin", "securepassword123") == 1
+    assert RawQueryExecutor.authenticate("admin", "wrong") is None
+    assert RawQueryExecutor.authenticate("nobody", "securepassword123") is None
+    assert RawQueryExecutor.authenticate("admin' --", "") is None
@@ -0,0 +1,40 @@
+from database import db_manager
+from database.queries import RawQueryExecutor, RowMode
+
+
+def test_execute_select_row_modes(tmp_database):
+    """Test dict, tuple and column-oriented result shapes"""
+    RawQueryExecutor.setup_database()
+    query = "SELECT username, email FROM users WHERE id <= ? ORDER BY id"
+
+    assert RawQueryExecutor.execute_select(query, (2,)) == [
+        {"username": "admin", "email": "admin@example.com"},
+        {"username": "user1", "email": "user1@example.com"},
+    ]
+    assert RawQueryExecutor.execute_select(query, (1,), RowMode.TUPLE) == [
+        ("admin", "admin@example.com"),
+    ]
+    assert RawQueryExecutor.execute_select(query, (2,), RowMode.COLUMNS) == {
+        "username": ["admin", "user1"],
+        "email": ["admin@example.com", "user1@example.com"],
+    }
+    assert RawQueryExecutor.execute_select(query, (0,), RowMode.COLUMNS) == {
+        "username": [],
+        "email": [],
+    }
+
+def test_execute_many_select_reuses_statement(tmp_database):
+    """Test batched lookups run on one cached statement"""
+    RawQueryExecutor.setup_database()
+    query = "SELECT id FROM users WHERE username = ?"
+    before = db_manager.pool_stats()
+
+    results = RawQueryExecutor.execute_many_select(
+        query, [("admin",), ("missing",), ("testuser",)], RowMode.TUPLE
+    )
+    RawQueryExecutor.execute_select(query, ("user1",))
+
+    assert results == [[(1,)], [], [(3,)]]
+    stats = db_manager.pool_stats()
+    assert stats["statement_misses"] - before["statement_misses"] == 1
+    assert stats["statement_hits"] - before["statement_hits"] == 1
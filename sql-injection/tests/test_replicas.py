@@ -0,0 +1,63 @@
+import shutil
+
+import pytest
+
+from config import Config
+from database import db_manager
+from database.pool import SQLitePool
+from database.queries import RawQueryExecutor
+
+
+@pytest.fixture
+def replicas(tmp_database, tmp_path, monkeypatch):
+    """Two read-only copies of a freshly set up primary"""
+    RawQueryExecutor.setup_database()
+    db_manager.dispose()
+    paths = []
+    for name in ("replica1.db", "replica2.db"):
+        shutil.copy(tmp_database, tmp_path / name)
+        paths.append(str(tmp_path / name))
+    monkeypatch.setattr(Config, "SQLITE_REPLICAS", paths)
+    monkeypatch.setattr(Config, "REPLICA_LAG_CHECK_INTERVAL", 0.0)
+    yield paths
+    db_manager.dispose()
+
+def test_reads_round_robin_writes_go_to_primary(replicas):
+    """Test that SELECTs alternate between replicas and writes hit the primary"""
+    for _ in range(4):
+        assert RawQueryExecutor.authenticate("testuser", "testpass")
+
+    stats = db_manager.replica_stats()
+    assert [replica["reads"] for replica in stats["replicas"]] == [2, 2]
+    assert stats["fallbacks"] == 0
+
+    RawQueryExecutor.execute_write("UPDATE users SET email = ? WHERE username = ?", ("new@example.com", "testuser"))
+    with db_manager.get_connection() as conn:
+        assert conn.execute("SELECT email FROM users WHERE username = 'testuser'").fetchone() == ("new@example.com",)
+        # Reads nested in a primary checkout see the primary
+        assert RawQueryExecutor.execute_select("SELECT email FROM users WHERE username = ?", ("testuser",)) == [
+            {"email": "new@example.com"}
+        ]
+
+def test_lagging_replicas_fall_back_to_primary(replicas, monkeypatch):
+    """Test that replicas behind by more than REPLICA_MAX_LAG are skipped"""
+    monkeypatch.setattr(SQLitePool, "replication_lag", lambda self, conn: Config.REPLICA_MAX_LAG + 1)
+    assert RawQueryExecutor.authenticate("testuser", "testpass")
+
+    stats = db_manager.replica_stats()
+    assert [replica["reads"] for replica in stats["replicas"]] == [0, 0]
+    assert stats["lagging"] == 2
+    assert stats["fallbacks"] == 1
+    assert db_manager.pool_stats()["checkouts"] == 1
+
+def test_unreachable_replica_is_skipped(replicas, tmp_path, monkeypatch):
+    """Test that a replica that fails to connect is marked down and bypassed"""
+    monkeypatch.setattr(Config, "SQLITE_REPLICAS", [str(tmp_path / "missing.db"), replicas[0]])
+    for _ in range(3):
+        assert RawQueryExecutor.authenticate("testuser", "testpass")
+
+    stats = db_manager.replica_stats()
+    missing, healthy = stats["replicas"]
+    assert stats["failures"] == 1
+    assert not missing["available"]
+    assert healthy["reads"] == 3
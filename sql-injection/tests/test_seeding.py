@@ -0,0 +1,26 @@
+import json
+
+from database.queries import RawQueryExecutor
+from database.seeding import chunked, generate_users, read_jsonl_users, seed_users
+
+
+def test_chunked_splits_stream():
+    """Test that rows are grouped into fixed-size chunks"""
+    chunks = list(chunked(generate_users(5), 2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0] == ("user0", "user0@example.com", "Pass@0")
+
+def test_seed_users_skips_existing(tmp_database, tmp_path):
+    """Test that bulk loads insert new users and ignore existing usernames"""
+    result = seed_users(generate_users(25), chunk_size=10)
+    assert result["rows"] == 25
+
+    path = tmp_path / "users.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"username": "user3", "email": "dup@example.com", "password": "x"}),
+        json.dumps({"username": "newbie", "email": "new@example.com", "password": "y"}),
+    ]))
+    assert seed_users(read_jsonl_users(str(path)))["rows"] == 1
+
+    rows = RawQueryExecutor.execute_select("SELECT COUNT(*) AS total FROM users")
+    assert rows == [{"total": 26}]
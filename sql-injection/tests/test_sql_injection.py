@@ -1,10 +1,11 @@
 import pytest
 
 from app import create_app
+from database.models import peewee_db
 
 
 @pytest.fixture
-def client():
+def client(tmp_database):
     app = create_app()
     app.config['TESTING'] = True
     with app.test_client() as client:
@@ -53,4 +54,40 @@ def test_waf_protection(client):
         'password': ''
     })
     assert response.status_code == 403
-    assert 'Potential SQL injection detected' in response.json['message']
\ No newline at end of file
+    assert 'Potential SQL injection detected' in response.json['message']
+
+
+def test_orm_endpoint(client):
+    """Test that the ORM login verifies the hash on a request-scoped session"""
+    before = client.get('/admin/orm').json['session_checkout']['count']
+
+    response = client.post('/secure/login_orm', json={'username': 'testuser', 'password': 'testpass'})
+    assert response.json['status'] == 'success'
+
+    response = client.post('/secure/login_orm', json={'username': 'testuser', 'password': 'wrong'})
+    assert response.json['status'] == 'error'
+
+    stats = client.get('/admin/orm').json
+    assert stats['session_checkout']['count'] - before == 2
+    assert 'Checked out connections: 0' in stats['pool']
+
+def test_peewee_endpoint(client):
+    """Test that the query builder route runs on the shared pooled Peewee database"""
+    response = client.post('/secure/login_peewee', json={'username': 'bob', 'password': 'Bob@123'})
+    assert response.json['status'] == 'success'
+
+    response = client.post('/secure/login_peewee', json={'username': "bob' --", 'password': ''})
+    assert response.status_code == 403
+
+    # The route's connection went back to the pool
+    assert peewee_db.is_closed()
+
+def test_only_peewee_route_checks_out_peewee_connection(client, monkeypatch):
+    """Test that routes not using Peewee work while its pool is exhausted"""
+    def exhausted(*args, **kwargs):
+        raise RuntimeError("Peewee pool exhausted")
+
+    monkeypatch.setattr(peewee_db.obj, "connect", exhausted)
+    response = client.post('/secure/login_parameterized', json={'username': 'testuser', 'password': 'testpass'})
+    assert response.status_code == 200
+    assert response.json['status'] == 'success'
@@ -0,0 +1,28 @@
+import sqlite3
+import subprocess
+import sys
+
+from app import create_app
+from config import Config, DatabaseType
+from database import DRIVERS
+
+
+def tables(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def test_init_db_is_separate_from_startup(tmp_database, monkeypatch):
+    """Test that create_app can skip initialization and the CLI command performs it"""
+    monkeypatch.setattr(Config, "INIT_DB_ON_STARTUP", False)
+    app = create_app()
+    assert "users" not in tables(tmp_database)
+
+    result = app.test_cli_runner().invoke(args=["init-db"])
+    assert result.exit_code == 0
+    assert {"users", "schema_migrations", "peeweeuser"} <= tables(tmp_database)
+
+def test_sqlite_app_does_not_import_other_drivers():
+    """Test that a SQLite-only app never loads the MySQL driver"""
+    code = f"import sys, app; print({DRIVERS[DatabaseType.MYSQL]!r} in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
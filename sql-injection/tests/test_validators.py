@@ -0,0 +1,43 @@
+import pytest
+
+from middleware.waf import WebApplicationFirewall
+from schemas.models import UserLogin
+from utils.validators import compile_whitelist, validate_input
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("testuser", True),
+    ("Bob@123", True),
+    ("john.doe-1_x", True),
+    ("", False),
+    ("admin'--", False),
+    ("abc\n", False),   # re.match with '$' used to accept a trailing newline
+    ("ümlaut", False),  # alphanumeric, but outside the ASCII whitelist
+    ("x" * 101, False),
+    (42, True),
+])
+def test_validate_input(value, expected):
+    """Test the compiled whitelist with and without the alphanumeric fast path"""
+    assert validate_input(value) is expected
+
+def test_fast_path_only_for_character_classes():
+    """Test that whitelists other than a character class always run the regex"""
+    no_admin = compile_whitelist(r"^(?!admin)[a-z]+$")
+    assert no_admin("alice")
+    assert not no_admin("admin")
+
+def test_user_login_uses_whitelist():
+    """Test that the pydantic schema rejects characters outside the whitelist"""
+    assert UserLogin(username="testuser", password="testpass").username == "testuser"
+    with pytest.raises(ValueError):
+        UserLogin(username="admin'", password="x")
+
+@pytest.mark.parametrize("value, expected", [
+    ("alice", False),
+    ("union", True),
+    ("Select", True),
+    ("dorothy", True),  # contains OR, as with the per-keyword loop
+])
+def test_contains_keyword(value, expected):
+    """Test that the keyword screen matches case-insensitively"""
+    assert WebApplicationFirewall.contains_keyword(value) is expected
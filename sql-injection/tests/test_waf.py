@@ -0,0 +1,74 @@
+import pytest
+from flask import Flask
+
+from config import Config
+from middleware.waf import WebApplicationFirewall
+from routes.admin import bp as admin_bp
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("alice", False),
+    ("user_1234", False),
+    ("admin' --", True),
+    ("x; y", True),
+    ("/* comment */", True),
+    ("union select", True),
+    ("password", True),  # contains OR
+    (42, False),
+])
+def test_detect_sql_injection(value, expected):
+    """Test that the keyword scan keeps the original verdicts"""
+    assert WebApplicationFirewall.detect_sql_injection(value) is expected
+
+def test_detect_sql_injection_scans_whole_value():
+    """Test that keywords are found anywhere in long values"""
+    benign = "user_1234 " * 1000
+    assert not WebApplicationFirewall.detect_sql_injection(benign)
+    assert WebApplicationFirewall.detect_sql_injection("drop " + benign)
+    assert WebApplicationFirewall.detect_sql_injection(benign + "' --")
+    assert WebApplicationFirewall.contains_keyword(benign + "exec")
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+def test_check_request_inspects_nested_json(app):
+    """Test that string values inside nested objects and arrays are inspected"""
+    with app.test_request_context(json={"user": {"names": ["alice", "x' --"]}}):
+        assert WebApplicationFirewall.check_request()["message"] == "Potential SQL injection detected"
+
+    with app.test_request_context(json=[{"name": "alice"}, 1, None]):
+        assert WebApplicationFirewall.check_request() is None
+
+def test_check_request_enforces_json_budget(app, monkeypatch):
+    """Test that documents beyond the depth or size budget are rejected"""
+    monkeypatch.setattr(Config, "WAF_MAX_JSON_DEPTH", 3)
+    with app.test_request_context(json={"a": {"b": {"c": {"d": "alice"}}}}):
+        assert "inspection limits" in WebApplicationFirewall.check_request()["message"]
+
+    monkeypatch.setattr(Config, "WAF_MAX_JSON_NODES", 5)
+    with app.test_request_context(json=["alice"] * 10):
+        assert "inspection limits" in WebApplicationFirewall.check_request()["message"]
+
+def test_verdict_cache_counts_hits(app, monkeypatch):
+    """Test that repeated values are answered from the verdict cache"""
+    monkeypatch.setattr(Config, "WAF_CACHE_ENABLED", True)
+    app.register_blueprint(admin_bp)
+    WebApplicationFirewall._verdicts.clear()
+    before = WebApplicationFirewall.cache_stats()
+
+    assert WebApplicationFirewall.detect_sql_injection("cache-probe-value") is False
+    assert WebApplicationFirewall.detect_sql_injection("cache-probe-value") is False
+    assert WebApplicationFirewall.detect_sql_injection("Cache-Probe-Value") is False
+
+    stats = app.test_client().get('/admin/waf_cache').json['waf_cache']
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 2
+
+def test_verdict_cache_off_by_default(app):
+    """Test that values are scanned without touching the cache by default"""
+    before = WebApplicationFirewall.cache_stats()
+    assert before["enabled"] is False
+    assert WebApplicationFirewall.detect_sql_injection("uncached-value") is False
+    after = WebApplicationFirewall.cache_stats()
+    assert (after["hits"], after["misses"]) == (before["hits"], before["misses"])
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Iterator
+
+from flask import Flask, Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+from utils.metrics import Histogram
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Wall time per request, from the first before_request hook to the response",
+    ("endpoint", "method", "status"),
+)
+REQUEST_PHASE_DURATION = Histogram(
+    "http_request_phase_duration_seconds",
+    "Time spent per request in waf, validation, db_checkout, query, password_verify and serialization",
+    ("endpoint", "phase"),
+)
+
+def _endpoint() -> str:
+    return request.endpoint or "unmatched"
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Record the duration of the block as ``phase`` of the current request.
+    A no-op when metrics are disabled or outside a request (CLI, worker threads).
+    """
+    if not Config.METRICS_ENABLED or not has_request_context():
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        REQUEST_PHASE_DURATION.observe(perf_counter() - started, _endpoint(), phase)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that records response serialization as a request phase"""
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        with timed("serialization"):
+            return super().response(*args, **kwargs)
+
+
+def start_request_timer() -> None:
+    g.request_started = perf_counter()
+
+def observe_request(response: Response) -> Response:
+    started = g.pop("request_started", None)
+    if started is not None:
+        REQUEST_DURATION.observe(
+            perf_counter() - started, _endpoint(), request.method, str(response.status_code)
+        )
+    return response
+
+def render_metrics() -> str:
+    """All request histograms in the Prometheus text exposition format"""
+    return REQUEST_DURATION.render() + REQUEST_PHASE_DURATION.render()
+
+def init_instrumentation(app: Flask) -> None:
+    """
+    Time every request and serve the histograms at /metrics.
+    Call before registering other before_request hooks so the total
+    duration includes them.
+    """
+    app.json = TimedJSONProvider(app)
+    app.before_request(start_request_timer)
+    app.after_request(observe_request)
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
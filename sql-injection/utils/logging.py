@@ -1,38 +1,250 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import Any, Dict
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional
 
 from flask import Request
 
+from config import Config
+
+# Attributes every LogRecord carries; anything else was passed via ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields passed via ``extra`` are kept as keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=repr)
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes without flushing; the listener flushes
+    once per batch. The file size is tracked from the bytes written and
+    checked for rollover at each flush rather than per record, so a file
+    may exceed maxBytes by up to one batch.
+    """
+
+    def _open(self):
+        stream = super()._open()
+        # Appending: the position is the size of the existing file
+        self.bytes_written = stream.tell()
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            text = self.format(record) + self.terminator
+            self.stream.write(text)
+            self.bytes_written += len(text.encode(self.encoding or "utf-8", "replace"))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            super().flush()
+            if self.stream is not None and 0 < self.maxBytes <= self.bytes_written:
+                self.doRollover()
+        finally:
+            self.release()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking front end of the logging pipeline.
+    When the queue is full, records below ``block_level`` are dropped at once;
+    records at or above it wait up to ``block_timeout`` seconds for space
+    before being dropped. Every outcome is counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block_level: int, block_timeout: float):
+        super().__init__(log_queue)
+        self.block_level = block_level
+        self.block_timeout = block_timeout
+        self._lock = threading.Lock()
+        self.counters = {"enqueued": 0, "dropped": 0, "blocked": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < self.block_level:
+                self._count("dropped")
+                return
+            self._count("blocked")
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self._count("dropped")
+                return
+        self._count("enqueued")
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Drains up to ``batch_size`` queued records at a time, hands them to the
+    handlers and flushes each handler once per batch instead of once per record.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 batch_size: int, dropped: Dict[str, int]):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self._dropped = dropped
+        self._reported_drops = 0
+        self.counters = {"batches": 0, "records": 0}
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room so stop() cannot lose the sentinel on a full queue
+        self.queue.put(self._sentinel)
+
+    def _drain(self) -> List[Any]:
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _report_drops(self) -> None:
+        dropped = self._dropped["dropped"]
+        if dropped > self._reported_drops:
+            record = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "Log queue full, records dropped",
+                "dropped": dropped - self._reported_drops,
+            })
+            self._reported_drops = dropped
+            self.handle(record)
+
+    def _monitor(self) -> None:
+        while True:
+            batch = self._drain()
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+            self._report_drops()
+            for handler in self.handlers:
+                try:
+                    handler.flush()
+                except Exception:
+                    # e.g. the console stream was closed at interpreter exit;
+                    # a failed flush must not kill the listener thread
+                    pass
+            self.counters["batches"] += 1
+            self.counters["records"] += len(batch) - (1 if stop else 0)
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+
+_pipeline: Optional[Dict[str, Any]] = None
+
+def shutdown_logging():
+    """Detach the queue handler, then flush and close every queued record"""
+    global _pipeline
+    if _pipeline is None:
+        return
+    logging.getLogger().removeHandler(_pipeline["queue_handler"])
+    _pipeline["listener"].stop()
+    for handler in _pipeline["listener"].handlers:
+        handler.close()
+    _pipeline = None
 
 def setup_logging():
-    """Configure application logging"""
-    logging.basicConfig(level=logging.INFO)
-    
-    # Create a file handler that logs even debug messages
-    handler = RotatingFileHandler(
-        'logs/sql_injection_demo.log',
-        maxBytes=10000,
-        backupCount=1
+    """
+    Configure application logging.
+    Request threads only enqueue records; a listener thread formats them and
+    writes them in batches to the console and to a rotating JSON log file.
+    Calling it again replaces the previous pipeline.
+    """
+    global _pipeline
+    shutdown_logging()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue, Config.LOG_BLOCK_LEVEL, Config.LOG_BLOCK_TIMEOUT)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    os.makedirs(os.path.dirname(Config.LOG_FILE) or ".", exist_ok=True)
+    file_handler = BatchedRotatingFileHandler(
+        Config.LOG_FILE,
+        maxBytes=Config.LOG_MAX_BYTES,
+        backupCount=Config.LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(JsonFormatter())
+
+    listener = BatchingQueueListener(
+        log_queue, console, file_handler,
+        batch_size=Config.LOG_BATCH_SIZE,
+        dropped=queue_handler.counters,
     )
-    handler.setLevel(logging.INFO)
-    
-    # Create a logging format
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    
-    # Add the handlers to the root logger
-    logging.getLogger().addHandler(handler)
+    listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+    _pipeline = {"queue_handler": queue_handler, "listener": listener}
+
+atexit.register(shutdown_logging)
+
+def logging_stats() -> Dict[str, Any]:
+    """Queue depth plus enqueue/drop and batch counters of the logging pipeline"""
+    if _pipeline is None:
+        return {}
+    queue_handler = _pipeline["queue_handler"]
+    return {
+        "queue_size": queue_handler.queue.qsize(),
+        "queue_capacity": queue_handler.queue.maxsize,
+        **queue_handler.counters,
+        **_pipeline["listener"].counters,
+    }
 
 def log_attack_attempt(request: Request, endpoint: str, payload: Dict[str, Any], blocked: bool):
     """Log SQL injection attempt details"""
     logger = logging.getLogger('security')
-    log_message = (
-        f"SQL Injection Attempt - "
-        f"Endpoint: {endpoint} - "
-        f"IP: {request.remote_addr} - "
-        f"Payload: {payload} - "
-        f"Blocked: {blocked}"
+    # Serialization happens on the listener thread; only the request
+    # attributes are read here, while the request context is alive
+    logger.warning(
+        "SQL Injection Attempt",
+        extra={
+            "endpoint": endpoint,
+            "ip": request.remote_addr,
+            "payload": payload,
+            "blocked": blocked,
+        },
     )
-    logger.warning(log_message)
\ No newline at end of file
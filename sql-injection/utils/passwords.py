@@ -0,0 +1,28 @@
+from functools import lru_cache
+from typing import Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config import Config
+from utils.instrumentation import timed
+
+
+def hash_password(password: str, method: Optional[str] = None) -> str:
+    """Hash a password with a per-password salt (defaults to Config.PASSWORD_HASH_METHOD)"""
+    return generate_password_hash(password, method=method or Config.PASSWORD_HASH_METHOD)
+
+@lru_cache(maxsize=1)
+def _dummy_hash(method: str) -> str:
+    return generate_password_hash("dummy-password", method=method)
+
+def verify_password(stored_hash: Optional[str], password: str) -> bool:
+    """
+    Verify a password against a stored hash.
+    Unknown users are checked against a dummy hash so a miss costs the same
+    as a wrong password and response timing does not reveal valid usernames.
+    """
+    with timed("password_verify"):
+        if not stored_hash:
+            check_password_hash(_dummy_hash(Config.PASSWORD_HASH_METHOD), password)
+            return False
+        return check_password_hash(stored_hash, password)
@@ -1,8 +1,40 @@
 import re
-from typing import Union
+import string
+from functools import lru_cache
+from typing import Callable, Union
 
 from config import Config
 
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# Whitelists written as a single character class, e.g. ^[a-zA-Z0-9_]+$
+_CHARACTER_CLASS = re.compile(r"\^?\[(?:\\.|[^\]\\])+\]\+\$?")
+
+
+@lru_cache(maxsize=8)
+def compile_whitelist(pattern: str) -> Callable[[str], bool]:
+    """
+    Compile a whitelist pattern once into a predicate over whole strings.
+    Character-class whitelists that admit every ASCII letter and digit get a
+    fast path: plain alphanumeric values, the common case for usernames and
+    passwords, are accepted by str methods without running the regex.
+    """
+    regex = re.compile(pattern)
+    fast_path = _CHARACTER_CLASS.fullmatch(pattern) is not None and all(
+        regex.fullmatch(char) for char in string.ascii_letters + string.digits
+    )
+
+    def check(value: str) -> bool:
+        if fast_path and value.isascii() and value.isalnum():
+            return True
+        # fullmatch: '$' alone would also accept a trailing newline
+        return regex.fullmatch(value) is not None
+
+    return check
+
+def has_allowed_chars(value: str) -> bool:
+    """Check that every character of the value is in Config.ALLOWED_CHARS"""
+    return compile_whitelist(Config.ALLOWED_CHARS)(value)
 
 def validate_input(input_str: Union[str, int, float]) -> bool:
     """
@@ -17,7 +49,4 @@ def validate_input(input_str: Union[str, int, float]) -> bool:
         return False
         
     # Check against whitelist regex
-    if not re.match(Config.ALLOWED_CHARS, input_str):
-        return False
-        
-    return True
\ No newline at end of file
+    return has_allowed_chars(input_str)